@@ -56,6 +56,7 @@ setup(
         "avro": ["avro>=1.11.0"],
         "orc": ["pyorc>=0.8.0"],
         "delta": ["deltalake>=0.10.0"],
+        "async": ["aiobotocore>=2.5.0"],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -8,10 +8,23 @@ __version__ = "0.9"
 __author__ = "Mustapha Fonsau"
 __email__ = "mfonsau@talentys.eu"
 
-from .core.s3_connector import S3Source
-from .core.connector import S3Connector
-from .core.config import S3ConnectorConfig
-from .parsers.factory import get_parser
+import importlib
+
+# Heavy modules are imported on first access; see `__getattr__`
+_EXPORTS = {
+    "S3Source": ".core.s3_connector",
+    "S3Connector": ".core.connector",
+    "S3ConnectorConfig": ".core.config",
+    "get_parser": ".parsers.factory",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
+
 
 __all__ = [
     "S3Source",
@@ -2,16 +2,33 @@
 Core components of the S3 Connector.
 
 This module contains the main connector logic, configuration, and client classes.
+They are imported on first access, so importing the package stays cheap.
 """
 
-from .s3_connector import S3Source
-from .connector import S3Client
-from .config import S3ConnectorConfig
-from .security import SecurityHandler
+import importlib
+
+_EXPORTS = {
+    "S3Source": ".s3_connector",
+    "S3Connector": ".connector",
+    "S3ConnectorConfig": ".config",
+    "S3SecurityManager": ".security",
+    "StorageBackend": ".storage",
+    "LocalStorageBackend": ".local_storage",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
+
 
 __all__ = [
     "S3Source",
-    "S3Client",
+    "S3Connector",
     "S3ConnectorConfig", 
-    "SecurityHandler"
+    "S3SecurityManager",
+    "StorageBackend",
+    "LocalStorageBackend",
 ]
@@ -0,0 +1,105 @@
+"""
+Mapping from Arrow types to OpenMetadata columns.
+
+Arrow-based parsers (Parquet, ORC, Feather, Avro) describe their data with
+a `pyarrow.Schema`. Mapping it directly keeps what a pandas round trip
+loses: integer and float widths, decimal precision and scale, time zones,
+and the children of nested struct, list and map columns.
+"""
+
+from typing import List
+
+import pyarrow as pa
+import pyarrow.types as pat
+
+from metadata.generated.schema.entity.data.table import Column, DataType
+
+# Arrow type predicates checked in order, with the DataType they map to.
+# Parametrised and nested types are handled in `arrow_field_to_column`.
+_SIMPLE_TYPES = (
+    (pat.is_boolean, DataType.BOOLEAN),
+    (pat.is_int8, DataType.TINYINT),
+    (pat.is_int16, DataType.SMALLINT),
+    (pat.is_int32, DataType.INT),
+    (pat.is_int64, DataType.BIGINT),
+    (pat.is_uint8, DataType.SMALLINT),
+    (pat.is_uint16, DataType.INT),
+    (pat.is_uint32, DataType.BIGINT),
+    (pat.is_uint64, DataType.NUMERIC),
+    (pat.is_float16, DataType.FLOAT),
+    (pat.is_float32, DataType.FLOAT),
+    (pat.is_float64, DataType.DOUBLE),
+    (pat.is_date, DataType.DATE),
+    (pat.is_time, DataType.TIME),
+    (pat.is_duration, DataType.INTERVAL),
+    (pat.is_string, DataType.STRING),
+    (pat.is_large_string, DataType.STRING),
+    (pat.is_binary, DataType.BYTES),
+    (pat.is_large_binary, DataType.BYTES),
+    (pat.is_null, DataType.NULL),
+)
+
+
+def _is_list(arrow_type: pa.DataType) -> bool:
+    return pat.is_list(arrow_type) or pat.is_large_list(arrow_type) or pat.is_fixed_size_list(arrow_type)
+
+
+def arrow_type_to_om(arrow_type: pa.DataType) -> DataType:
+    """Returns the OpenMetadata DataType of an Arrow type; unknown types map to STRING."""
+    if isinstance(arrow_type, pa.ExtensionType):
+        arrow_type = arrow_type.storage_type
+    if pat.is_dictionary(arrow_type):
+        return arrow_type_to_om(arrow_type.value_type)
+    if pat.is_decimal(arrow_type):
+        return DataType.DECIMAL
+    if pat.is_timestamp(arrow_type):
+        return DataType.TIMESTAMPZ if arrow_type.tz else DataType.TIMESTAMP
+    if pat.is_fixed_size_binary(arrow_type):
+        return DataType.BINARY
+    if _is_list(arrow_type):
+        return DataType.ARRAY
+    if pat.is_map(arrow_type):
+        return DataType.MAP
+    if pat.is_struct(arrow_type):
+        return DataType.STRUCT
+    if pat.is_union(arrow_type):
+        return DataType.UNION
+    for predicate, data_type in _SIMPLE_TYPES:
+        if predicate(arrow_type):
+            return data_type
+    return DataType.STRING
+
+
+def arrow_field_to_column(field: pa.Field) -> Column:
+    """Builds the OpenMetadata column of an Arrow field, including nested children."""
+    arrow_type = field.type
+    if isinstance(arrow_type, pa.ExtensionType):
+        arrow_type = arrow_type.storage_type
+    if pat.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+
+    column = {
+        "name": field.name,
+        "dataType": arrow_type_to_om(arrow_type),
+        "dataTypeDisplay": str(field.type),
+    }
+    if pat.is_decimal(arrow_type):
+        column["precision"] = arrow_type.precision
+        column["scale"] = arrow_type.scale
+    elif pat.is_fixed_size_binary(arrow_type):
+        column["dataLength"] = arrow_type.byte_width
+    elif _is_list(arrow_type):
+        element_type = arrow_type.value_type
+        column["arrayDataType"] = arrow_type_to_om(element_type)
+        if pat.is_struct(element_type):
+            column["children"] = [arrow_field_to_column(child) for child in element_type]
+    elif pat.is_map(arrow_type):
+        column["children"] = [arrow_field_to_column(arrow_type.key_field), arrow_field_to_column(arrow_type.item_field)]
+    elif pat.is_struct(arrow_type):
+        column["children"] = [arrow_field_to_column(child) for child in arrow_type]
+    return Column(**column)
+
+
+def arrow_schema_to_columns(schema: pa.Schema) -> List[Column]:
+    """Builds the OpenMetadata columns of an Arrow schema."""
+    return [arrow_field_to_column(field) for field in schema]
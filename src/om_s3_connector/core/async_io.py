@@ -0,0 +1,459 @@
+"""
+Asyncio I/O backend for the S3 connector.
+
+With boto3, every request in flight holds a thread, so the request
+concurrency is bounded by the worker threads. AsyncS3Connector instead
+runs one asyncio event loop on a background thread with an aiobotocore
+client per region, sharing one connection pool, and keeps up to
+`max_concurrency` requests in flight from that loop. It exposes the same
+listing and object read operations as EnhancedS3Connector, as blocking
+calls, so the parsers and S3RangeFile use it unchanged; listings,
+multi-range reads and parallel downloads fan out on the loop instead of
+over threads.
+
+Requires the optional aiobotocore dependency (the `async` extra).
+"""
+
+import asyncio
+import contextlib
+import io
+import mmap
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..parsers.base_parser import BytesLike, read_body
+from .connector import LISTED_OBJECT_FIELDS
+from .multipart import DEFAULT_CONCURRENCY, check_etags, check_part, plan_parts, should_split
+from .scratch import ScratchFile, ScratchSpace
+from .security import S3SecurityManager
+from .storage import StorageBackend, head_entry
+
+from metadata.utils.logger import ingestion_logger
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.credentials import AioCredentials
+    from aiobotocore.session import get_session
+except ImportError as e:
+    raise ImportError(
+        "The asyncio backend requires aiobotocore: pip install 'openmetadata-s3-connector[async]'"
+    ) from e
+
+logger = ingestion_logger()
+
+# Default number of requests in flight, and of pooled connections
+DEFAULT_MAX_CONCURRENCY = 256
+
+# Buffer of the file objects returned by get_object_stream; each refill is
+# one round trip to the event loop
+STREAM_BUFFER_SIZE = 1024 * 1024
+
+# Listing pages buffered for the consumer of list_objects_parallel
+MAX_BUFFERED_PAGES = 64
+
+
+def _trim(obj: Dict) -> Dict:
+    return {field: obj[field] for field in LISTED_OBJECT_FIELDS if field in obj}
+
+
+class _SessionCredentials(AioCredentials):
+    """
+    The credentials of a boto3 session, in the form aiobotocore signs with,
+    so assumed-role credentials are refreshed the same way for both
+    backends. A refresh blocks the loop for one STS call, about once an hour.
+    """
+
+    def __init__(self, credentials):
+        frozen = credentials.get_frozen_credentials()
+        super().__init__(frozen.access_key, frozen.secret_key, frozen.token, method=credentials.method)
+        self._credentials = credentials
+
+    async def get_frozen_credentials(self):
+        return self._credentials.get_frozen_credentials()
+
+
+class _AsyncBodyReader(io.RawIOBase):
+    """Blocking, read-only view of an aiobotocore streaming body."""
+
+    def __init__(self, connector: "AsyncS3Connector", body):
+        super().__init__()
+        self._connector = connector
+        self._body = body
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._connector._run(self._body.read(len(buffer)))
+        memoryview(buffer).cast('B')[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            # The connection belongs to the event loop; release it there
+            self._connector._loop.call_soon_threadsafe(self._body.close)
+        super().close()
+
+
+class AsyncS3Connector(StorageBackend):
+    """
+    Alternative to EnhancedS3Connector that issues requests from one
+    asyncio event loop.
+
+    Every method blocks the calling thread until its requests finish, and
+    follows EnhancedS3Connector's contract: failures are logged and
+    reported as None (or an empty listing). Requests for a bucket go to
+    the client for its region, created on first use on the loop.
+    """
+
+    def __init__(self, security_manager: S3SecurityManager, endpoint_url: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, download_threshold: Optional[int] = None,
+                 download_concurrency: int = DEFAULT_CONCURRENCY):
+        self.security_manager = security_manager
+        self.endpoint_url = endpoint_url
+        self.max_concurrency = max(1, max_concurrency)
+        # Whole objects of known size from this threshold on are fetched in
+        # parallel parts; None disables it
+        self.download_threshold = download_threshold
+        self.download_concurrency = max(1, download_concurrency)
+        self._clients: Dict[str, object] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="s3-async", daemon=True)
+        self._thread.start()
+        self._run(self._start())
+
+    async def _start(self):
+        # Created on the loop, which they are bound to
+        self._exit_stack = contextlib.AsyncExitStack()
+        self._client_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def _run(self, coroutine):
+        """Runs a coroutine on the event loop and waits for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _region(self, bucket_name: str) -> str:
+        # Resolved (and cached) with the blocking client, off the loop
+        region = self.security_manager.get_bucket_region(bucket_name, self.endpoint_url)
+        return region or self.security_manager.aws_region
+
+    async def _client(self, region: str):
+        async with self._client_lock:
+            client = self._clients.get(region)
+            if client is None:
+                client = await self._exit_stack.enter_async_context(self._create_client(region))
+                self._clients[region] = client
+            return client
+
+    def _create_client(self, region: str):
+        """An aiobotocore client context with the security manager's credentials and settings."""
+        manager = self.security_manager
+        session = get_session()
+        session._credentials = _SessionCredentials(manager.get_boto3_session().get_credentials())
+        config = AioConfig(
+            signature_version='s3v4',
+            retries={'max_attempts': 3, 'mode': 'standard'},
+            max_pool_connections=self.max_concurrency,
+            connect_timeout=manager.connect_timeout,
+            read_timeout=manager.read_timeout
+        )
+        client_kwargs = {'config': config, 'verify': manager.verify_ssl, 'region_name': region}
+        if self.endpoint_url:
+            client_kwargs['endpoint_url'] = self.endpoint_url
+        return session.create_client('s3', **client_kwargs)
+
+    async def _get(self, region: str, bucket_name: str, object_key: str, **params) -> Tuple[bytes, Dict]:
+        """Issues a GET and reads the whole (ranged) body."""
+        client = await self._client(region)
+        async with self._semaphore:
+            response = await client.get_object(Bucket=bucket_name, Key=object_key, **params)
+            async with response['Body'] as body:
+                return await body.read(), response
+
+    async def _get_into(self, region: str, bucket_name: str, object_key: str,
+                        allocate: Callable[[int], Any]) -> BytesLike:
+        """Issues a GET and reads the body, chunk by chunk, into `allocate(size)`."""
+        client = await self._client(region)
+        async with self._semaphore:
+            response = await client.get_object(Bucket=bucket_name, Key=object_key)
+            async with response['Body'] as body:
+                size = response.get('ContentLength')
+                if size is None:
+                    return read_body(io.BytesIO(await body.read()), None, allocate)
+                buffer = allocate(size)
+                with memoryview(buffer) as view, view.cast('B') as target:
+                    filled = await self._read_into(body, target)
+                if filled < size:
+                    raise IOError(f"Stream ended after {filled} of {size} bytes")
+                return buffer
+
+    @staticmethod
+    async def _read_into(body, target: memoryview) -> int:
+        """Reads a body chunk by chunk into `target`; returns the number of bytes read."""
+        filled = 0
+        while filled < len(target):
+            chunk = await body.read(min(STREAM_BUFFER_SIZE, len(target) - filled))
+            if not chunk:
+                break
+            target[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+        return filled
+
+    def _should_split(self, size: Optional[int]) -> bool:
+        return self.download_threshold is not None and should_split(size, self.download_threshold)
+
+    async def _get_parts(self, region: str, bucket_name: str, object_key: str, size: int,
+                         target: memoryview) -> Optional[str]:
+        """Downloads an object in concurrent ranged parts into `target`, and returns its ETag."""
+        plan = plan_parts(size, self.download_concurrency)
+        parallelism = asyncio.Semaphore(plan.parallelism)
+
+        async def get_part(start: int, end: int) -> Optional[str]:
+            async with parallelism:
+                client = await self._client(region)
+                async with self._semaphore:
+                    response = await client.get_object(Bucket=bucket_name, Key=object_key,
+                                                       Range=f"bytes={start}-{end}")
+                    async with response['Body'] as body:
+                        check_part(response, size)
+                        filled = await self._read_into(body, target[start:end + 1])
+            if filled != end - start + 1:
+                raise IOError(f"Part {start}-{end} ended after {filled} bytes")
+            return response.get('ETag')
+
+        # Every part finishes before this returns, as they write into `target`
+        results = await asyncio.gather(*(get_part(start, end) for start, end in plan.ranges),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return check_etags(results)
+
+    async def _list_page(self, region: str, params: Dict) -> Dict:
+        client = await self._client(region)
+        async with self._semaphore:
+            return await client.list_objects_v2(**params)
+
+    def list_objects(self, bucket_name: str, prefix: str = "") -> Iterator[Dict]:
+        """Lazily list the objects in a bucket, one page at a time."""
+        try:
+            region = self._region(bucket_name)
+            params = {"Bucket": bucket_name, "Prefix": prefix}
+            while True:
+                page = self._run(self._list_page(region, params))
+                for obj in page.get('Contents', ()):
+                    yield _trim(obj)
+                if not page.get('IsTruncated'):
+                    break
+                params["ContinuationToken"] = page['NextContinuationToken']
+        except Exception as e:
+            logger.error(f"Failed to list objects in bucket {bucket_name}: {e}")
+
+    def list_objects_parallel(self, bucket_name: str, max_workers: int) -> Iterator[Dict]:
+        """
+        List the objects in a bucket, every top-level prefix concurrently.
+
+        The prefixes are listed from the event loop, bounded by
+        `max_concurrency` rather than `max_workers`. Entries come in no
+        particular order.
+        """
+        try:
+            region = self._region(bucket_name)
+            pages, listing = self._run(self._start_listing(region, bucket_name))
+        except Exception as e:
+            logger.error(f"Failed to list objects in bucket {bucket_name}: {e}")
+            return
+        try:
+            while True:
+                page = self._run(self._next_page(pages, listing))
+                if page is None:
+                    break
+                yield from page
+        except Exception as e:
+            logger.error(f"Failed to list objects in bucket {bucket_name}: {e}")
+        finally:
+            self._loop.call_soon_threadsafe(listing.cancel)
+
+    async def _start_listing(self, region: str, bucket_name: str) -> Tuple[asyncio.Queue, asyncio.Task]:
+        # Created on the loop, which the queue belongs to
+        pages = asyncio.Queue(maxsize=MAX_BUFFERED_PAGES)
+        return pages, asyncio.ensure_future(self._list_all(region, bucket_name, pages))
+
+    @staticmethod
+    async def _next_page(pages: asyncio.Queue, listing: asyncio.Task) -> Optional[List[Dict]]:
+        """The next listed page, or None once the listing finished and its pages were read."""
+        get = asyncio.ensure_future(pages.get())
+        await asyncio.wait({get, listing}, return_when=asyncio.FIRST_COMPLETED)
+        if not get.done():
+            get.cancel()
+            if pages.empty():
+                # Raises the error of a failed listing
+                listing.result()
+                return None
+            return pages.get_nowait()
+        return get.result()
+
+    async def _list_all(self, region: str, bucket_name: str, pages: asyncio.Queue):
+        tasks = []
+        try:
+            params = {"Bucket": bucket_name, "Delimiter": '/'}
+            while True:
+                page = await self._list_page(region, params)
+                for common_prefix in page.get('CommonPrefixes', ()):
+                    tasks.append(asyncio.ensure_future(
+                        self._list_prefix(region, bucket_name, common_prefix['Prefix'], pages)
+                    ))
+                await self._put(pages, [_trim(obj) for obj in page.get('Contents', ())])
+                if not page.get('IsTruncated'):
+                    break
+                params["ContinuationToken"] = page['NextContinuationToken']
+            await asyncio.gather(*tasks)
+        finally:
+            # Stops the other prefixes after a failure or when the consumer gave up
+            for task in tasks:
+                task.cancel()
+
+    async def _list_prefix(self, region: str, bucket_name: str, prefix: str, pages: asyncio.Queue):
+        params = {"Bucket": bucket_name, "Prefix": prefix}
+        while True:
+            page = await self._list_page(region, params)
+            await self._put(pages, [_trim(obj) for obj in page.get('Contents', ())])
+            if not page.get('IsTruncated'):
+                return
+            params["ContinuationToken"] = page['NextContinuationToken']
+
+    @staticmethod
+    async def _put(pages: asyncio.Queue, page: List[Dict]):
+        # Waits for the consumer thread to make room, without blocking the loop
+        if page:
+            await pages.put(page)
+
+    def get_object_body(self, bucket_name: str, object_key: str, allocate: Optional[Callable[[int], Any]] = None,
+                        size: Optional[int] = None) -> Optional[BytesLike]:
+        """
+        Get object content as bytes, or in the buffer returned by `allocate(size)`.
+        An object whose listed `size` is over the download threshold is
+        fetched in parallel parts.
+        """
+        try:
+            region = self._region(bucket_name)
+            if self._should_split(size):
+                buffer = allocate(size) if allocate is not None else bytearray(size)
+                with memoryview(buffer) as view, view.cast('B') as target:
+                    self._run(self._get_parts(region, bucket_name, object_key, size, target))
+                return buffer
+            if allocate is not None:
+                return self._run(self._get_into(region, bucket_name, object_key, allocate))
+            body, _ = self._run(self._get(region, bucket_name, object_key))
+            return body
+        except Exception as e:
+            logger.error(f"Failed to get object body for {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_stream(self, bucket_name: str, object_key: str):
+        """Get the object body as an unread, buffered stream; the caller must close it."""
+        try:
+            region = self._region(bucket_name)
+            response = self._run(self._open(region, bucket_name, object_key))
+            return io.BufferedReader(_AsyncBodyReader(self, response['Body']), buffer_size=STREAM_BUFFER_SIZE)
+        except Exception as e:
+            logger.error(f"Failed to open object stream for {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_file(self, bucket_name: str, object_key: str, scratch: ScratchSpace,
+                        suffix: str = "", size: Optional[int] = None) -> Optional[ScratchFile]:
+        """
+        Streams an object into a file in `scratch`; the caller must close it.
+        Objects over the download threshold are written in parallel parts
+        through a memory mapping of the file.
+        """
+        try:
+            if self._should_split(size):
+                region = self._region(bucket_name)
+                scratch_file = scratch.create(size, suffix)
+                try:
+                    with open(scratch_file.path, "r+b") as f, mmap.mmap(f.fileno(), size) as mapping:
+                        with memoryview(mapping) as target:
+                            self._run(self._get_parts(region, bucket_name, object_key, size, target))
+                except BaseException:
+                    scratch_file.close()
+                    raise
+                return scratch_file
+            response = self._run(self._open(self._region(bucket_name), bucket_name, object_key))
+            stream = io.BufferedReader(_AsyncBodyReader(self, response['Body']), buffer_size=STREAM_BUFFER_SIZE)
+            try:
+                return scratch.write(stream, response.get('ContentLength'), suffix)
+            finally:
+                stream.close()
+        except Exception as e:
+            logger.error(f"Failed to download {object_key} in bucket {bucket_name} to scratch space: {e}")
+            return None
+
+    def stat_object(self, bucket_name: str, object_key: str) -> Optional[Dict]:
+        """Get the listing entry of one object with a HEAD request."""
+        try:
+            response = self._run(self._head(self._region(bucket_name), bucket_name, object_key))
+            return head_entry(object_key, response)
+        except Exception as e:
+            logger.error(f"Failed to stat {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    async def _head(self, region: str, bucket_name: str, object_key: str) -> Dict:
+        client = await self._client(region)
+        async with self._semaphore:
+            return await client.head_object(Bucket=bucket_name, Key=object_key)
+
+    async def _open(self, region: str, bucket_name: str, object_key: str) -> Dict:
+        client = await self._client(region)
+        async with self._semaphore:
+            return await client.get_object(Bucket=bucket_name, Key=object_key)
+
+    def get_object_range(self, bucket_name: str, object_key: str, start: int, end: int) -> Optional[bytes]:
+        """Get the inclusive byte range [start, end] of an object."""
+        try:
+            body, _ = self._run(self._get(self._region(bucket_name), bucket_name, object_key,
+                                          Range=f"bytes={start}-{end}"))
+            return body
+        except Exception as e:
+            logger.error(f"Failed to get bytes {start}-{end} of {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_ranges(self, bucket_name: str, object_key: str,
+                          ranges: List[Tuple[int, int]]) -> Optional[List[bytes]]:
+        """Get several inclusive byte ranges of an object, all requested concurrently."""
+        try:
+            return self._run(self._get_ranges(self._region(bucket_name), bucket_name, object_key, ranges))
+        except Exception as e:
+            logger.error(f"Failed to get {len(ranges)} ranges of {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    async def _get_ranges(self, region: str, bucket_name: str, object_key: str,
+                          ranges: List[Tuple[int, int]]) -> List[bytes]:
+        results = await asyncio.gather(*(
+            self._get(region, bucket_name, object_key, Range=f"bytes={start}-{end}") for start, end in ranges
+        ))
+        return [body for body, _ in results]
+
+    def get_object_tail(self, bucket_name: str, object_key: str, length: int) -> Optional[Tuple[bytes, int]]:
+        """Get the last `length` bytes of an object together with the object size."""
+        try:
+            body, response = self._run(self._get(self._region(bucket_name), bucket_name, object_key,
+                                                 Range=f"bytes=-{length}"))
+            content_range = response.get('ContentRange')
+            object_size = int(content_range.rsplit('/', 1)[1]) if content_range else len(body)
+            return body, object_size
+        except Exception as e:
+            logger.error(f"Failed to get tail of {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def close(self):
+        """Close the clients and stop the event loop."""
+        if not self._loop.is_running():
+            return
+        try:
+            self._run(self._exit_stack.aclose())
+        except Exception as e:
+            logger.debug(f"Could not close the async S3 clients: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
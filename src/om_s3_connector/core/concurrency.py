@@ -0,0 +1,89 @@
+"""
+Concurrency helpers for the S3 connector.
+
+Most of the per-table work (S3 GETs, OpenMetadata calls) is network wait,
+so a bounded thread pool gives near-linear speedups up to `maxWorkers`.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+    max_pending: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Apply `func` to every item on a thread pool and yield results in input order.
+
+    At most `max_pending` items are in flight (default: twice `max_workers`),
+    so `items` may be a lazy iterator over a very large input. Exceptions
+    raised by `func` are re-raised when the corresponding result is yielded.
+    With a single worker the items are processed inline.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    max_pending = max_pending or max_workers * 2
+    pending: "deque[Future]" = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-connector")
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+class OnceCache:
+    """
+    Thread-safe cache that computes each key at most once at a time.
+
+    Concurrent callers asking for the same key wait for the first caller's
+    result instead of issuing duplicate requests. A failed computation is
+    not cached, so a later caller retries it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], R]) -> R:
+        with self._lock:
+            future = self._futures.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._futures[key] = future
+
+        if is_owner:
+            try:
+                future.set_result(factory())
+            except BaseException as e:
+                with self._lock:
+                    self._futures.pop(key, None)
+                future.set_exception(e)
+
+        return future.result()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._futures
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._futures)
@@ -15,6 +15,24 @@ class SecurityProtocol(str, Enum):
     IAM_ROLE = "iam_role"
 
 
+class WriteMode(str, Enum):
+    """How table entities and sample data reach OpenMetadata."""
+    SINK = "sink"
+    DIRECT = "direct"
+
+
+class IOBackend(str, Enum):
+    """How object listings and reads are issued to S3."""
+    THREADS = "threads"
+    ASYNCIO = "asyncio"
+
+
+class StorageBackendType(str, Enum):
+    """Where the scanned objects are stored."""
+    S3 = "s3"
+    LOCAL = "local"
+
+
 class S3SecurityConfig(BaseModel):
     """Security configuration for S3 connections."""
     
@@ -95,6 +113,16 @@ class S3ConnectionConfig(BaseModel):
         description="Name of the S3 bucket to scan for metadata"
     )
     
+    storageBackend: StorageBackendType = Field(
+        default=StorageBackendType.S3,
+        description="Read objects from S3, or from directories on the local file system"
+    )
+    
+    localRootPath: Optional[str] = Field(
+        default=None,
+        description="Directory holding one sub-directory per bucket, for the local storage backend"
+    )
+    
     # Security Configuration
     securityConfig: S3SecurityConfig = Field(
         default_factory=S3SecurityConfig,
@@ -163,6 +191,163 @@ class S3ConnectionConfig(BaseModel):
         le=600
     )
     
+    maxSampleBytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum number of bytes read from a streamed file for schema inference and sampling",
+        ge=1024
+    )
+    
+    schemaInferenceRows: int = Field(
+        default=1000,
+        description="Number of rows read from streamed files (CSV, TSV, JSON, JSONL, Avro) to infer the schema",
+        ge=1,
+        le=100000
+    )
+    
+    enableParallelListing: bool = Field(
+        default=False,
+        description="List the bucket with up to maxWorkers concurrent requests, splitting large prefixes into key ranges"
+    )
+    
+    inventoryManifest: Optional[str] = Field(
+        default=None,
+        description="s3:// URI of an S3 Inventory manifest.json to read the object list from instead of listing the bucket"
+    )
+    
+    inventoryBatchRows: int = Field(
+        default=10000,
+        description="Number of inventory rows parsed per batch when reading an S3 Inventory report",
+        ge=100
+    )
+    
+    enableIncremental: bool = Field(
+        default=False,
+        description="Skip tables whose files (keys, ETags, sizes) are unchanged since the last successful run"
+    )
+    
+    stateStorePath: str = Field(
+        default="s3_connector_state.db",
+        description="Path of the SQLite file holding incremental ingestion state; place it on a persistent volume"
+    )
+    
+    writeMode: WriteMode = Field(
+        default=WriteMode.SINK,
+        description="Yield table and sample data records to the workflow sink, or write them directly from worker threads"
+    )
+    
+    sinkBatchSize: int = Field(
+        default=1,
+        description="Number of tables whose sample data records are prepared together in sink mode",
+        ge=1,
+        le=1000
+    )
+    
+    prefetchEntities: bool = Field(
+        default=False,
+        description="List the existing databases, schemas and tables of the service up front and answer lookups from memory"
+    )
+    
+    parsePoolSize: int = Field(
+        default=0,
+        description="Number of worker processes parsing CSV, JSON, Excel and other GIL-bound formats; 0 parses on the worker threads",
+        ge=0,
+        le=64
+    )
+    
+    parsePoolRecycleTasks: int = Field(
+        default=100,
+        description="Replace the parse worker processes after this many files to release pandas memory",
+        ge=1
+    )
+    
+    enableHedgedRequests: bool = Field(
+        default=False,
+        description="Send a duplicate GET when an object request is slower than hedgePercentile of recent requests; the first response wins"
+    )
+    
+    hedgePercentile: float = Field(
+        default=95.0,
+        description="Percentile of recent GET latencies after which a request is hedged",
+        ge=50.0,
+        le=99.9
+    )
+    
+    hedgeMinDelayMs: int = Field(
+        default=50,
+        description="Minimum time in milliseconds a GET is given before it is hedged",
+        ge=0
+    )
+    
+    enableAdaptiveConcurrency: bool = Field(
+        default=False,
+        description="Adapt the number of in-flight S3 requests per key prefix: grow while requests are fast, halve on throttling"
+    )
+    
+    adaptiveMaxConcurrency: int = Field(
+        default=32,
+        description="Upper bound of the in-flight S3 requests per key prefix with adaptive concurrency",
+        ge=1,
+        le=256
+    )
+    
+    ioBackend: IOBackend = Field(
+        default=IOBackend.THREADS,
+        description="Issue S3 requests from the worker threads with boto3, or from one asyncio event loop with aiobotocore"
+    )
+    
+    asyncMaxConcurrency: int = Field(
+        default=256,
+        description="Maximum S3 requests in flight on the asyncio backend; also its connection pool size",
+        ge=1,
+        le=1024
+    )
+    
+    objectCacheDir: Optional[str] = Field(
+        default=None,
+        description="Directory of the local cache of object bodies, revalidated by ETag; unset disables the cache"
+    )
+    
+    objectCacheMaxBytes: int = Field(
+        default=10 * 1024 ** 3,
+        description="Size limit of the object cache in bytes; least recently used entries are evicted past it",
+        ge=0
+    )
+    
+    spillThresholdBytes: int = Field(
+        default=256 * 1024 ** 2,
+        description="Objects parsed whole that are larger than this are streamed to scratch files and memory-mapped",
+        ge=0
+    )
+    
+    scratchDir: Optional[str] = Field(
+        default=None,
+        description="Directory for scratch files; defaults to the system temporary directory"
+    )
+    
+    scratchMaxBytes: int = Field(
+        default=10 * 1024 ** 3,
+        description="Quota of the scratch files in bytes; larger objects fail, others wait for space",
+        ge=0
+    )
+    
+    enableParallelDownload: bool = Field(
+        default=False,
+        description="Download whole objects over parallelDownloadThresholdBytes in concurrent ranged parts"
+    )
+    
+    parallelDownloadThresholdBytes: int = Field(
+        default=64 * 1024 ** 2,
+        description="Listed size from which a whole-object download is split into parts",
+        ge=0
+    )
+    
+    parallelDownloadConcurrency: int = Field(
+        default=8,
+        description="Part requests in flight for parallel downloads, over all objects",
+        ge=1,
+        le=64
+    )
+    
     # Advanced Settings
     enableMetrics: bool = Field(
         default=True,
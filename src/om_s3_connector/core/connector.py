@@ -1,6 +1,9 @@
 # File: connectors/s3/connector.py
 # A simple helper class to interact with S3-compatible storage.
 
+# Fields kept from each ListObjectsV2 entry
+LISTED_OBJECT_FIELDS = ("Key", "Size", "ETag", "LastModified", "StorageClass")
+
 class S3Connector:
     """
     A wrapper class for the boto3 S3 client to simplify interactions.
@@ -31,19 +34,19 @@ class S3Connector:
 
     def list_objects(self, bucket_name):
         """
-        Lists ALL objects in a bucket, automatically handling pagination
-        for buckets containing more than 1000 objects.
+        Lazily iterates over ALL objects in a bucket, one page at a time,
+        automatically handling pagination for buckets containing more than
+        1000 objects. Each entry is trimmed to Key, Size, ETag, LastModified
+        and StorageClass.
         """
-        all_objects = []
         try:
             paginator = self.s3_client.get_paginator('list_objects_v2')
             pages = paginator.paginate(Bucket=bucket_name)
             for page in pages:
-                if "Contents" in page:
-                    all_objects.extend(page['Contents'])
+                for obj in page.get('Contents', ()):
+                    yield {field: obj[field] for field in LISTED_OBJECT_FIELDS if field in obj}
         except Exception as e:
             self.log_error(f"Failed to list objects in bucket {bucket_name}: {e}")
-        return all_objects
     
     def get_object_body(self, bucket_name, object_key):
         """
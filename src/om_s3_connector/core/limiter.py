@@ -0,0 +1,232 @@
+"""
+Adaptive concurrency limits for S3 requests.
+
+S3 scales request capacity per key prefix (partition), and MinIO per
+server, so no fixed `maxWorkers` is right everywhere: too low wastes
+throughput, too high produces `SlowDown` 503s that fail whole tables once
+the client's retries are spent. AdaptiveLimiter keeps an AIMD limit on
+in-flight requests for every top-level prefix. A prefix whose requests
+succeed at steady latency while its limit is in use gains about one slot
+per round of requests; a throttled request halves the prefix's limit and
+is retried after a backoff.
+
+A GET holds its slot until its body has been read or closed, not only
+until the response headers arrive: the transfer is most of the load a
+request puts on the server.
+"""
+
+import random
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from botocore.exceptions import ClientError
+
+from .metrics import RunMetrics
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+R = TypeVar("R")
+
+# Error codes and HTTP statuses S3 and S3-compatible stores use to throttle
+THROTTLE_ERROR_CODES = {
+    "SlowDown", "503", "ServiceUnavailable", "Throttling", "ThrottlingException",
+    "RequestLimitExceeded", "RequestThrottled", "TooManyRequestsException",
+}
+THROTTLE_HTTP_STATUSES = {429, 503}
+
+# A request slower than this multiple of the prefix's smoothed latency does
+# not grow the limit
+LATENCY_TOLERANCE = 2.0
+
+# Weight of each new sample in the smoothed latency
+LATENCY_SMOOTHING = 0.05
+
+# The limit of a prefix is halved at most once per round trip (its smoothed
+# latency), so a burst of throttled requests that were in flight together
+# counts once; this is the interval until a latency has been observed
+DEFAULT_DECREASE_INTERVAL = 0.1
+
+# Backoff before retrying a throttled request: base * 2^attempt, capped, with jitter
+BACKOFF_BASE = 0.1
+BACKOFF_MAX = 5.0
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """True if a botocore error means the request was throttled."""
+    if not isinstance(error, ClientError):
+        return False
+    response = error.response or {}
+    code = response.get("Error", {}).get("Code", "")
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in THROTTLE_ERROR_CODES or status in THROTTLE_HTTP_STATUSES
+
+
+def key_prefix(key: str) -> str:
+    """The top-level prefix of an object key, which the limits are tracked by."""
+    return key.split("/", 1)[0] if "/" in key else ""
+
+
+class _PrefixLimit:
+    """AIMD state of one prefix, guarded by its condition."""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.condition = threading.Condition()
+        self.latency: Optional[float] = None
+        self.last_decrease = 0.0
+
+
+class AdaptiveLimiter:
+    """
+    Per-prefix AIMD concurrency limiter.
+
+    `call` waits for a free slot under the prefix's limit, runs the request,
+    and adjusts the limit from the outcome. Throttled requests are retried
+    up to `max_retries` times; other errors are raised unchanged.
+    """
+
+    def __init__(self, initial_limit: int, max_limit: int, min_limit: int = 1, max_retries: int = 8,
+                 metrics: Optional[RunMetrics] = None):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.initial_limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.max_retries = max_retries
+        self.metrics = metrics or RunMetrics()
+        self._lock = threading.Lock()
+        self._prefixes: Dict[str, _PrefixLimit] = {}
+
+    def call(self, prefix: str, request: Callable[[], R]) -> R:
+        """Runs `request` within the limit of `prefix`."""
+        result, release = self.hold(prefix, request)
+        release()
+        return result
+
+    def hold(self, prefix: str, request: Callable[[], R]) -> Tuple[R, Callable[[], None]]:
+        """
+        Like `call`, but the slot stays taken until the returned function is
+        called (once; later calls do nothing). The request's latency is the
+        time until `request` returned.
+        """
+        state = self._state(prefix)
+        attempt = 0
+        while True:
+            self._acquire(state)
+            started = time.perf_counter()
+            try:
+                result = request()
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                self._release(state, None, throttled)
+                if not throttled or attempt >= self.max_retries:
+                    raise
+                self.metrics.increment("s3.throttled_requests")
+                time.sleep(random.uniform(0.5, 1.0) * min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+                attempt += 1
+                continue
+            latency = time.perf_counter() - started
+            released = threading.Event()
+
+            def release():
+                if not released.is_set():
+                    released.set()
+                    self._release(state, latency, False)
+            return result, release
+
+    def limits(self) -> Dict[str, int]:
+        """Returns the current limit of every prefix seen so far."""
+        with self._lock:
+            prefixes = dict(self._prefixes)
+        return {prefix: int(state.limit) for prefix, state in sorted(prefixes.items())}
+
+    def _state(self, prefix: str) -> _PrefixLimit:
+        with self._lock:
+            state = self._prefixes.get(prefix)
+            if state is None:
+                state = _PrefixLimit(float(self.initial_limit))
+                self._prefixes[prefix] = state
+            return state
+
+    def _acquire(self, state: _PrefixLimit):
+        with state.condition:
+            while state.in_flight >= int(state.limit):
+                state.condition.wait()
+            state.in_flight += 1
+
+    def _release(self, state: _PrefixLimit, latency: Optional[float], throttled: bool):
+        with state.condition:
+            saturated = state.in_flight >= int(state.limit)
+            state.in_flight -= 1
+            if throttled:
+                now = time.monotonic()
+                interval = DEFAULT_DECREASE_INTERVAL if state.latency is None else state.latency
+                if now - state.last_decrease >= interval:
+                    state.limit = max(float(self.min_limit), state.limit / 2)
+                    state.last_decrease = now
+                    logger.debug(f"S3 throttled requests, concurrency limit lowered to {int(state.limit)}")
+            elif latency is not None:
+                healthy = state.latency is None or latency <= LATENCY_TOLERANCE * state.latency
+                state.latency = latency if state.latency is None else (
+                    (1 - LATENCY_SMOOTHING) * state.latency + LATENCY_SMOOTHING * latency
+                )
+                # Only grow a limit that is actually in use
+                if healthy and saturated:
+                    state.limit = min(float(self.max_limit), state.limit + 1 / state.limit)
+            state.condition.notify_all()
+
+
+class SlotBody:
+    """
+    Response body that holds a limiter slot: `release` is called once the
+    body has been closed, read up to `length` bytes or to its end, or
+    garbage collected unclosed. Other attributes are the wrapped body's.
+    """
+
+    def __init__(self, body, length: Optional[int], release: Callable[[], None]):
+        self._body = body
+        self._remaining = length
+        self._release = weakref.finalize(self, release)
+
+    def _consumed(self, count: int, requested: Optional[int]):
+        if self._remaining is not None:
+            self._remaining -= count
+        if (self._remaining is not None and self._remaining <= 0) or (count == 0 and requested != 0):
+            self._release()
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        data = self._body.read(amt)
+        self._consumed(len(data), amt)
+        return data
+
+    def readinto(self, buffer) -> int:
+        if hasattr(self._body, "readinto"):
+            count = self._body.readinto(buffer)
+        else:
+            with memoryview(buffer) as view, view.cast('B') as target:
+                data = self._body.read(len(target))
+                count = len(data)
+                target[:count] = data
+        self._consumed(count, memoryview(buffer).nbytes)
+        return count
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self):
+        try:
+            self._body.close()
+        finally:
+            self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self._body, name)
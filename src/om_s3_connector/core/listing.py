@@ -0,0 +1,205 @@
+"""
+Parallel bucket listing for the S3 connector.
+
+A single ListObjectsV2 paginator returns about 1000 keys per round trip,
+serially. ParallelObjectLister first discovers the top-level prefixes with
+Delimiter='/', then lists them concurrently. A prefix whose listing turns
+out to be large is split on the fly into lexicographic key ranges, each
+listed from its own StartAfter position, so a single flat prefix with
+millions of keys is also listed in parallel.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .limiter import AdaptiveLimiter, key_prefix
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+# Key characters are mapped onto printable ASCII when computing split points,
+# so every generated StartAfter value is a safe, valid key.
+_MIN_KEY_CHAR = 0x20
+_MAX_KEY_CHAR = 0x7E
+_KEY_CHAR_BASE = _MAX_KEY_CHAR - _MIN_KEY_CHAR + 1
+
+# Sentinel pushed on the result queue when a range task finishes
+_TASK_DONE = object()
+
+
+def key_midpoint(low: str, high: str) -> Optional[str]:
+    """
+    Return a key strictly between `low` and `high` in S3 key order, or None.
+
+    Keys are treated as base-95 numbers over printable ASCII. S3 orders keys
+    by their UTF-8 bytes, which matches Python's code point ordering of str,
+    so the result is validated with plain string comparison.
+    """
+    width = max(len(low), len(high)) + 1
+
+    def to_number(key: str) -> int:
+        number = 0
+        for index in range(width):
+            char = ord(key[index]) if index < len(key) else _MIN_KEY_CHAR
+            char = min(max(char, _MIN_KEY_CHAR), _MAX_KEY_CHAR)
+            number = number * _KEY_CHAR_BASE + (char - _MIN_KEY_CHAR)
+        return number
+
+    number = (to_number(low) + to_number(high)) // 2
+    chars = []
+    for _ in range(width):
+        number, digit = divmod(number, _KEY_CHAR_BASE)
+        chars.append(chr(digit + _MIN_KEY_CHAR))
+    midpoint = "".join(reversed(chars)).rstrip(chr(_MIN_KEY_CHAR))
+
+    if low < midpoint < high:
+        return midpoint
+    return None
+
+
+class ParallelObjectLister:
+    """
+    Lists a bucket with up to `max_workers` concurrent ListObjectsV2 calls.
+
+    Each task covers the key range (start_after, end_key] inside one prefix.
+    When a task's page is truncated and fewer than `max_workers` tasks are
+    running, the remainder of its range is split at `key_midpoint` and the
+    upper half becomes a new task. The union of all ranges is exactly the
+    prefix, so the key set matches the serial listing; only the order differs.
+
+    With a `limiter`, every ListObjectsV2 call runs within the adaptive
+    concurrency limit of the prefix it lists.
+    """
+
+    def __init__(self, s3_client, bucket_name: str, max_workers: int,
+                 transform: Callable[[Dict], Dict], max_buffered_pages: Optional[int] = None,
+                 limiter: Optional[AdaptiveLimiter] = None):
+        self.s3_client = s3_client
+        self.limiter = limiter
+        self.bucket_name = bucket_name
+        self.max_workers = max(1, max_workers)
+        self.transform = transform
+        self._results: "queue.Queue" = queue.Queue(maxsize=max_buffered_pages or self.max_workers * 4)
+        self._lock = threading.Lock()
+        self._active_tasks = 0
+        self._stopped = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Counters useful for logging and metrics
+        self.request_count = 0
+        self.split_count = 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="s3-list")
+        try:
+            # Discovery: root-level objects are yielded directly, every
+            # top-level prefix becomes a range task.
+            params = {"Bucket": self.bucket_name, "Delimiter": '/'}
+            while True:
+                page = self._list_page(params)
+                for common_prefix in page.get('CommonPrefixes', ()):
+                    self._submit(common_prefix['Prefix'], None, None)
+                for obj in page.get('Contents', ()):
+                    yield self.transform(obj)
+                if not page.get('IsTruncated'):
+                    break
+                params["ContinuationToken"] = page['NextContinuationToken']
+
+            while True:
+                with self._lock:
+                    if self._active_tasks == 0 and self._results.empty():
+                        break
+                item = self._results.get()
+                if item is _TASK_DONE:
+                    continue
+                yield from item
+        finally:
+            self._stopped.set()
+            # Unblock workers waiting on a full result queue
+            while not self._results.empty():
+                self._results.get_nowait()
+            self._executor.shutdown(wait=True)
+            logger.debug(f"Parallel listing of {self.bucket_name}: {self.request_count} requests, "
+                         f"{self.split_count} range splits")
+
+    def _submit(self, prefix: str, start_after: Optional[str], end_key: Optional[str]):
+        with self._lock:
+            self._active_tasks += 1
+        self._executor.submit(self._list_range, prefix, start_after, end_key)
+
+    def _list_range(self, prefix: str, start_after: Optional[str], end_key: Optional[str]):
+        try:
+            continuation_token = None
+            while not self._stopped.is_set():
+                params = {"Bucket": self.bucket_name, "Prefix": prefix}
+                if continuation_token:
+                    params["ContinuationToken"] = continuation_token
+                elif start_after:
+                    params["StartAfter"] = start_after
+
+                response = self._list_page(params)
+                contents = response.get('Contents', [])
+                page: List[Dict] = []
+                reached_end = False
+                for obj in contents:
+                    if end_key is not None and obj['Key'] > end_key:
+                        reached_end = True
+                        break
+                    page.append(self.transform(obj))
+                if page:
+                    self._put(page)
+
+                if reached_end or not response.get('IsTruncated') or not contents:
+                    return
+
+                last_key = contents[-1]['Key']
+                split_key = self._maybe_split(prefix, last_key, end_key)
+                if split_key is not None:
+                    # The upper half now belongs to a new task: restart this
+                    # one from last_key so it stops at the new end key.
+                    end_key = split_key
+                    continuation_token = None
+                    start_after = last_key
+                else:
+                    continuation_token = response.get('NextContinuationToken')
+        except Exception as e:
+            logger.error(f"Failed to list prefix {prefix} in bucket {self.bucket_name}: {e}")
+        finally:
+            with self._lock:
+                self._active_tasks -= 1
+            self._put(_TASK_DONE)
+
+    def _list_page(self, params: Dict) -> Dict:
+        if self.limiter is None:
+            response = self.s3_client.list_objects_v2(**params)
+        else:
+            response = self.limiter.call(
+                key_prefix(params.get("Prefix", "")), lambda: self.s3_client.list_objects_v2(**params)
+            )
+        with self._lock:
+            self.request_count += 1
+        return response
+
+    def _maybe_split(self, prefix: str, last_key: str, end_key: Optional[str]) -> Optional[str]:
+        with self._lock:
+            if self._stopped.is_set() or self._active_tasks >= self.max_workers:
+                return None
+        upper = end_key if end_key is not None else prefix + chr(_MAX_KEY_CHAR)
+        split_key = key_midpoint(last_key, upper)
+        if split_key is None:
+            return None
+        with self._lock:
+            self.split_count += 1
+        self._submit(prefix, split_key, end_key)
+        return split_key
+
+    def _put(self, item):
+        while not self._stopped.is_set():
+            try:
+                self._results.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
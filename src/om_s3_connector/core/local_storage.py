@@ -0,0 +1,184 @@
+"""
+Local file system storage backend.
+
+LocalStorageBackend serves a directory tree as buckets: each bucket is a
+directory under the root path, and each file below it is an object whose
+key is its relative path with "/" separators. It lets the connector scan
+on-premises file dumps (NFS or local disks) and run the whole pipeline
+without S3, e.g. to measure parsing and emission alone.
+
+Listings walk the tree with os.scandir, whose entries carry the file
+type, so only files are stat'ed. Reads map the file with mmap: a whole
+body is the mapping itself, not a copy, and ranges are sliced from it.
+"""
+
+import datetime
+import mmap
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+
+from ..parsers.base_parser import BytesLike
+from .scratch import ScratchFile, ScratchSpace
+from .storage import StorageBackend
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+
+def _entry(object_key: str, stat: os.stat_result) -> Dict:
+    """
+    Listing entry of a file, shaped like a ListObjectsV2 entry. The ETag
+    is derived from the modification time and size, so a rewritten file
+    gets a new one.
+    """
+    return {
+        "Key": object_key,
+        "Size": stat.st_size,
+        "ETag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        "LastModified": datetime.datetime.fromtimestamp(stat.st_mtime, datetime.timezone.utc),
+    }
+
+
+def _map(path: str) -> BytesLike:
+    """Maps a file read-only; empty files, which cannot be mapped, come back as b""."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        # The mapping holds its own descriptor, so the file can be closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Storage backend over the directories under `root_path`.
+
+    Symbolic links to files are followed; links to directories are not,
+    so a tree with cycles is listed once. Failures are logged and reported
+    as None, like the S3 backends.
+    """
+
+    def __init__(self, root_path: str):
+        self.root_path = os.path.abspath(root_path)
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        """True if the bucket's directory exists."""
+        return os.path.isdir(os.path.join(self.root_path, bucket_name))
+
+    def _path(self, bucket_name: str, object_key: str) -> str:
+        """Path of an object; keys that would resolve outside the bucket are rejected."""
+        bucket_path = os.path.join(self.root_path, bucket_name)
+        path = os.path.normpath(os.path.join(bucket_path, *object_key.split("/")))
+        if os.path.commonpath([bucket_path, path]) != bucket_path:
+            raise ValueError(f"Key {object_key} is outside bucket {bucket_name}")
+        return path
+
+    def list_objects(self, bucket_name: str, prefix: str = "") -> Iterator[Dict]:
+        """
+        Lazily list the files of a bucket whose keys start with `prefix`.
+
+        The walk starts at the deepest directory named by the prefix and
+        visits entries in name order, so keys come out roughly as S3 would
+        list them.
+        """
+        try:
+            directory_key = prefix.rpartition("/")[0]
+            start = self._path(bucket_name, directory_key) if directory_key else os.path.join(self.root_path, bucket_name)
+            # Depth-first, one sorted directory per level in memory
+            pending = [(self._scan(start), directory_key + "/" if directory_key else "")]
+            while pending:
+                entries, key_prefix = pending[-1]
+                entry = next(entries, None)
+                if entry is None:
+                    pending.pop()
+                    continue
+                object_key = key_prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    directory_key = object_key + "/"
+                    if directory_key.startswith(prefix) or prefix.startswith(directory_key):
+                        pending.append((self._scan(entry.path), directory_key))
+                elif entry.is_file() and object_key.startswith(prefix):
+                    yield _entry(object_key, entry.stat())
+        except Exception as e:
+            logger.error(f"Failed to list objects in bucket {bucket_name}: {e}")
+
+    @staticmethod
+    def _scan(path: str) -> Iterator[os.DirEntry]:
+        """Entries of a directory in name order; none if it is missing."""
+        try:
+            with os.scandir(path) as entries:
+                return iter(sorted(entries, key=lambda entry: entry.name))
+        except FileNotFoundError:
+            return iter(())
+
+    def stat_object(self, bucket_name: str, object_key: str) -> Optional[Dict]:
+        """Get the listing entry of one file."""
+        try:
+            return _entry(object_key, os.stat(self._path(bucket_name, object_key)))
+        except Exception as e:
+            logger.error(f"Failed to stat {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_body(self, bucket_name: str, object_key: str, allocate: Optional[Callable[[int], Any]] = None,
+                        size: Optional[int] = None) -> Optional[BytesLike]:
+        """
+        Get the content of a file as a read-only mapping, or copied from the
+        mapping into the buffer returned by `allocate(size)`. The mapping is
+        released with the last reference to it.
+        """
+        try:
+            mapping = _map(self._path(bucket_name, object_key))
+            if allocate is None:
+                return mapping
+            buffer = allocate(len(mapping))
+            with memoryview(buffer) as view, view.cast('B') as target:
+                target[:] = mapping
+            if isinstance(mapping, mmap.mmap):
+                mapping.close()
+            return buffer
+        except Exception as e:
+            logger.error(f"Failed to get object body for {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_stream(self, bucket_name: str, object_key: str) -> Optional[BinaryIO]:
+        """Open a file for sequential reading; the caller must close it."""
+        try:
+            return open(self._path(bucket_name, object_key), "rb")
+        except Exception as e:
+            logger.error(f"Failed to open object stream for {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_file(self, bucket_name: str, object_key: str, scratch: ScratchSpace,
+                        suffix: str = "", size: Optional[int] = None) -> Optional[ScratchFile]:
+        """Link a file into `scratch`, copying it only across file systems; the caller must close it."""
+        try:
+            return scratch.link(self._path(bucket_name, object_key), suffix)
+        except Exception as e:
+            logger.error(f"Failed to add {object_key} in bucket {bucket_name} to scratch space: {e}")
+            return None
+
+    def get_object_range(self, bucket_name: str, object_key: str, start: int, end: int) -> Optional[bytes]:
+        """Get the inclusive byte range [start, end] of a file."""
+        try:
+            mapping = _map(self._path(bucket_name, object_key))
+            try:
+                return mapping[start:end + 1]
+            finally:
+                if isinstance(mapping, mmap.mmap):
+                    mapping.close()
+        except Exception as e:
+            logger.error(f"Failed to get bytes {start}-{end} of {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_tail(self, bucket_name: str, object_key: str, length: int) -> Optional[Tuple[bytes, int]]:
+        """Get the last `length` bytes of a file together with the file size."""
+        try:
+            mapping = _map(self._path(bucket_name, object_key))
+            try:
+                return mapping[max(0, len(mapping) - length):], len(mapping)
+            finally:
+                if isinstance(mapping, mmap.mmap):
+                    mapping.close()
+        except Exception as e:
+            logger.error(f"Failed to get tail of {object_key} in bucket {bucket_name}: {e}")
+            return None
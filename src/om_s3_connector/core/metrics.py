@@ -0,0 +1,54 @@
+"""
+Run metrics for the S3 connector.
+
+RunMetrics collects the counters and timings of one ingestion run (startup
+time, requests issued, retries, ...) from any thread. With `enableMetrics`
+the connector logs them as a single summary line at the end of the run, so
+they can be scraped from the job logs.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+
+class RunMetrics:
+    """Thread-safe named counters and timings (in seconds)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._timings: Dict[str, float] = {}
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def add_time(self, name: str, seconds: float):
+        with self._lock:
+            self._timings[name] = self._timings.get(name, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Adds the time spent in the block to the `name` timing."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns all counters and timings, sorted by name."""
+        with self._lock:
+            values = {**self._counters, **{name: round(seconds, 3) for name, seconds in self._timings.items()}}
+        return dict(sorted(values.items()))
+
+    def log_summary(self):
+        values = self.snapshot()
+        if values:
+            logger.info("S3 connector metrics: " + ", ".join(f"{name}={value}" for name, value in values.items()))
@@ -0,0 +1,143 @@
+"""
+Parallel ranged downloads of whole objects.
+
+A single GET is limited by the throughput of one connection. Formats
+that need the whole object (Pickle, legacy xls, HDF5 with scattered
+chunks) are downloaded in parts instead: the object is split into
+ranges, fetched concurrently, and every part is read from its socket
+straight into its slice of one preallocated buffer, which can be a
+bytearray, a shared memory block or a memory-mapped scratch file.
+
+Parts are sized from the object size: several parts per worker so a
+slow part does not hold up the others, but no smaller than
+MIN_PART_SIZE, where per-request overhead dominates, nor larger than
+MAX_PART_SIZE.
+"""
+
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .metrics import RunMetrics
+from ..parsers.base_parser import readinto_full
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+# Bounds of the part size, which is a multiple of PART_ALIGNMENT
+MIN_PART_SIZE = 8 * 1024 * 1024
+MAX_PART_SIZE = 64 * 1024 * 1024
+PART_ALIGNMENT = 1024 * 1024
+
+# Parts per worker an object is split into, for load balancing
+PARTS_PER_WORKER = 4
+
+# Default number of part requests in flight, over all objects
+DEFAULT_CONCURRENCY = 8
+
+
+class ObjectChangedError(IOError):
+    """Raised when the parts of an object do not belong to one version of the expected size."""
+
+
+class PartPlan(NamedTuple):
+    """How an object is split: the inclusive byte ranges of its parts."""
+    part_size: int
+    parallelism: int
+    ranges: List[Tuple[int, int]]
+
+
+def plan_parts(size: int, max_parallelism: int) -> PartPlan:
+    """Splits an object of `size` bytes into parts for up to `max_parallelism` concurrent requests."""
+    max_parallelism = max(1, max_parallelism)
+    target = -(-size // (max_parallelism * PARTS_PER_WORKER))
+    part_size = -(-target // PART_ALIGNMENT) * PART_ALIGNMENT
+    part_size = min(MAX_PART_SIZE, max(MIN_PART_SIZE, part_size))
+    ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    return PartPlan(part_size, min(max_parallelism, len(ranges)), ranges)
+
+
+def should_split(size: Optional[int], threshold: int) -> bool:
+    """True if an object of this size (None when unknown) is downloaded in parts."""
+    return size is not None and size >= threshold and size > MIN_PART_SIZE
+
+
+def check_part(response: Dict, size: int):
+    """Raises ObjectChangedError if a ranged response is not part of an object of `size` bytes."""
+    content_range = response.get('ContentRange')
+    if content_range and int(content_range.rsplit('/', 1)[1]) != size:
+        raise ObjectChangedError(f"Object size is {content_range.rsplit('/', 1)[1]}, expected {size}")
+
+
+def check_etags(etags: List[Optional[str]]) -> Optional[str]:
+    """Returns the ETag shared by all the parts of an object."""
+    if len(set(etags)) > 1:
+        raise ObjectChangedError("The object changed while its parts were downloaded")
+    return etags[0]
+
+
+class ParallelDownloader:
+    """
+    Downloads objects of known size in concurrent ranged parts.
+
+    The thread pool is shared by all objects, so `max_parallelism` bounds
+    the part requests in flight for the whole run. Objects of at least
+    `threshold` bytes are split; see `should_split`.
+    """
+
+    def __init__(self, threshold: int, max_parallelism: int = DEFAULT_CONCURRENCY,
+                 metrics: Optional[RunMetrics] = None):
+        self.threshold = threshold
+        self.max_parallelism = max(1, max_parallelism)
+        self.metrics = metrics or RunMetrics()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_parallelism, thread_name_prefix="s3-download")
+
+    def should_split(self, size: Optional[int]) -> bool:
+        """True if an object of this size (None when unknown) is downloaded in parts."""
+        return should_split(size, self.threshold)
+
+    def download(self, get_range: Callable[[int, int], Dict], size: int, target: memoryview) -> Optional[str]:
+        """
+        Downloads an object of `size` bytes into `target` and returns its ETag.
+
+        `get_range(start, end)` issues a GET of the inclusive range and
+        returns the response with its body unread. Every part has finished
+        when this returns or raises, so `target` can be released right away.
+        """
+        plan = plan_parts(size, self.max_parallelism)
+        etags = [None] * len(plan.ranges)
+        futures = [
+            self._executor.submit(self._fetch_part, get_range, size, start, end, target, etags, index)
+            for index, (start, end) in enumerate(plan.ranges)
+        ]
+        # After a failure the parts not started yet are dropped, and the
+        # running ones are waited for, as they write into `target`
+        if wait(futures, return_when=FIRST_EXCEPTION).not_done:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+        for future in futures:
+            if not future.cancelled():
+                future.result()
+        etag = check_etags(etags)
+        self.metrics.increment("s3.parallel_downloads")
+        self.metrics.increment("s3.download_parts", len(plan.ranges))
+        logger.debug(f"Downloaded {size} bytes in {len(plan.ranges)} parts of {plan.part_size} bytes")
+        return etag
+
+    @staticmethod
+    def _fetch_part(get_range: Callable[[int, int], Dict], size: int, start: int, end: int,
+                    target: memoryview, etags: List[Optional[str]], index: int):
+        response = get_range(start, end)
+        body = response['Body']
+        try:
+            check_part(response, size)
+            count = readinto_full(body, target[start:end + 1])
+        finally:
+            body.close()
+        if count != end - start + 1:
+            raise ObjectChangedError(f"Part {start}-{end} ended after {count} bytes")
+        etags[index] = response.get('ETag')
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,204 @@
+"""
+Local content cache of S3 objects and byte ranges.
+
+Re-running an ingestion after a configuration change (tag rules, folder
+depth, ...) reads the same objects again. ObjectCache keeps the bodies of
+full and ranged GETs on disk, keyed by bucket, key, ETag and byte range.
+A cached entry is revalidated with `If-None-Match`, so an unchanged object
+costs one 304 response instead of its payload. The bodies are files under
+the cache directory and the index is a SQLite file next to them, so the
+directory can live on a persistent volume shared by successive jobs.
+Least recently used entries are evicted once the cache grows past its
+size limit.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+from .metrics import RunMetrics
+from ..parsers.base_parser import BytesLike, read_body
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+# Index file, under the cache directory
+INDEX_FILE_NAME = "index.db"
+
+# Sub-directory holding the cached bodies, spread over 256 fan-out directories
+OBJECTS_DIR_NAME = "objects"
+
+# Seconds to wait for another process holding the index lock
+INDEX_LOCK_TIMEOUT = 30
+
+
+class CachedObject(NamedTuple):
+    """Index entry of a cached body."""
+    etag: str
+    file_name: str
+    content_range: Optional[str]
+
+
+def _entry_file_name(bucket_name: str, object_key: str, etag: str, byte_range: str) -> str:
+    value = f"{bucket_name}\0{object_key}\0{etag}\0{byte_range}"
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class ObjectCache:
+    """
+    Size-bounded LRU cache of object bodies, indexed in SQLite.
+
+    There is one entry per (bucket, key, byte range); storing a body with a
+    new ETag replaces the previous version. `byte_range` is the Range header
+    of the request, or an empty string for the full object. The index
+    connection is shared between threads and guarded by a lock.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, metrics: Optional[RunMetrics] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.metrics = metrics or RunMetrics()
+        self._objects_dir = os.path.join(directory, OBJECTS_DIR_NAME)
+        self._lock = threading.Lock()
+
+        os.makedirs(self._objects_dir, exist_ok=True)
+        self._connection = sqlite3.connect(
+            os.path.join(directory, INDEX_FILE_NAME), timeout=INDEX_LOCK_TIMEOUT, check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                " bucket_name TEXT NOT NULL,"
+                " object_key TEXT NOT NULL,"
+                " byte_range TEXT NOT NULL,"
+                " etag TEXT NOT NULL,"
+                " file_name TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " content_range TEXT,"
+                " last_access REAL NOT NULL,"
+                " PRIMARY KEY (bucket_name, object_key, byte_range))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entry_last_access ON cache_entry (last_access)"
+            )
+            # Running total of the entry sizes, kept with every change so
+            # eviction does not sum the whole index
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)"
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO cache_size (id, total)"
+                " SELECT 0, COALESCE(SUM(size), 0) FROM cache_entry"
+            )
+        # Applies a limit lowered since the previous run
+        self._evict()
+        logger.info(f"Object cache opened at {directory}")
+
+    def lookup(self, bucket_name: str, object_key: str, byte_range: str) -> Optional[CachedObject]:
+        """Returns the cached entry of an object or range, to be revalidated with its ETag."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, file_name, content_range FROM cache_entry"
+                " WHERE bucket_name = ? AND object_key = ? AND byte_range = ?",
+                (bucket_name, object_key, byte_range),
+            ).fetchone()
+        return CachedObject(*row) if row else None
+
+    def read(self, entry: CachedObject, allocate: Optional[Callable[[int], Any]] = None) -> Optional[BytesLike]:
+        """
+        Reads a cached body after a 304, or None if it was evicted in the
+        meantime. The body is read into `allocate(size)` when given.
+        """
+        try:
+            with open(self._path(entry.file_name), "rb") as f:
+                data = read_body(f, os.fstat(f.fileno()).st_size, allocate)
+        except OSError:
+            return None
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE cache_entry SET last_access = ? WHERE file_name = ?", (time.time(), entry.file_name)
+            )
+        self.metrics.increment("object_cache.hits")
+        self.metrics.increment("object_cache.bytes_saved", len(data))
+        return data
+
+    def store(self, bucket_name: str, object_key: str, byte_range: str, etag: Optional[str], data: BytesLike,
+              content_range: Optional[str] = None):
+        """Caches a body returned by S3; bodies without an ETag or larger than the cache are skipped."""
+        self.metrics.increment("object_cache.misses")
+        if not etag or len(data) > self.max_bytes:
+            return
+        file_name = _entry_file_name(bucket_name, object_key, etag, byte_range)
+        path = self._path(file_name)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written aside and renamed, so readers never see a partial body
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except OSError:
+                os.remove(temp_path)
+                raise
+
+            with self._lock, self._connection:
+                previous = self._connection.execute(
+                    "SELECT file_name, size FROM cache_entry"
+                    " WHERE bucket_name = ? AND object_key = ? AND byte_range = ?",
+                    (bucket_name, object_key, byte_range),
+                ).fetchone()
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO cache_entry"
+                    " (bucket_name, object_key, byte_range, etag, file_name, size, content_range, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (bucket_name, object_key, byte_range, etag, file_name, len(data), content_range, time.time()),
+                )
+                self._connection.execute(
+                    "UPDATE cache_size SET total = total + ? WHERE id = 0",
+                    (len(data) - (previous[1] if previous else 0),),
+                )
+            if previous and previous[0] != file_name:
+                self._remove_file(previous[0])
+            self._evict()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not cache {object_key} in bucket {bucket_name}: {e}")
+
+    def _evict(self):
+        """Removes the least recently used entries until the cache fits in max_bytes."""
+        with self._lock, self._connection:
+            total = self._connection.execute("SELECT total FROM cache_size WHERE id = 0").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            evicted_bytes = 0
+            for file_name, size in self._connection.execute(
+                "SELECT file_name, size FROM cache_entry ORDER BY last_access"
+            ):
+                if total - evicted_bytes <= self.max_bytes:
+                    break
+                evicted.append(file_name)
+                evicted_bytes += size
+            self._connection.executemany("DELETE FROM cache_entry WHERE file_name = ?", [(f,) for f in evicted])
+            self._connection.execute("UPDATE cache_size SET total = total - ? WHERE id = 0", (evicted_bytes,))
+        for file_name in evicted:
+            self._remove_file(file_name)
+        self.metrics.increment("object_cache.evictions", len(evicted))
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self._objects_dir, file_name[:2], file_name)
+
+    def _remove_file(self, file_name: str):
+        try:
+            os.remove(self._path(file_name))
+        except OSError:
+            pass
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,311 @@
+"""
+Process-pool parse stage for the S3 connector.
+
+pandas parsing of CSV, JSON and Excel runs Python code holding the GIL, so
+the thread pool cannot spread it over several CPUs. ParsePool runs those
+parsers in worker processes instead. Raw object bytes go in; the sample
+comes back as an Arrow IPC stream, which is a single flat buffer, rather
+than a pickled DataFrame.
+
+Objects are downloaded into a SharedBuffer, a shared memory block the
+worker maps by name, so the bytes are not pickled through the pool's pipe.
+When /dev/shm is too small for an object, the buffer falls back to
+process memory and the bytes are sent as before. Objects spilled to the
+connector's scratch space are passed to the worker by path.
+"""
+
+import contextlib
+import gc
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from ..parsers.base_parser import BytesLike, concat_batches, open_buffer
+from ..parsers.factory import ParserFactory
+from .scratch import DEFAULT_MAX_BYTES, ScratchSpace, set_default_scratch_space
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+# How the worker hands the bytes to the parser
+PARSE_MODE_STREAM = "stream"
+PARSE_MODE_FILE = "file"
+PARSE_MODE_BYTES = "bytes"
+
+# Where POSIX shared memory blocks live, and the space left free there for
+# other users of shared memory
+SHARED_MEMORY_DIR = "/dev/shm"
+SHARED_MEMORY_HEADROOM = 64 * 1024 * 1024
+
+# Bytes of shared memory handed out by this process and not yet released
+_reserved_lock = threading.Lock()
+_reserved_bytes = 0
+
+
+def frame_to_ipc(df: pd.DataFrame) -> bytes:
+    """Serializes a DataFrame as an Arrow IPC stream."""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Object columns mixing Python types have no Arrow equivalent; they
+        # are mapped to STRING either way, so send them as text.
+        object_columns = {col: str for col, dtype in df.dtypes.items() if dtype == object}
+        table = pa.Table.from_pandas(df.astype(object_columns), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def frame_from_ipc(payload: bytes) -> pd.DataFrame:
+    """Reads a DataFrame back from an Arrow IPC stream."""
+    return pa.ipc.open_stream(pa.py_buffer(payload)).read_all().to_pandas()
+
+
+def _reserve_shared_memory(size: int) -> bool:
+    """
+    Reserves `size` bytes of /dev/shm, if that leaves the headroom free.
+    A block consumes tmpfs pages only as it is written, and writing past
+    the end of a full /dev/shm kills the process with SIGBUS, so blocks in
+    use are counted against the free space up front.
+    """
+    global _reserved_bytes
+    try:
+        stats = os.statvfs(SHARED_MEMORY_DIR)
+    except (AttributeError, OSError):
+        return False
+    with _reserved_lock:
+        available = stats.f_bavail * stats.f_frsize - _reserved_bytes - SHARED_MEMORY_HEADROOM
+        if size > available:
+            return False
+        _reserved_bytes += size
+        return True
+
+
+def _release_shared_memory(size: int):
+    global _reserved_bytes
+    with _reserved_lock:
+        _reserved_bytes -= size
+
+
+class SharedBuffer:
+    """
+    Buffer an object is downloaded into before it is parsed in the pool.
+
+    `allocate(size)` is passed to the connector as the buffer factory. It
+    creates a shared memory block when /dev/shm has room for it, and a
+    bytearray otherwise. The block is unlinked by `close`.
+    """
+
+    def __init__(self):
+        self.buffer: Optional[BytesLike] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._reserved = 0
+
+    @property
+    def name(self) -> Optional[str]:
+        """Name of the shared memory block, or None for a bytearray."""
+        return self._shm.name if self._shm is not None else None
+
+    def allocate(self, size: int) -> BytesLike:
+        if self.buffer is not None:
+            raise RuntimeError("SharedBuffer.allocate called twice")
+        if size > 0 and _reserve_shared_memory(size):
+            try:
+                self._shm = shared_memory.SharedMemory(create=True, size=size)
+                self._reserved = size
+                self.buffer = self._shm.buf[:size]
+                return self.buffer
+            except OSError as e:
+                _release_shared_memory(size)
+                logger.debug(f"Could not create a shared memory block of {size} bytes: {e}")
+        self.buffer = bytearray(size)
+        return self.buffer
+
+    def close(self):
+        if isinstance(self.buffer, memoryview):
+            # The caller's reference to the buffer is this same view
+            try:
+                self.buffer.release()
+            except BufferError:
+                pass
+        self.buffer = None
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                # A view is still alive somewhere; the mapping goes with it
+                pass
+            self._shm.unlink()
+            self._shm = None
+            _release_shared_memory(self._reserved)
+            self._reserved = 0
+
+
+def _parse_task(file_format: str, content: BytesLike, mode: str, max_rows: Optional[int],
+                max_bytes: Optional[int], sample_rows: int) -> Optional[bytes]:
+    """Runs in a worker process: parses `content` and returns its first rows as Arrow IPC."""
+    parser = ParserFactory.get_parser(file_format)
+    if parser is None:
+        return None
+    if mode == PARSE_MODE_STREAM:
+        df = concat_batches(parser.iter_batches(open_buffer(content), max_rows=max_rows, max_bytes=max_bytes))
+    elif mode == PARSE_MODE_FILE:
+        df = parser.parse_file(open_buffer(content), max_rows=max_rows)
+    else:
+        df = parser.parse(content)
+    if df is None or df.empty:
+        return None
+    return frame_to_ipc(df.head(sample_rows))
+
+
+def _parse_shared_task(file_format: str, name: str, length: int, mode: str, max_rows: Optional[int],
+                       max_bytes: Optional[int], sample_rows: int) -> Optional[bytes]:
+    """Runs in a worker process: parses the first `length` bytes of a shared memory block."""
+    # Pool workers share the parent's resource tracker, which already
+    # tracks the block; the parent unlinks it
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return _parse_task(file_format, shm.buf[:length], mode, max_rows, max_bytes, sample_rows)
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # Some parsers (openpyxl) leave reference cycles that still hold
+            # a view of the block
+            gc.collect()
+            shm.close()
+
+
+def _parse_path_task(file_format: str, path: str, mode: str, max_rows: Optional[int],
+                     sample_rows: int) -> Optional[bytes]:
+    """Runs in a worker process: parses a local file and returns its first rows as Arrow IPC."""
+    parser = ParserFactory.get_parser(file_format)
+    if parser is None:
+        return None
+    if mode == PARSE_MODE_FILE:
+        with open(path, "rb") as source:
+            df = parser.parse_file(source, max_rows=max_rows)
+    else:
+        df = parser.parse_path(path)
+    if df is None or df.empty:
+        return None
+    return frame_to_ipc(df.head(sample_rows))
+
+
+def _init_worker(scratch_dir: Optional[str], scratch_max_bytes: int):
+    """
+    Keeps the scratch files of a worker under the connector's scratch
+    directory, within its share of the quota.
+    """
+    if scratch_dir is not None:
+        set_default_scratch_space(ScratchSpace(scratch_dir, scratch_max_bytes))
+
+
+# Before CPython gh-115634 was fixed, a worker retiring at its task limit
+# could leave the pool without workers and hang every pending submit, so
+# older versions replace the whole executor instead.
+_RECYCLES_WORKERS = sys.version_info >= (3, 13, 1) or (3, 12, 8) <= sys.version_info < (3, 13)
+
+
+class ParsePool:
+    """
+    Pool of parser processes shared by the connector's worker threads.
+
+    Each worker process is replaced after `recycle_after` tasks, so memory
+    that pandas does not hand back to the OS is released with it. Before
+    Python 3.12.8 and 3.13.1, the whole executor is drained and replaced
+    after `recycle_after` tasks per worker instead. Workers create their
+    scratch files under `scratch_dir`, which the connector removes.
+    """
+
+    def __init__(self, max_workers: int, recycle_after: int = 100, scratch_dir: Optional[str] = None,
+                 scratch_max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_workers = max(1, max_workers)
+        self.recycle_after = max(1, recycle_after)
+        self.scratch_dir = scratch_dir
+        self.scratch_max_bytes = scratch_max_bytes
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_tasks = 0
+
+        # Parsers are imported once in the fork server, not in every worker
+        start_methods = multiprocessing.get_all_start_methods()
+        if "forkserver" in start_methods:
+            self._context = multiprocessing.get_context("forkserver")
+            self._context.set_forkserver_preload([__name__])
+        else:
+            self._context = multiprocessing.get_context("spawn")
+
+        # Counters useful for logging and metrics
+        self.task_count = 0
+        self.recycle_count = 0
+
+    def parse(self, file_format: str, content: bytes, mode: str, max_rows: Optional[int],
+              max_bytes: Optional[int], sample_rows: int) -> Optional[pd.DataFrame]:
+        """Parses `content` in a worker process; blocks the calling thread until it is done."""
+        future = self._submit(_parse_task, file_format, content, mode, max_rows, max_bytes, sample_rows)
+        payload = future.result()
+        return frame_from_ipc(payload) if payload is not None else None
+
+    def parse_path(self, file_format: str, path: str, mode: str, max_rows: Optional[int],
+                   sample_rows: int) -> Optional[pd.DataFrame]:
+        """Like `parse`, for a local file such as an object spilled to scratch space."""
+        future = self._submit(_parse_path_task, file_format, path, mode, max_rows, sample_rows)
+        payload = future.result()
+        return frame_from_ipc(payload) if payload is not None else None
+
+    @staticmethod
+    @contextlib.contextmanager
+    def shared_buffer() -> Iterator[SharedBuffer]:
+        """A SharedBuffer for one object, unlinked on exit."""
+        shared = SharedBuffer()
+        try:
+            yield shared
+        finally:
+            shared.close()
+
+    def parse_shared(self, file_format: str, shared: SharedBuffer, length: int, mode: str,
+                     max_rows: Optional[int], max_bytes: Optional[int],
+                     sample_rows: int) -> Optional[pd.DataFrame]:
+        """Like `parse`, for the first `length` bytes of a SharedBuffer."""
+        if shared.name is None:
+            content = shared.buffer if length == len(shared.buffer) else shared.buffer[:length]
+            return self.parse(file_format, content, mode, max_rows, max_bytes, sample_rows)
+        future = self._submit(_parse_shared_task, file_format, shared.name, length, mode,
+                              max_rows, max_bytes, sample_rows)
+        payload = future.result()
+        return frame_from_ipc(payload) if payload is not None else None
+
+    def _submit(self, func, *args):
+        with self._lock:
+            if (self._executor is not None and not _RECYCLES_WORKERS
+                    and self._executor_tasks >= self.recycle_after * self.max_workers):
+                # Waits for the tasks in flight, whose threads do not need the lock
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                self.recycle_count += 1
+            if self._executor is None:
+                options = {"max_tasks_per_child": self.recycle_after} if _RECYCLES_WORKERS else {}
+                worker_scratch_bytes = self.scratch_max_bytes // self.max_workers
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context,
+                                                     initializer=_init_worker,
+                                                     initargs=(self.scratch_dir, worker_scratch_bytes), **options)
+                self._executor_tasks = 0
+            self.task_count += 1
+            self._executor_tasks += 1
+            return self._executor.submit(func, *args)
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
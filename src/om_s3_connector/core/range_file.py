@@ -0,0 +1,240 @@
+"""
+Seekable, read-only file object backed by S3 ranged GET requests.
+
+Parsers for formats with random access (Parquet, Feather, HDF5, xlsx) only
+touch a fraction of an object: a footer, an index, a few row groups.
+S3RangeFile lets them read those bytes directly from S3 instead of
+downloading the full body first.
+"""
+
+import io
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Objects are fetched and cached in aligned blocks of this size.
+DEFAULT_BLOCK_SIZE = 256 * 1024
+
+# Number of blocks kept in the LRU cache (16 MiB with the default block size).
+DEFAULT_CACHE_BLOCKS = 64
+
+# Upper bound of the read-ahead window, in blocks. The window starts at one
+# block and doubles on every sequential miss.
+DEFAULT_MAX_READAHEAD_BLOCKS = 16
+
+
+class S3RangeFile(io.RawIOBase):
+    """
+    File-like view over a single S3 object.
+
+    Reads are served from an LRU cache of fixed-size blocks. Missing blocks
+    are fetched with one ranged GET per contiguous run, and sequential access
+    grows a read-ahead window so streaming readers issue few large requests.
+    The object is accepted anywhere a binary file is expected: pyarrow,
+    h5py, zipfile/openpyxl and pandas readers.
+
+    When the object size is not known up front, the constructor issues a
+    single suffix-range request for the last block. That request returns the
+    size together with the bytes that hold the footer of most columnar
+    formats.
+    """
+
+    def __init__(
+        self,
+        s3_connector,
+        bucket_name: str,
+        object_key: str,
+        size: Optional[int] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        max_readahead_blocks: int = DEFAULT_MAX_READAHEAD_BLOCKS,
+    ):
+        super().__init__()
+        self._connector = s3_connector
+        self.bucket_name = bucket_name
+        self.object_key = object_key
+        self._block_size = block_size
+        self._cache_blocks = max(1, cache_blocks)
+        self._max_readahead_blocks = max(1, max_readahead_blocks)
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._pos = 0
+        self._last_block: Optional[int] = None
+        self._readahead_blocks = 1
+
+        # Counters useful for logging and metrics
+        self.request_count = 0
+        self.bytes_fetched = 0
+
+        if size is None:
+            self._probe_tail()
+        else:
+            self._size = size
+
+    @property
+    def size(self) -> int:
+        """Total size of the object in bytes."""
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._pos = position
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        if self._pos >= self._size:
+            return 0
+        end = min(self._pos + len(buffer), self._size)
+        first_block = self._pos // self._block_size
+        last_block = (end - 1) // self._block_size
+
+        blocks = self._load_blocks(first_block, last_block)
+
+        target = memoryview(buffer).cast('B')
+        written = 0
+        for index in range(first_block, last_block + 1):
+            block_start = index * self._block_size
+            block = blocks[index]
+            chunk_start = max(self._pos, block_start) - block_start
+            chunk_end = min(end, block_start + len(block)) - block_start
+            length = chunk_end - chunk_start
+            target[written:written + length] = block[chunk_start:chunk_end]
+            written += length
+
+        self._pos += written
+        self._last_block = last_block
+        return written
+
+    def readall(self) -> bytes:
+        return self.read(max(0, self._size - self._pos))
+
+    def prefetch(self, start: int, end: int) -> bool:
+        """
+        Fetch the byte range [start, end) ahead of the reads that will use it.
+
+        Ranges larger than the cache are skipped, since their first blocks
+        would be evicted before being read. Returns True when the range is
+        held in the cache.
+        """
+        end = min(end, self._size)
+        if end <= start or end - start > self._cache_blocks * self._block_size:
+            return False
+        self._load_blocks(start // self._block_size, (end - 1) // self._block_size, readahead=False)
+        return True
+
+    def _load_blocks(self, first_block: int, last_block: int, readahead: bool = True) -> Dict[int, bytes]:
+        """Return the blocks in [first_block, last_block], fetching the missing ones."""
+        blocks = {}
+        for index in range(first_block, last_block + 1):
+            block = self._cache.get(index)
+            if block is not None:
+                self._cache.move_to_end(index)
+                blocks[index] = block
+
+        if len(blocks) == last_block - first_block + 1:
+            return blocks
+
+        fetch_until = last_block
+        if readahead:
+            if self._last_block is not None and first_block in (self._last_block, self._last_block + 1):
+                self._readahead_blocks = min(self._readahead_blocks * 2, self._max_readahead_blocks)
+            else:
+                self._readahead_blocks = 1
+            total_blocks = (self._size + self._block_size - 1) // self._block_size
+            fetch_until = min(last_block + self._readahead_blocks - 1, total_blocks - 1)
+
+        runs = self._missing_runs(first_block, fetch_until, last_block)
+        if len(runs) == 1:
+            blocks.update(self._fetch_blocks(*runs[0]))
+        elif runs:
+            blocks.update(self._fetch_runs(runs))
+        return blocks
+
+    def _missing_runs(self, first_block: int, fetch_until: int, last_block: int) -> List[tuple]:
+        """Group uncached blocks into contiguous runs, each fetched by one request."""
+        runs = []
+        run_start = None
+        for index in range(first_block, fetch_until + 1):
+            missing = index not in self._cache
+            if missing and run_start is None:
+                run_start = index
+            elif not missing:
+                if run_start is not None:
+                    runs.append((run_start, index - 1))
+                    run_start = None
+                # Read-ahead stops at the first block that is already cached
+                if index > last_block:
+                    return runs
+        if run_start is not None:
+            runs.append((run_start, fetch_until))
+        return runs
+
+    def _fetch_blocks(self, first_block: int, last_block: int) -> Dict[int, bytes]:
+        start = first_block * self._block_size
+        end = min((last_block + 1) * self._block_size, self._size) - 1
+        data = self._connector.get_object_range(self.bucket_name, self.object_key, start, end)
+        if data is None:
+            raise IOError(f"Could not read bytes {start}-{end} of {self.object_key}")
+        self.request_count += 1
+        self.bytes_fetched += len(data)
+        return self._store(start, data)
+
+    def _fetch_runs(self, runs: List[tuple]) -> Dict[int, bytes]:
+        """Fetch several runs of blocks with one call, which the connector may issue concurrently."""
+        ranges = [
+            (first_block * self._block_size, min((last_block + 1) * self._block_size, self._size) - 1)
+            for first_block, last_block in runs
+        ]
+        results = self._connector.get_object_ranges(self.bucket_name, self.object_key, ranges)
+        if results is None:
+            raise IOError(f"Could not read {len(ranges)} ranges of {self.object_key}")
+        stored = {}
+        for (start, _), data in zip(ranges, results):
+            self.request_count += 1
+            self.bytes_fetched += len(data)
+            stored.update(self._store(start, data))
+        return stored
+
+    def _probe_tail(self):
+        result = self._connector.get_object_tail(self.bucket_name, self.object_key, self._block_size)
+        if result is None:
+            raise IOError(f"Could not read {self.object_key} in bucket {self.bucket_name}")
+        data, self._size = result
+        self.request_count += 1
+        self.bytes_fetched += len(data)
+        self._store(self._size - len(data), data)
+
+    def _store(self, start: int, data: bytes) -> Dict[int, bytes]:
+        """Cache every whole block contained in data, which begins at offset start."""
+        stored = {}
+        view = memoryview(data)
+        index = -(-start // self._block_size)
+        while True:
+            block_start = index * self._block_size
+            block_end = min(block_start + self._block_size, self._size)
+            if block_start >= self._size or block_end > start + len(data):
+                break
+            block = bytes(view[block_start - start:block_end - start])
+            self._cache[index] = block
+            self._cache.move_to_end(index)
+            stored[index] = block
+            index += 1
+        while len(self._cache) > self._cache_blocks:
+            self._cache.popitem(last=False)
+        return stored
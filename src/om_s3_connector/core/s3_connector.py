@@ -9,20 +9,41 @@ files, and ingesting them as tables into OpenMetadata.
 Enhanced with security configuration support for various AWS authentication methods.
 """
 
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import os
 import re
-import pandas as pd
-from typing import Iterable, Optional, List, Dict
+import hashlib
+import bisect
+import mmap
+import functools
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple, Optional, List, Dict, Tuple
 from collections import defaultdict
 
+from botocore.exceptions import ClientError
+
 from ..parsers.factory import ParserFactory
-from .config import S3ConnectionConfig, S3SecurityConfig, SecurityProtocol
+from ..parsers.base_parser import BytesLike, concat_batches, read_body
+from .config import IOBackend, S3ConnectionConfig, S3SecurityConfig, SecurityProtocol, StorageBackendType, WriteMode
 from .security import S3SecurityManager
-from .connector import S3Connector
+from .connector import S3Connector, LISTED_OBJECT_FIELDS
+from .range_file import S3RangeFile
+from .concurrency import OnceCache, ordered_map
+from .listing import ParallelObjectLister
+from .entity_index import EntityIndex
+from .metrics import RunMetrics
+from .hedging import HedgedCaller
+from .limiter import AdaptiveLimiter, SlotBody, key_prefix
+from .multipart import ParallelDownloader
+from .object_cache import ObjectCache
+from .scratch import ScratchFile, ScratchSpace, set_default_scratch_space
+from .storage import StorageBackend, head_entry
+from .state_store import TableState, TableStateStore, combine_digests, object_digest, payload_hash, schema_hash
 
 # --- OpenMetadata Imports ---
 from metadata.generated.schema.entity.services.databaseService import DatabaseService, DatabaseConnection
-from metadata.generated.schema.entity.data.table import Column, DataType, TableData
+from metadata.generated.schema.entity.data.table import Column, DataType, FileFormat, Table, TableData
 from metadata.generated.schema.entity.data.database import Database
 from metadata.generated.schema.entity.data.databaseSchema import DatabaseSchema
 from metadata.generated.schema.type.tagLabel import TagLabel, LabelType, State, TagSource
@@ -34,8 +55,15 @@ from metadata.generated.schema.metadataIngestion.workflow import Source as Workf
 from metadata.ingestion.api.models import Either, StackTraceError
 from metadata.ingestion.api.steps import Source
 from metadata.ingestion.ometa.ometa_api import OpenMetadata
+from metadata.sampler.models import SampleData, SamplerResponse
+from metadata.utils import fqn
 from metadata.utils.logger import ingestion_logger
 
+# pandas, pyarrow and the optional readers (inventory, parse pool, Arrow
+# type mapping) are imported where they are first used, to keep startup short
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = ingestion_logger()
 
 # Mapping from pandas dtypes to OpenMetadata DataTypes
@@ -45,6 +73,35 @@ PANDAS_TO_OM_TYPE = {
     "timedelta[ns]": DataType.TIME, "category": DataType.STRING,
 }
 
+# File formats OpenMetadata records on a table; others (ORC, Excel, ...) are left unset
+OM_FILE_FORMATS = {file_format.value for file_format in FileFormat}
+
+# Number of object keys kept per logical table for descriptions
+MAX_SAMPLE_FILES = 3
+
+
+class TableRecords(NamedTuple):
+    """A parsed logical table: the payloads to send and the hashes to record."""
+    table_name: str
+    table_fqn: str
+    request: CreateTableRequest
+    sample_data: TableData
+    fingerprint: Optional[str]
+    schema_hash: str
+    request_hash: str
+    sample_hash: str
+    previous: Optional[TableState]
+
+    @property
+    def send_request(self) -> bool:
+        """False when the previous run wrote an identical table request."""
+        return not (self.previous and self.previous.request_hash == self.request_hash)
+
+    @property
+    def send_sample(self) -> bool:
+        """False when there is no sample or the previous run wrote the same one."""
+        return bool(self.sample_data) and not (self.previous and self.previous.sample_hash == self.sample_hash)
+
 
 class S3Source(Source):
     """
@@ -63,9 +120,12 @@ class S3Source(Source):
         """
         Initializes the connector with the configuration from the workflow YAML.
         """
+        started = time.perf_counter()
         super().__init__()
         self.config = config
         self.metadata = metadata
+        self.metrics = RunMetrics()
+        self.metrics.add_time("startup.import_seconds", IMPORT_SECONDS)
         
         # Extract configuration from OpenMetadata format
         service_connection_config = config.serviceConnection.root.config
@@ -74,20 +134,51 @@ class S3Source(Source):
         # Parse the new configuration format
         self._parse_connection_config(connection_options)
         
-        # Initialize security manager
-        self.security_manager = S3SecurityManager(
-            security_config=self.security_config,
-            region=self.aws_region
-        )
-        
-        # Initialize enhanced S3 connector
-        self.s3_connector = None
-        self._initialize_s3_connector()
+        # Initialize the storage backend: the enhanced S3 connector with
+        # its security manager, or the local file system
+        self.security_manager = None
+        self.s3_connector: Optional[StorageBackend] = None
+        if self.storage_backend == StorageBackendType.LOCAL:
+            self._initialize_local_backend()
+        else:
+            self.security_manager = S3SecurityManager(
+                security_config=self.security_config,
+                region=self.aws_region,
+                max_workers=self.table_workers,
+                connect_timeout=self.connection_timeout,
+                read_timeout=self.read_timeout
+            )
+            self._initialize_s3_connector()
+
+        # Incremental ingestion state
+        self.state_store = None
+        if self.enable_incremental:
+            self.state_store = TableStateStore(self.state_store_path, self.service_name, self.bucket_name)
+        self.skipped_tables = 0
+
+        # FQN index of existing entities, filled at the start of each run
+        self.entity_index = None
+
+        # Local files for objects too large to parse in memory, also used
+        # by parsers that need a real file
+        self.scratch = ScratchSpace(self.scratch_dir, self.scratch_max_bytes, self.metrics)
+        set_default_scratch_space(self.scratch)
+
+        # Worker processes for parsers that hold the GIL
+        self.parse_pool = None
+        if self.parse_pool_size > 0:
+            from .parse_pool import ParsePool
+            self.parse_pool = ParsePool(self.parse_pool_size, self.parse_pool_recycle_tasks,
+                                        scratch_dir=self.scratch.path, scratch_max_bytes=self.scratch_max_bytes)
         
-        logger.info(f"S3Source initialized with security protocol: {self.security_config.protocol}")
+        startup_seconds = time.perf_counter() - started
+        self.metrics.add_time("startup.init_seconds", startup_seconds)
+        if self.security_config is not None:
+            logger.info(f"S3Source initialized with security protocol: {self.security_config.protocol}")
         logger.info(f"Supported file formats: {self.supported_formats}")
         logger.info(f"Partition parsing enabled: {self.enable_partition_parsing}")
         logger.info(f"Sample data size: {self.sample_size}")
+        logger.info(f"S3Source started in {startup_seconds:.3f}s (module import {IMPORT_SECONDS:.3f}s)")
 
     def _parse_connection_config(self, connection_options: Dict):
         """Parse connection configuration from OpenMetadata format."""
@@ -95,20 +186,24 @@ class S3Source(Source):
         self.aws_region = connection_options.get("awsRegion", "us-east-1")
         self.endpoint_url = connection_options.get("endPointURL")
         self.bucket_name = connection_options.get("bucketName")
+        self.storage_backend = StorageBackendType(connection_options.get("storageBackend", "s3").lower())
+        self.local_root_path = connection_options.get("localRootPath")
         self.service_name = self.config.serviceName
         
-        # Security configuration
-        security_protocol = connection_options.get("securityProtocol", "access_key")
-        self.security_config = S3SecurityConfig(
-            protocol=SecurityProtocol(security_protocol),
-            awsAccessKeyId=connection_options.get("awsAccessKeyId"),
-            awsSecretAccessKey=connection_options.get("awsSecretAccessKey"),
-            awsSessionToken=connection_options.get("awsSessionToken"),
-            roleArn=connection_options.get("roleArn"),
-            roleSessionName=connection_options.get("roleSessionName", "openmetadata-s3-connector"),
-            externalId=connection_options.get("externalId"),
-            profileName=connection_options.get("profileName")
-        )
+        # Security configuration; the local storage backend needs none
+        self.security_config = None
+        if self.storage_backend == StorageBackendType.S3:
+            security_protocol = connection_options.get("securityProtocol", "access_key")
+            self.security_config = S3SecurityConfig(
+                protocol=SecurityProtocol(security_protocol),
+                awsAccessKeyId=connection_options.get("awsAccessKeyId"),
+                awsSecretAccessKey=connection_options.get("awsSecretAccessKey"),
+                awsSessionToken=connection_options.get("awsSessionToken"),
+                roleArn=connection_options.get("roleArn"),
+                roleSessionName=connection_options.get("roleSessionName", "openmetadata-s3-connector"),
+                externalId=connection_options.get("externalId"),
+                profileName=connection_options.get("profileName")
+            )
         
         # Connector settings
         formats_str = connection_options.get("file_formats", "csv,json,parquet,tsv")
@@ -149,6 +244,38 @@ class S3Source(Source):
         self.max_workers = int(connection_options.get("maxWorkers", 4))
         self.connection_timeout = int(connection_options.get("connectionTimeout", 30))
         self.read_timeout = int(connection_options.get("readTimeout", 60))
+        self.max_sample_bytes = int(connection_options.get("maxSampleBytes", 64 * 1024 * 1024))
+        self.schema_inference_rows = int(connection_options.get("schemaInferenceRows", 1000))
+        self.enable_parallel_listing = connection_options.get("enableParallelListing", "false").lower() == "true"
+        self.inventory_manifest = connection_options.get("inventoryManifest")
+        self.inventory_batch_rows = int(connection_options.get("inventoryBatchRows", 10000))
+        self.enable_incremental = connection_options.get("enableIncremental", "false").lower() == "true"
+        self.state_store_path = connection_options.get("stateStorePath", "s3_connector_state.db")
+        self.write_mode = WriteMode(connection_options.get("writeMode", "sink").lower())
+        self.sink_batch_size = max(1, int(connection_options.get("sinkBatchSize", 1)))
+        self.prefetch_entities = connection_options.get("prefetchEntities", "false").lower() == "true"
+        self.parse_pool_size = int(connection_options.get("parsePoolSize", 0))
+        self.parse_pool_recycle_tasks = int(connection_options.get("parsePoolRecycleTasks", 100))
+        self.enable_hedged_requests = connection_options.get("enableHedgedRequests", "false").lower() == "true"
+        self.hedge_percentile = float(connection_options.get("hedgePercentile", 95))
+        self.hedge_min_delay_ms = int(connection_options.get("hedgeMinDelayMs", 50))
+        self.enable_adaptive_concurrency = connection_options.get("enableAdaptiveConcurrency", "false").lower() == "true"
+        self.adaptive_max_concurrency = int(connection_options.get("adaptiveMaxConcurrency", 32))
+        # With adaptive concurrency the per-prefix limits, not the thread
+        # count, bound the S3 requests, so tables get enough threads to grow into
+        self.table_workers = self.max_workers
+        if self.enable_adaptive_concurrency:
+            self.table_workers = max(self.max_workers, self.adaptive_max_concurrency)
+        self.io_backend = IOBackend(connection_options.get("ioBackend", "threads").lower())
+        self.async_max_concurrency = int(connection_options.get("asyncMaxConcurrency", 256))
+        self.object_cache_dir = connection_options.get("objectCacheDir")
+        self.object_cache_max_bytes = int(connection_options.get("objectCacheMaxBytes", 10 * 1024 ** 3))
+        self.spill_threshold_bytes = int(connection_options.get("spillThresholdBytes", 256 * 1024 ** 2))
+        self.scratch_dir = connection_options.get("scratchDir")
+        self.scratch_max_bytes = int(connection_options.get("scratchMaxBytes", 10 * 1024 ** 3))
+        self.enable_parallel_download = connection_options.get("enableParallelDownload", "false").lower() == "true"
+        self.parallel_download_threshold = int(connection_options.get("parallelDownloadThresholdBytes", 64 * 1024 ** 2))
+        self.parallel_download_concurrency = int(connection_options.get("parallelDownloadConcurrency", 8))
         
         # Path filtering
         self.include_path_pattern = connection_options.get("includePathPattern")
@@ -167,18 +294,25 @@ class S3Source(Source):
     def _initialize_s3_connector(self):
         """Initialize the S3 connector with security configuration."""
         try:
-            # Test connection first
-            if not self.security_manager.test_connection(self.endpoint_url):
+            # Test connection first; one cached head_bucket on the target bucket
+            with self.metrics.timer("startup.connection_seconds"):
+                connected = self.security_manager.test_connection(self.endpoint_url, self.bucket_name)
+            if not connected:
                 raise ValueError("S3 connection test failed")
             
-            # Get S3 client from security manager
-            s3_client = self.security_manager.get_s3_client(self.endpoint_url)
-            
-            # Create enhanced S3 connector wrapper
-            self.s3_connector = EnhancedS3Connector(
-                s3_client=s3_client,
-                security_manager=self.security_manager
-            )
+            self.limiter = None
+            if self.io_backend == IOBackend.ASYNCIO:
+                # Requests are issued from one event loop; hedging and
+                # adaptive limits apply to the threads backend only
+                from .async_io import AsyncS3Connector
+                self.s3_connector = AsyncS3Connector(
+                    self.security_manager, self.endpoint_url, self.async_max_concurrency,
+                    download_threshold=self.parallel_download_threshold if self.enable_parallel_download else None,
+                    download_concurrency=self.parallel_download_concurrency,
+                )
+                logger.info(f"Using the asyncio I/O backend with up to {self.async_max_concurrency} requests in flight")
+            else:
+                self._initialize_threaded_connector()
             
             # Log credentials info (safe for logging)
             creds_info = self.security_manager.get_credentials_info()
@@ -187,6 +321,58 @@ class S3Source(Source):
         except Exception as e:
             logger.error(f"Failed to initialize S3 connector: {str(e)}")
             raise
+
+    def _initialize_local_backend(self):
+        """Creates the backend reading the bucket's directory under localRootPath."""
+        from .local_storage import LocalStorageBackend
+        if not self.local_root_path:
+            raise ValueError("localRootPath is required with storageBackend: local")
+        self.limiter = None
+        self.s3_connector = LocalStorageBackend(self.local_root_path)
+        if not self.s3_connector.bucket_exists(self.bucket_name):
+            raise ValueError(f"Directory of bucket {self.bucket_name} not found under {self.local_root_path}")
+        logger.info(f"Using the local storage backend at {self.local_root_path}")
+
+    def _initialize_threaded_connector(self):
+        """Creates the boto3-based connector, with hedging and adaptive limits if enabled."""
+        # Get S3 client from security manager, for the bucket's region
+        s3_client = self.security_manager.get_client_for_bucket(self.bucket_name, self.endpoint_url)
+        
+        # Slow GETs are duplicated past the hedge deadline, if enabled
+        hedger = None
+        if self.enable_hedged_requests:
+            hedger = HedgedCaller(
+                self.table_workers, self.hedge_percentile, self.hedge_min_delay_ms / 1000, self.metrics,
+                discard=lambda response: response['Body'].close(),
+            )
+        
+        # Per-prefix AIMD limits on in-flight requests, if enabled; they
+        # start at maxWorkers and adapt to throttling
+        if self.enable_adaptive_concurrency:
+            self.limiter = AdaptiveLimiter(self.max_workers, self.adaptive_max_concurrency, metrics=self.metrics)
+        
+        # Bodies of full and ranged GETs kept on disk across runs, if enabled
+        cache = None
+        if self.object_cache_dir:
+            cache = ObjectCache(self.object_cache_dir, self.object_cache_max_bytes, self.metrics)
+        
+        # Whole objects over the threshold fetched in parallel ranged parts, if enabled
+        downloader = None
+        if self.enable_parallel_download:
+            downloader = ParallelDownloader(
+                self.parallel_download_threshold, self.parallel_download_concurrency, self.metrics
+            )
+        
+        # Create enhanced S3 connector wrapper
+        self.s3_connector = EnhancedS3Connector(
+            s3_client=s3_client,
+            security_manager=self.security_manager,
+            endpoint_url=self.endpoint_url,
+            hedger=hedger,
+            limiter=self.limiter,
+            cache=cache,
+            downloader=downloader
+        )
         
     @classmethod
     def create(cls, config_dict: dict, metadata: OpenMetadata, pipeline_name: Optional[str] = None) -> "S3Source":
@@ -199,9 +385,10 @@ class S3Source(Source):
         if not self.bucket_name:
             raise ValueError("bucketName is a required field.")
         
-        # Test connection and log credentials info
-        creds_info = self.security_manager.get_credentials_info()
-        logger.info(f"Using AWS identity: {creds_info.get('arn', 'Unknown')}")
+        # Log credentials info; the connection was already tested on creation
+        if self.storage_backend == StorageBackendType.S3:
+            creds_info = self.security_manager.get_credentials_info()
+            logger.info(f"Using AWS identity: {creds_info.get('arn') or creds_info.get('protocol')}")
         
         if not self.s3_connector:
             raise ValueError("S3 connector not properly initialized.")
@@ -218,7 +405,7 @@ class S3Source(Source):
         
         return True
 
-    def _get_columns_from_dataframe(self, df: pd.DataFrame) -> List[Column]:
+    def _get_columns_from_dataframe(self, df: "pd.DataFrame") -> List[Column]:
         """Infers OpenMetadata columns from a pandas DataFrame."""
         columns = []
         for col_name, col_type in df.dtypes.items():
@@ -226,7 +413,7 @@ class S3Source(Source):
             columns.append(Column(name=str(col_name), dataType=om_type))
         return columns
 
-    def _group_files(self, objects: List[Dict]) -> Dict[str, Dict]:
+    def _group_files(self, objects: Iterable[Dict]) -> Dict[str, Dict]:
         """
         Groups S3 objects into logical tables with enhanced hierarchical folder support.
         
@@ -235,9 +422,18 @@ class S3Source(Source):
         2. Subfolders are treated as complementary data (partitions, variants, etc.)
         3. Files directly in root are grouped by filename (legacy behavior)
         4. Supports both Hive-style partitioning and hierarchical organization
+
+        `objects` is consumed lazily, so it can be the listing iterator itself.
+        Per table only the listing entry of the smallest key, the
+        MAX_SAMPLE_FILES smallest keys and the file count are kept, which keeps
+        memory flat for huge buckets and makes the result independent of the
+        listing order. Tables are returned sorted by name.
         """
         grouped_files = defaultdict(lambda: {
             "files": [], 
+            "file_count": 0,
+            "representative": None,
+            "digest": 0,
             "partitions": set(), 
             "subfolders": set(),
             "folder_structure": "flat"  # "flat", "hierarchical", or "mixed"
@@ -301,15 +497,22 @@ class S3Source(Source):
                             folder_structure = "partitioned"
             
             # Store file information
-            grouped_files[logical_table_name]["files"].append(obj_key)
-            grouped_files[logical_table_name]["folder_structure"] = folder_structure
+            table_info = grouped_files[logical_table_name]
+            if table_info["representative"] is None or obj_key < table_info["representative"]["Key"]:
+                table_info["representative"] = obj
+            if len(table_info["files"]) < MAX_SAMPLE_FILES or obj_key < table_info["files"][-1]:
+                bisect.insort(table_info["files"], obj_key)
+                del table_info["files"][MAX_SAMPLE_FILES:]
+            table_info["file_count"] += 1
+            table_info["digest"] = combine_digests(table_info["digest"], object_digest(obj))
+            table_info["folder_structure"] = folder_structure
             
             logger.debug(f"Grouped file '{obj_key}' under table '{logical_table_name}' "
                         f"(structure: {folder_structure})")
         
         # Log grouping summary
         for table_name, info in grouped_files.items():
-            file_count = len(info["files"])
+            file_count = info["file_count"]
             partition_count = len(info["partitions"])
             subfolder_count = len(info["subfolders"])
             structure = info["folder_structure"]
@@ -321,7 +524,7 @@ class S3Source(Source):
             if subfolder_count > 0:
                 logger.debug(f"  Subfolders: {sorted(info['subfolders'])}")
         
-        return grouped_files
+        return dict(sorted(grouped_files.items()))
 
     def _get_tags_for_path(self, path: str) -> List[TagLabel]:
         """Returns a list of TagLabel objects to apply to a table."""
@@ -351,167 +554,6 @@ class S3Source(Source):
         
         return tags
 
-    def next_record(self) -> Iterable[Either[dict]]:
-        """
-        Main generator that orchestrates the ingestion.
-        """
-        try:
-            service_entity = self._get_or_create_service()
-            if not service_entity: raise Exception("The service could not be created.")
-            
-            all_objects = self.s3_connector.list_objects(self.bucket_name)
-            logical_tables = self._group_files(all_objects)
-            database_entity = self._get_or_create_database(service_entity)
-            schema_entities_cache = {}
-
-            for table_name, table_info in logical_tables.items():
-                representative_path = table_info["files"][0]
-                partition_keys = sorted(list(table_info["partitions"]))
-                folder_structure = table_info.get("folder_structure", "flat")
-                subfolders = sorted(list(table_info.get("subfolders", set())))
-                
-                # Determine schema name based on folder structure
-                if folder_structure == "hierarchical":
-                    # For hierarchical structure, use the table name as schema (first-level folder)
-                    schema_name = table_name
-                else:
-                    # For flat structure, use directory or default
-                    path_parts = os.path.dirname(representative_path).split('/')
-                    schema_name = path_parts[0] if path_parts and path_parts[0] else "default"
-
-                if schema_name not in schema_entities_cache:
-                    schema_entities_cache[schema_name] = self._get_or_create_schema(database_entity, schema_name)
-                schema_entity = schema_entities_cache[schema_name]
-                
-                try:
-                    file_format = os.path.splitext(representative_path)[1].lstrip('.').lower()
-                    parser = ParserFactory.get_parser(file_format)
-                    if not parser: continue
-
-                    file_content = self.s3_connector.get_object_body(self.bucket_name, representative_path)
-                    if not file_content: continue
-
-                    df = parser.parse(file_content)
-                    if df is None or df.empty: continue
-                    
-                    columns = self._get_columns_from_dataframe(df)
-                    for p_key in partition_keys:
-                        columns.append(Column(name=p_key, dataType=DataType.STRING))
-                    
-                    sample_df = df.head(self.sample_size)
-                    sample_data_rows = [[str(value) for value in row_tuple] for row_tuple in sample_df.itertuples(index=False, name=None)]
-                    sample_data = TableData(columns=[col.name.root for col in columns if col.name.root not in partition_keys], rows=sample_data_rows)
-
-                    path_tags = self._get_tags_for_path(representative_path)
-                    
-                    # Add structure-specific tags
-                    structure_tags = self._get_structure_tags(folder_structure, subfolders)
-                    all_tags = path_tags + structure_tags
-
-                    # Create enhanced description based on folder structure
-                    description = self._create_table_description(
-                        table_info, folder_structure, file_format, partition_keys, subfolders
-                    )
-
-                    create_table_request = CreateTableRequest(
-                        name=table_name,
-                        databaseSchema=schema_entity.fullyQualifiedName,
-                        columns=columns,
-                        tags=all_tags,
-                        description=description,
-                        fileFormat=file_format,
-                        tableType="Regular",
-                    )
-
-                    created_table = self.metadata.create_or_update(create_table_request)
-                    logger.info(f"Table created/updated: {created_table.fullyQualifiedName.root}")
-
-                    if sample_data and created_table:
-                        self.metadata.ingest_table_sample_data(table=created_table, sample_data=sample_data)
-                        logger.info(f"Sample data added for: {created_table.fullyQualifiedName.root}")
-                    
-                    self.status.scanned(created_table.fullyQualifiedName.root)
-
-                except Exception as e:
-                    yield Either(left=StackTraceError(name=table_name, error=f"Could not process table group {table_name}: {e}"))
-                    continue
-
-        except Exception as e:
-            yield Either(left=StackTraceError(name=self.bucket_name, error=f"Major error during iteration: {e}"))
-            
-    def _iter(self) -> Iterable[Either]:
-        """Required method that runs the `next_record` generator."""
-        yield from self.next_record()
-
-    def _get_or_create_service(self) -> DatabaseService:
-        """Gets or creates the DatabaseService entity."""
-        service = self.metadata.get_by_name(entity=DatabaseService, fqn=self.service_name)
-        if service: return service
-        service_request = CreateDatabaseServiceRequest(name=self.service_name, serviceType="CustomDatabase", connection=self.config.serviceConnection.root)
-        return self.metadata.create_or_update(service_request)
-
-    def _get_or_create_database(self, service: DatabaseService) -> Database:
-        """Gets or creates the Database entity."""
-        db_fqn = f"{service.fullyQualifiedName.root}.{self.bucket_name}"
-        database = self.metadata.get_by_name(entity=Database, fqn=db_fqn)
-        if database: return database
-        db_request = CreateDatabaseRequest(name=self.bucket_name, service=service.fullyQualifiedName)
-        return self.metadata.create_or_update(db_request)
-
-    def _get_or_create_schema(self, database: Database, schema_name: str) -> DatabaseSchema:
-        """Gets or creates the DatabaseSchema entity."""
-        schema_fqn = f"{database.fullyQualifiedName.root}.{schema_name}"
-        schema = self.metadata.get_by_name(entity=DatabaseSchema, fqn=schema_fqn)
-        if schema: return schema
-        schema_request = CreateDatabaseSchemaRequest(name=schema_name, database=database.fullyQualifiedName)
-        return self.metadata.create_or_update(schema_request)
-    
-    def test_connection(self) -> None:
-        """Tests the connection to the S3 source."""
-        if not self.security_manager.test_connection(self.endpoint_url):
-            raise Exception("S3 connection failed")
-        logger.info("S3 Connection Test successful")
-
-    def close(self):
-        """Closes any open resources."""
-        if self.s3_connector:
-            self.s3_connector.close()
-
-
-class EnhancedS3Connector:
-    """Enhanced S3 connector that uses the security manager."""
-    
-    def __init__(self, s3_client, security_manager: S3SecurityManager):
-        """Initialize with boto3 S3 client and security manager."""
-        self.s3_client = s3_client
-        self.security_manager = security_manager
-    
-    def list_objects(self, bucket_name: str) -> List[Dict]:
-        """List all objects in a bucket with pagination support."""
-        all_objects = []
-        try:
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=bucket_name)
-            for page in pages:
-                if "Contents" in page:
-                    all_objects.extend(page['Contents'])
-        except Exception as e:
-            logger.error(f"Failed to list objects in bucket {bucket_name}: {e}")
-        return all_objects
-    
-    def get_object_body(self, bucket_name: str, object_key: str) -> Optional[bytes]:
-        """Get object content as bytes."""
-        try:
-            response = self.s3_client.get_object(Bucket=bucket_name, Key=object_key)
-            return response['Body'].read()
-        except Exception as e:
-            logger.error(f"Failed to get object body for {object_key} in bucket {bucket_name}: {e}")
-            return None
-    
-    def close(self):
-        """Close any open resources."""
-        pass
-    
     def _get_structure_tags(self, folder_structure: str, subfolders: List[str]) -> List[TagLabel]:
         """Generate tags based on folder structure type."""
         tags = []
@@ -555,7 +597,7 @@ class EnhancedS3Connector:
                                  file_format: str, partition_keys: List[str], 
                                  subfolders: List[str]) -> str:
         """Create an enhanced table description based on folder structure."""
-        file_count = len(table_info["files"])
+        file_count = table_info["file_count"]
         
         # Base description
         description_parts = [
@@ -586,12 +628,807 @@ class EnhancedS3Connector:
             description_parts.append("- **Structure**: Hive-style partitioned data")
         
         # Add file location examples
-        sample_files = table_info["files"][:3]  # Show up to 3 example files
+        sample_files = table_info["files"][:MAX_SAMPLE_FILES]  # Show up to 3 example files
         if sample_files:
             description_parts.append("- **Sample Paths**:")
             for file_path in sample_files:
                 description_parts.append(f"  - `{file_path}`")
-            if len(table_info["files"]) > 3:
-                description_parts.append(f"  - ... and {len(table_info['files']) - 3} more files")
+            if file_count > len(sample_files):
+                description_parts.append(f"  - ... and {file_count - len(sample_files)} more files")
         
         return "\n".join(description_parts)
+
+    def next_record(self) -> Iterable[Either[dict]]:
+        """
+        Main generator that orchestrates the ingestion.
+
+        The service, database and schemas are created directly. Logical
+        tables are then fetched and parsed concurrently on up to `maxWorkers`
+        threads, in table order. With `writeMode: sink` each table is yielded
+        as a CreateTableRequest followed by a SamplerResponse carrying its
+        sample data, and the workflow sink writes them; with `writeMode:
+        direct` the worker threads write to OpenMetadata themselves.
+        """
+        try:
+            service_entity = self._get_or_create_service()
+            if not service_entity: raise Exception("The service could not be created.")
+            
+            if self.inventory_manifest:
+                from .inventory import InventoryReader
+                listed_objects = iter(InventoryReader(
+                    self.s3_connector, self.inventory_manifest, self.bucket_name, self.inventory_batch_rows
+                ))
+            elif self.enable_parallel_listing:
+                listed_objects = self.s3_connector.list_objects_parallel(self.bucket_name, self.max_workers)
+            else:
+                listed_objects = self.s3_connector.list_objects(self.bucket_name)
+            logical_tables = self._group_files(listed_objects)
+            self.entity_index = EntityIndex(self.metadata) if self.prefetch_entities else None
+            if self.entity_index is not None:
+                self.entity_index.load(Database, {"service": service_entity.fullyQualifiedName.root})
+            database_entity = self._get_or_create_database(service_entity)
+            if self.entity_index is not None:
+                database_fqn = database_entity.fullyQualifiedName.root
+                self.entity_index.load(DatabaseSchema, {"database": database_fqn})
+                self.entity_index.load(Table, {"database": database_fqn})
+            schema_entities_cache = OnceCache()
+
+            def process(item):
+                table_name, table_info = item
+                fingerprint = None
+                previous = None
+                if self.state_store:
+                    fingerprint = self._table_fingerprint(table_info)
+                    previous = self.state_store.get(table_name)
+                    if previous and previous.fingerprint == fingerprint:
+                        logger.debug(f"Table '{table_name}' unchanged since {previous.updated_at}, skipping")
+                        return previous.table_fqn, None, True
+                records, error = self._prepare_table(
+                    table_name, table_info, database_entity, schema_entities_cache, fingerprint, previous
+                )
+                if records:
+                    records = self._check_table_exists(records)
+                if records and self.write_mode == WriteMode.DIRECT:
+                    return self._write_table(records)
+                return records, error, False
+
+            pending: List[TableRecords] = []
+            for result, error, skipped in ordered_map(process, logical_tables.items(), self.table_workers):
+                if error:
+                    yield error
+                elif skipped:
+                    self.skipped_tables += 1
+                    self.status.filter(result, "Unchanged since the last run")
+                elif self.write_mode == WriteMode.DIRECT:
+                    if result:
+                        self.status.scanned(result)
+                elif result:
+                    if result.send_request:
+                        yield Either(right=result.request)
+                    pending.append(result)
+                    if len(pending) >= self.sink_batch_size:
+                        yield from self._complete_tables(pending)
+                        pending = []
+            yield from self._complete_tables(pending)
+
+            if self.state_store:
+                logger.info(f"Incremental ingestion: {self.skipped_tables} of {len(logical_tables)} "
+                            f"tables unchanged and skipped")
+            if self.enable_metrics:
+                self._log_metrics(len(logical_tables))
+
+        except Exception as e:
+            yield Either(left=StackTraceError(name=self.bucket_name, error=f"Major error during iteration: {e}"))
+
+    def _log_metrics(self, table_count: int):
+        """Logs the run metrics, including the counters of the optional components."""
+        self.metrics.increment("tables.total", table_count)
+        self.metrics.increment("tables.skipped", self.skipped_tables)
+        if self.parse_pool is not None:
+            self.metrics.increment("parse_pool.tasks", self.parse_pool.task_count)
+            self.metrics.increment("parse_pool.recycles", self.parse_pool.recycle_count)
+        if self.limiter is not None:
+            logger.debug(f"Adaptive concurrency limits per prefix: {self.limiter.limits()}")
+        self.metrics.log_summary()
+
+    def _table_fingerprint(self, table_info: Dict) -> str:
+        """
+        Fingerprint of a logical table's file set and of the settings that
+        shape its metadata. A change to any key, ETag or size, or to the
+        sampling, tagging or grouping options, changes the fingerprint.
+        """
+        settings = (
+            self.sample_size, self.schema_inference_rows, self.max_sample_bytes,
+            self.tag_mapping, self.default_tags, self.enable_partition_parsing,
+            self.enable_hierarchical_folders, self.folder_depth_for_tables, self.include_subfolder_info,
+        )
+        value = f"{table_info['digest']:032x}\0{table_info['file_count']}\0{settings!r}"
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+    def _prepare_table(self, table_name: str, table_info: Dict, database_entity: Database,
+                       schema_entities_cache: OnceCache, fingerprint: Optional[str] = None,
+                       previous: Optional[TableState] = None) -> Tuple[Optional[TableRecords], Optional[Either]]:
+        """
+        Fetches and parses a single logical table and builds its records.
+
+        Runs on a worker thread. Returns the table's records, or an error
+        `Either` when processing failed; both are None when the table was
+        skipped. Errors never propagate to the other tables. The schema
+        entity is created here, once per schema, before any of its tables
+        is written.
+        """
+        try:
+            representative_path = table_info["files"][0]
+            partition_keys = sorted(list(table_info["partitions"]))
+            folder_structure = table_info.get("folder_structure", "flat")
+            subfolders = sorted(list(table_info.get("subfolders", set())))
+            
+            # Determine schema name based on folder structure
+            if folder_structure == "hierarchical":
+                # For hierarchical structure, use the table name as schema (first-level folder)
+                schema_name = table_name
+            else:
+                # For flat structure, use directory or default
+                path_parts = os.path.dirname(representative_path).split('/')
+                schema_name = path_parts[0] if path_parts and path_parts[0] else "default"
+
+            schema_entity = schema_entities_cache.get_or_create(
+                schema_name, lambda: self._get_or_create_schema(database_entity, schema_name)
+            )
+
+            file_format = os.path.splitext(representative_path)[1].lstrip('.').lower()
+            parser = ParserFactory.get_parser(file_format)
+            if not parser: return None, None
+
+            object_size = (table_info.get("representative") or {}).get("Size")
+            schema_and_sample = self._read_columns_and_sample(parser, representative_path, object_size)
+            if schema_and_sample is None: return None, None
+            columns, sample_data_rows = schema_and_sample
+            
+            for p_key in partition_keys:
+                columns.append(Column(name=p_key, dataType=DataType.STRING))
+            
+            sample_data = TableData(columns=[col.name.root for col in columns if col.name.root not in partition_keys], rows=sample_data_rows)
+
+            path_tags = self._get_tags_for_path(representative_path)
+            
+            # Add structure-specific tags
+            structure_tags = self._get_structure_tags(folder_structure, subfolders)
+            all_tags = path_tags + structure_tags
+
+            # Create enhanced description based on folder structure
+            description = self._create_table_description(
+                table_info, folder_structure, file_format, partition_keys, subfolders
+            )
+
+            create_table_request = CreateTableRequest(
+                name=table_name,
+                databaseSchema=schema_entity.fullyQualifiedName,
+                columns=columns,
+                tags=all_tags,
+                description=description,
+                fileFormat=file_format if file_format in OM_FILE_FORMATS else None,
+                tableType="Regular",
+            )
+
+            new_schema_hash = schema_hash((col.name.root, col.dataType.value) for col in columns)
+            if previous and previous.schema_hash != new_schema_hash:
+                logger.info(f"Schema of table '{table_name}' changed since the last run")
+
+            return TableRecords(
+                table_name=table_name,
+                table_fqn=f"{schema_entity.fullyQualifiedName.root}.{fqn.quote_name(table_name)}",
+                request=create_table_request,
+                sample_data=sample_data,
+                fingerprint=fingerprint,
+                schema_hash=new_schema_hash,
+                request_hash=payload_hash(create_table_request),
+                sample_hash=payload_hash(sample_data),
+                previous=previous,
+            ), None
+
+        except Exception as e:
+            return None, Either(left=StackTraceError(name=table_name, error=f"Could not process table group {table_name}: {e}"))
+
+    def _check_table_exists(self, records: TableRecords) -> TableRecords:
+        """
+        Returns the records to write for a table whose request is unchanged
+        since the last run, after checking that the table still exists in
+        OpenMetadata. A table deleted since, or never written because the
+        sink failed, loses its recorded state and is written in full.
+        """
+        if records.send_request or self._get_entity(Table, records.table_fqn, refresh_missing=True):
+            return records
+        logger.info(f"Table {records.table_fqn} not found in OpenMetadata, writing it again")
+        self._forget_state(records)
+        return records._replace(previous=None)
+
+    def _write_table(self, records: TableRecords) -> Tuple[Optional[str], Optional[Either], bool]:
+        """
+        Writes a table and its sample data to OpenMetadata (`writeMode: direct`).
+
+        Runs on a worker thread. A request or sample identical to the one
+        recorded by the previous run is not sent again.
+        """
+        try:
+            created_table = None
+            if records.send_request:
+                created_table = self.metadata.create_or_update(records.request)
+                if self.entity_index is not None:
+                    self.entity_index.add(created_table)
+                logger.info(f"Table created/updated: {records.table_fqn}")
+            else:
+                logger.debug(f"Table request unchanged, not sent: {records.table_fqn}")
+
+            if records.send_sample:
+                table_entity = created_table or self._get_entity(Table, records.table_fqn, refresh_missing=True)
+                if not table_entity:
+                    self._forget_state(records)
+                    raise ValueError(f"Table {records.table_fqn} not found after it was written")
+                self.metadata.ingest_table_sample_data(table=table_entity, sample_data=records.sample_data)
+                logger.info(f"Sample data added for: {records.table_fqn}")
+
+            self._record_state(records)
+            return records.table_fqn, None, False
+
+        except Exception as e:
+            return None, Either(left=StackTraceError(
+                name=records.table_name, error=f"Could not process table group {records.table_name}: {e}"
+            )), False
+
+    def _complete_tables(self, batch: List[TableRecords]) -> Iterable[Either]:
+        """
+        Yields the sample data records of a batch of tables (`writeMode: sink`).
+
+        Called once the sink has written the batch's table requests. The
+        table entities, which the sample data is attached to and which
+        confirm the write before the state is recorded, are looked up
+        concurrently, one batch at a time, instead of one round trip per
+        table in between the sink writes.
+        """
+        needs_entity = [records for records in batch if records.send_request or records.send_sample]
+        lookup_workers = min(len(needs_entity), self.max_workers)
+        table_entities = dict(zip(
+            (records.table_fqn for records in needs_entity),
+            ordered_map(self._get_written_table, needs_entity, lookup_workers),
+        ))
+
+        for records in batch:
+            if (records.send_request or records.send_sample) and not table_entities.get(records.table_fqn):
+                # Written in full by the next run
+                self._forget_state(records)
+                yield Either(left=StackTraceError(
+                    name=records.table_name, error=f"Table {records.table_fqn} was not written by the sink"
+                ))
+                continue
+            if records.send_sample:
+                table_entity = table_entities[records.table_fqn]
+                yield Either(right=SamplerResponse(
+                    table=table_entity, sample_data=SampleData(data=records.sample_data, store=True)
+                ))
+            elif not records.send_request:
+                self.status.scanned(records.table_fqn)
+            self._record_state(records)
+
+    def _get_written_table(self, records: TableRecords) -> Optional[Table]:
+        """
+        Returns the entity of a table the sink was sent, or None if the sink
+        did not write it. A table that already existed is found whatever the
+        sink did, so when this run sent its request the entity is fetched
+        again, bypassing the index filled before the write, and its columns
+        must be the requested ones.
+        """
+        if not records.send_request:
+            return self._get_entity(Table, records.table_fqn, refresh_missing=True)
+        table_entity = self.metadata.get_by_name(entity=Table, fqn=records.table_fqn)
+        if not table_entity:
+            return None
+        if self.entity_index is not None:
+            self.entity_index.add(table_entity)
+        written_hash = schema_hash((col.name.root, col.dataType.value) for col in table_entity.columns or ())
+        if written_hash != records.schema_hash:
+            logger.warning(f"Columns of table {records.table_fqn} differ from the request sent to the sink")
+            return None
+        return table_entity
+
+    def _record_state(self, records: TableRecords):
+        """Stores the state of an ingested table for the next incremental run."""
+        if self.state_store and records.fingerprint:
+            self.state_store.put(records.table_name, records.fingerprint, records.schema_hash,
+                                 records.table_fqn, records.request_hash, records.sample_hash)
+            
+    def _forget_state(self, records: TableRecords):
+        """Drops the recorded state of a table that is missing from OpenMetadata."""
+        if self.state_store:
+            self.state_store.delete(records.table_name)
+
+    def _read_columns_and_sample(self, parser, object_key: str,
+                                 object_size: Optional[int] = None) -> Optional[Tuple[List[Column], List[List[str]]]]:
+        """
+        Returns the columns of a file and its sample rows as strings.
+
+        Arrow-based parsers (Parquet, ORC, Feather, Avro) map their Arrow
+        schema straight to OpenMetadata columns, which keeps integer widths,
+        decimal precision and scale, time zones and nested fields; pandas is
+        not involved. Other parsers go through a DataFrame and its dtypes.
+        """
+        if parser.supports_arrow:
+            from .arrow_types import arrow_schema_to_columns
+            arrow_data = self._read_arrow(parser, object_key)
+            if arrow_data is None:
+                return None
+            schema, batch = arrow_data
+            if len(schema) == 0:
+                return None
+            rows = zip(*(column.to_pylist() for column in batch.columns))
+            return arrow_schema_to_columns(schema), [[str(value) for value in row] for row in rows]
+
+        frames = self._read_schema_and_sample(parser, object_key, object_size)
+        if frames is None:
+            return None
+        schema_df, sample_df = frames
+        rows = sample_df.itertuples(index=False, name=None)
+        return self._get_columns_from_dataframe(schema_df), [[str(value) for value in row] for row in rows]
+
+    def _read_arrow(self, parser, object_key: str):
+        """
+        Reads the Arrow schema and sample batch of a file. Random-access
+        parsers read through an S3RangeFile, so only the footer and the
+        leading row groups or stripes are fetched; Avro reads the body
+        sequentially and the connection is closed after the sample.
+        """
+        if parser.supports_random_access:
+            with S3RangeFile(self.s3_connector, self.bucket_name, object_key) as source:
+                return parser.read_arrow(source, self.sample_size)
+
+        body = self.s3_connector.get_object_stream(self.bucket_name, object_key)
+        if body is None:
+            return None
+        try:
+            return parser.read_arrow(body, self.sample_size)
+        finally:
+            body.close()
+
+    def _read_schema_and_sample(self, parser, object_key: str,
+                                object_size: Optional[int] = None) -> Optional[Tuple["pd.DataFrame", "pd.DataFrame"]]:
+        """
+        Returns a frame carrying the table schema and a frame of sample rows.
+
+        Parsers with random access read the object through an S3RangeFile, so
+        only the bytes they touch are fetched. Streaming parsers read the body
+        sequentially and stop after `schema_inference_rows` rows or
+        `max_sample_bytes` bytes, and the connection is closed without
+        draining the rest. Other formats download and parse the whole object;
+        objects larger than `spill_threshold_bytes` (by their listed
+        `object_size`) are streamed to a scratch file and parsed from there.
+        With a parse pool, parsers that hold the GIL run in a worker process
+        instead.
+        """
+        if self.parse_pool is not None and parser.holds_gil:
+            return self._read_in_parse_pool(parser, object_key, object_size)
+
+        if parser.supports_random_access:
+            with S3RangeFile(self.s3_connector, self.bucket_name, object_key) as source:
+                df = parser.parse_file(source, max_rows=self.sample_size)
+        elif parser.supports_streaming:
+            body = self.s3_connector.get_object_stream(self.bucket_name, object_key)
+            if body is None:
+                return None
+            try:
+                df = concat_batches(parser.iter_batches(
+                    body,
+                    max_rows=max(self.sample_size, self.schema_inference_rows),
+                    max_bytes=self.max_sample_bytes,
+                ))
+            finally:
+                body.close()
+        elif self._should_spill(object_size):
+            scratch_file = self._spill(object_key, object_size)
+            if scratch_file is None:
+                return None
+            with scratch_file:
+                df = parser.parse_path(scratch_file.path)
+        else:
+            file_content = self.s3_connector.get_object_body(self.bucket_name, object_key, size=object_size)
+            if not file_content:
+                return None
+            df = parser.parse(file_content)
+
+        if df is None or df.empty:
+            return None
+        return df, df.head(self.sample_size)
+
+    def _should_spill(self, object_size: Optional[int]) -> bool:
+        """True if a whole object of this listed size should be parsed from a scratch file."""
+        return object_size is not None and object_size > self.spill_threshold_bytes
+
+    def _spill(self, object_key: str, object_size: Optional[int]) -> Optional[ScratchFile]:
+        """Streams an object to a scratch file, keeping its extension; the caller must close it."""
+        return self.s3_connector.get_object_file(
+            self.bucket_name, object_key, self.scratch, suffix=os.path.splitext(object_key)[1], size=object_size
+        )
+
+    def _read_in_parse_pool(self, parser, object_key: str,
+                            object_size: Optional[int] = None) -> Optional[Tuple["pd.DataFrame", "pd.DataFrame"]]:
+        """
+        Downloads the bytes a parser needs and parses them in the parse pool.
+
+        Streaming parsers read their sample records in this thread (see
+        `FileParser.read_sample`), so no more of the object is downloaded
+        than on the in-thread streaming path. Random-access parsers cannot range-read from a worker and
+        get the whole object; above the spill threshold it goes to a scratch
+        file, which the worker opens by path. Only the sample rows come back;
+        they carry the same dtypes as the full frame, so they also serve as
+        the schema.
+        """
+        from .parse_pool import PARSE_MODE_BYTES, PARSE_MODE_FILE, PARSE_MODE_STREAM
+
+        file_format = os.path.splitext(object_key)[1].lstrip('.').lower()
+        if not parser.supports_streaming and self._should_spill(object_size):
+            scratch_file = self._spill(object_key, object_size)
+            if scratch_file is None:
+                return None
+            with scratch_file:
+                df = self.parse_pool.parse_path(
+                    file_format, scratch_file.path,
+                    PARSE_MODE_FILE if parser.supports_random_access else PARSE_MODE_BYTES,
+                    max_rows=self.sample_size,
+                    sample_rows=self.sample_size,
+                )
+            if df is None or df.empty:
+                return None
+            return df, df
+
+        if parser.supports_streaming:
+            max_rows = max(self.sample_size, self.schema_inference_rows)
+            body = self.s3_connector.get_object_stream(self.bucket_name, object_key)
+            if body is None:
+                return None
+            try:
+                sample = parser.read_sample(body, max_rows=max_rows, max_bytes=self.max_sample_bytes)
+            finally:
+                body.close()
+            if not sample:
+                return None
+            df = self.parse_pool.parse(file_format, sample, PARSE_MODE_STREAM, max_rows=max_rows,
+                                       max_bytes=None, sample_rows=self.sample_size)
+            if df is None or df.empty:
+                return None
+            return df, df
+
+        # The bytes are downloaded straight into a shared memory block that
+        # the worker maps, instead of being pickled through the pool's pipe
+        with self.parse_pool.shared_buffer() as shared:
+            content = self.s3_connector.get_object_body(self.bucket_name, object_key,
+                                                        allocate=shared.allocate, size=object_size)
+            if not content:
+                return None
+            df = self.parse_pool.parse_shared(
+                file_format, shared, len(content),
+                PARSE_MODE_FILE if parser.supports_random_access else PARSE_MODE_BYTES,
+                max_rows=self.sample_size,
+                max_bytes=self.max_sample_bytes,
+                sample_rows=self.sample_size,
+            )
+        if df is None or df.empty:
+            return None
+        return df, df
+
+    def _iter(self) -> Iterable[Either]:
+        """Required method that runs the `next_record` generator."""
+        yield from self.next_record()
+
+    def _get_or_create_service(self) -> DatabaseService:
+        """Gets or creates the DatabaseService entity."""
+        service = self.metadata.get_by_name(entity=DatabaseService, fqn=self.service_name)
+        if service: return service
+        service_request = CreateDatabaseServiceRequest(name=self.service_name, serviceType="CustomDatabase", connection=self.config.serviceConnection.root)
+        return self.metadata.create_or_update(service_request)
+
+    def _get_or_create_database(self, service: DatabaseService) -> Database:
+        """Gets or creates the Database entity."""
+        db_fqn = f"{service.fullyQualifiedName.root}.{self.bucket_name}"
+        database = self._get_entity(Database, db_fqn)
+        if database: return database
+        db_request = CreateDatabaseRequest(name=self.bucket_name, service=service.fullyQualifiedName)
+        return self.metadata.create_or_update(db_request)
+
+    def _get_or_create_schema(self, database: Database, schema_name: str) -> DatabaseSchema:
+        """Gets or creates the DatabaseSchema entity."""
+        schema_fqn = f"{database.fullyQualifiedName.root}.{schema_name}"
+        schema = self._get_entity(DatabaseSchema, schema_fqn)
+        if schema: return schema
+        schema_request = CreateDatabaseSchemaRequest(name=schema_name, database=database.fullyQualifiedName)
+        schema = self.metadata.create_or_update(schema_request)
+        if self.entity_index is not None:
+            self.entity_index.add(schema)
+        return schema
+
+    def _get_entity(self, entity_type, fqn: str, refresh_missing: bool = False):
+        """
+        Looks an entity up by FQN, from the prefetched index when it covers
+        the entity type. With `refresh_missing`, an FQN absent from the index
+        is fetched anyway, for entities the sink may have created since.
+        """
+        if self.entity_index is not None and self.entity_index.covers(entity_type):
+            entity = self.entity_index.get(entity_type, fqn)
+            if entity or not refresh_missing:
+                return entity
+        entity = self.metadata.get_by_name(entity=entity_type, fqn=fqn)
+        if self.entity_index is not None and entity:
+            self.entity_index.add(entity)
+        return entity
+    
+    def test_connection(self) -> None:
+        """Tests the connection to the S3 source."""
+        if self.storage_backend == StorageBackendType.LOCAL:
+            if not self.s3_connector.bucket_exists(self.bucket_name):
+                raise Exception(f"Directory of bucket {self.bucket_name} not found")
+        elif not self.security_manager.test_connection(self.endpoint_url, self.bucket_name):
+            raise Exception("S3 connection failed")
+        logger.info("S3 Connection Test successful")
+
+    def close(self):
+        """Closes any open resources."""
+        if self.s3_connector:
+            self.s3_connector.close()
+        if self.state_store:
+            self.state_store.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        if self.scratch is not None:
+            set_default_scratch_space(None)
+            self.scratch.close()
+
+
+class EnhancedS3Connector(StorageBackend):
+    """
+    Enhanced S3 connector that uses the security manager.
+
+    Requests for a bucket go through the client for the bucket's own
+    region (resolved once by the security manager), so buckets outside
+    the configured region, such as an inventory destination bucket, are
+    not redirected on every request. With a limiter, every request runs
+    within the adaptive concurrency limit of its key prefix. With an
+    object cache, full and ranged reads (not streams) are served from disk
+    when S3 confirms the cached ETag is current. With a downloader, whole
+    objects over its size threshold are fetched in parallel ranged parts.
+    """
+    
+    def __init__(self, s3_client, security_manager: Optional[S3SecurityManager], endpoint_url: Optional[str] = None,
+                 hedger: Optional[HedgedCaller] = None, limiter: Optional[AdaptiveLimiter] = None,
+                 cache: Optional[ObjectCache] = None, downloader: Optional[ParallelDownloader] = None):
+        """Initialize with boto3 S3 client and security manager."""
+        self.s3_client = s3_client
+        self.security_manager = security_manager
+        self.endpoint_url = endpoint_url
+        self.hedger = hedger
+        self.limiter = limiter
+        self.cache = cache
+        self.downloader = downloader
+    
+    def _client(self, bucket_name: str):
+        """Returns the client for the region of a bucket."""
+        if self.security_manager is None:
+            return self.s3_client
+        return self.security_manager.get_client_for_bucket(bucket_name, self.endpoint_url)
+
+    def _limited(self, prefix: str, request):
+        """Runs a request within the limit of a key prefix, when a limiter is configured."""
+        if self.limiter is None:
+            return request()
+        return self.limiter.call(key_prefix(prefix), request)
+
+    def _get_object(self, bucket_name: str, object_key: str, **params) -> Dict:
+        """
+        Issues a GET, limited and hedged when configured; the body is left
+        unread. With a limiter, the GET keeps its slot until the body has
+        been read or closed.
+        """
+        client = self._client(bucket_name)
+        request = functools.partial(self._send_get, object_key,
+                                    functools.partial(client.get_object, Bucket=bucket_name, Key=object_key, **params))
+        if self.hedger is None:
+            return request()
+        return self.hedger.call(request)
+
+    def _send_get(self, object_key: str, get_object: Callable[[], Dict],
+                  started: Optional[Callable[[], None]] = None) -> Dict:
+        """Sends a GET within the limit of its key prefix; `started` is called right before it goes out."""
+        def send():
+            if started is not None:
+                started()
+            return get_object()
+        if self.limiter is None:
+            return send()
+        response, release = self.limiter.hold(key_prefix(object_key), send)
+        response['Body'] = SlotBody(response['Body'], response.get('ContentLength'), release)
+        return response
+    
+    def list_objects(self, bucket_name: str, prefix: str = "") -> Iterator[Dict]:
+        """
+        Lazily list the objects in a bucket, one page at a time.
+
+        Entries are trimmed to LISTED_OBJECT_FIELDS, so memory use does not
+        grow with the size of the bucket.
+        """
+        try:
+            client = self._client(bucket_name)
+            params = {"Bucket": bucket_name, "Prefix": prefix}
+            while True:
+                page = self._limited(prefix, functools.partial(client.list_objects_v2, **params))
+                for obj in page.get('Contents', ()):
+                    yield {field: obj[field] for field in LISTED_OBJECT_FIELDS if field in obj}
+                if not page.get('IsTruncated'):
+                    break
+                params["ContinuationToken"] = page['NextContinuationToken']
+        except Exception as e:
+            logger.error(f"Failed to list objects in bucket {bucket_name}: {e}")
+    
+    def list_objects_parallel(self, bucket_name: str, max_workers: int) -> Iterator[Dict]:
+        """
+        List the objects in a bucket with up to `max_workers` concurrent requests.
+
+        Returns the same trimmed entries as `list_objects`, in no particular
+        order. See listing.ParallelObjectLister for the splitting strategy.
+        """
+        lister = ParallelObjectLister(
+            self._client(bucket_name), bucket_name, max_workers,
+            transform=lambda obj: {field: obj[field] for field in LISTED_OBJECT_FIELDS if field in obj},
+            limiter=self.limiter,
+        )
+        try:
+            yield from lister
+        except Exception as e:
+            logger.error(f"Failed to list objects in bucket {bucket_name}: {e}")
+
+    def stat_object(self, bucket_name: str, object_key: str) -> Optional[Dict]:
+        """Get the listing entry of one object with a HEAD request."""
+        try:
+            client = self._client(bucket_name)
+            response = self._limited(
+                object_key, functools.partial(client.head_object, Bucket=bucket_name, Key=object_key)
+            )
+            return head_entry(object_key, response)
+        except Exception as e:
+            logger.error(f"Failed to stat {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def _read(self, bucket_name: str, object_key: str, byte_range: str = "",
+              allocate: Optional[Callable[[int], Any]] = None) -> Tuple[BytesLike, Optional[str]]:
+        """
+        Reads an object, or a byte range given as a Range header, and returns
+        the body with its Content-Range. With an object cache, a cached body
+        is revalidated with If-None-Match and reused on a 304. The body is
+        read into `allocate(size)` when given (see `read_body`).
+        """
+        params = {"Range": byte_range} if byte_range else {}
+        entry = self.cache.lookup(bucket_name, object_key, byte_range) if self.cache is not None else None
+        response = None
+        if entry is not None:
+            try:
+                response = self._get_object(bucket_name, object_key, IfNoneMatch=entry.etag, **params)
+            except ClientError as e:
+                if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') != 304:
+                    raise
+                data = self.cache.read(entry, allocate)
+                if data is not None:
+                    return data, entry.content_range
+        if response is None:
+            response = self._get_object(bucket_name, object_key, **params)
+        try:
+            data = read_body(response['Body'], response.get('ContentLength'), allocate)
+        finally:
+            response['Body'].close()
+        if self.cache is not None:
+            self.cache.store(bucket_name, object_key, byte_range, response.get('ETag'), data,
+                             response.get('ContentRange'))
+        return data, response.get('ContentRange')
+
+    def get_object_body(self, bucket_name: str, object_key: str, allocate: Optional[Callable[[int], Any]] = None,
+                        size: Optional[int] = None) -> Optional[BytesLike]:
+        """
+        Get object content as bytes, or in the buffer returned by `allocate(size)`.
+
+        With a downloader, an object whose listed `size` is over its
+        threshold is fetched in parallel parts, unless the object cache
+        holds a copy to revalidate.
+        """
+        try:
+            if self._should_split(bucket_name, object_key, size):
+                buffer = allocate(size) if allocate is not None else bytearray(size)
+                with memoryview(buffer) as view, view.cast('B') as target:
+                    etag = self._download_parts(bucket_name, object_key, size, target)
+                if self.cache is not None:
+                    self.cache.store(bucket_name, object_key, "", etag, buffer)
+                return buffer
+            return self._read(bucket_name, object_key, allocate=allocate)[0]
+        except Exception as e:
+            logger.error(f"Failed to get object body for {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def _should_split(self, bucket_name: str, object_key: str, size: Optional[int]) -> bool:
+        if self.downloader is None or not self.downloader.should_split(size):
+            return False
+        # A cached copy costs one conditional GET when the object is unchanged
+        return self.cache is None or self.cache.lookup(bucket_name, object_key, "") is None
+
+    def _download_parts(self, bucket_name: str, object_key: str, size: int, target: memoryview) -> Optional[str]:
+        """Downloads an object in parallel ranged parts into `target`, and returns its ETag."""
+        return self.downloader.download(
+            lambda start, end: self._get_object(bucket_name, object_key, Range=f"bytes={start}-{end}"),
+            size, target,
+        )
+
+    def get_object_stream(self, bucket_name: str, object_key: str):
+        """Get the object body as an unread stream; the caller must close it."""
+        try:
+            response = self._get_object(bucket_name, object_key)
+            return response['Body']
+        except Exception as e:
+            logger.error(f"Failed to open object stream for {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_file(self, bucket_name: str, object_key: str, scratch: ScratchSpace,
+                        suffix: str = "", size: Optional[int] = None) -> Optional[ScratchFile]:
+        """
+        Streams an object into a file in `scratch`; the caller must close it.
+        Objects over the downloader's threshold are written in parallel
+        parts through a memory mapping of the file.
+        """
+        try:
+            if self.downloader is not None and self.downloader.should_split(size):
+                scratch_file = scratch.create(size, suffix)
+                try:
+                    with open(scratch_file.path, "r+b") as f, mmap.mmap(f.fileno(), size) as mapping:
+                        with memoryview(mapping) as target:
+                            self._download_parts(bucket_name, object_key, size, target)
+                except BaseException:
+                    scratch_file.close()
+                    raise
+                return scratch_file
+            response = self._get_object(bucket_name, object_key)
+            body = response['Body']
+            try:
+                return scratch.write(body, response.get('ContentLength'), suffix)
+            finally:
+                body.close()
+        except Exception as e:
+            logger.error(f"Failed to download {object_key} in bucket {bucket_name} to scratch space: {e}")
+            return None
+
+    def get_object_range(self, bucket_name: str, object_key: str, start: int, end: int) -> Optional[bytes]:
+        """Get the inclusive byte range [start, end] of an object."""
+        try:
+            return self._read(bucket_name, object_key, f"bytes={start}-{end}")[0]
+        except Exception as e:
+            logger.error(f"Failed to get bytes {start}-{end} of {object_key} in bucket {bucket_name}: {e}")
+            return None
+
+    def get_object_tail(self, bucket_name: str, object_key: str, length: int) -> Optional[Tuple[bytes, int]]:
+        """
+        Get the last `length` bytes of an object together with the object size.
+
+        Uses a suffix range so the size comes back with the data (from the
+        Content-Range header) without a separate HEAD request.
+        """
+        try:
+            body, content_range = self._read(bucket_name, object_key, f"bytes=-{length}")
+            object_size = int(content_range.rsplit('/', 1)[1]) if content_range else len(body)
+            return body, object_size
+        except Exception as e:
+            logger.error(f"Failed to get tail of {object_key} in bucket {bucket_name}: {e}")
+            return None
+    
+    def close(self):
+        """Close any open resources."""
+        if self.hedger is not None:
+            self.hedger.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.downloader is not None:
+            self.downloader.close()
+
+
+# Time spent importing this module and its dependencies, reported at startup
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
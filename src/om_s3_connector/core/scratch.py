@@ -0,0 +1,205 @@
+"""
+Local scratch space for objects too large to hold in memory.
+
+Formats without random access over S3 (pickle, legacy xls, HDF5 files
+written by PyTables) are parsed from the whole object. Above a size
+threshold the connector streams such objects to a file in a ScratchSpace
+instead of reading them into bytes, and the parser maps the file. The
+scratch space is a private directory, removed when the space is closed
+or the process exits, with a quota on the bytes its files may hold.
+Writers that would exceed the quota wait for other files to be released.
+"""
+
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from typing import BinaryIO, Optional
+
+from .metrics import RunMetrics
+from ..parsers.base_parser import readinto_full
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+# Default quota of a scratch space
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024 * 1024
+
+# Prefix of the private directory created for each scratch space
+DIRECTORY_PREFIX = "om-s3-scratch-"
+
+# Size of each read from the source stream while writing a scratch file
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Seconds a writer waits for quota held by other files
+QUOTA_WAIT_TIMEOUT = 600
+
+
+class ScratchQuotaExceeded(OSError):
+    """Raised when a scratch file does not fit in the quota."""
+
+
+class ScratchFile:
+    """
+    A file in a scratch space. `close` removes it and returns its bytes to
+    the quota; it is also a context manager.
+    """
+
+    def __init__(self, space: "ScratchSpace", path: str, reserved: int):
+        self.space = space
+        self.path = path
+        self.size = 0
+        self._reserved = reserved
+
+    def close(self):
+        if self.path is None:
+            return
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.debug(f"Could not remove scratch file {self.path}: {e}")
+        self.space._release(self._reserved)
+        self.path = None
+        self._reserved = 0
+
+    def __enter__(self) -> "ScratchFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ScratchSpace:
+    """
+    Quota-bounded private directory for scratch files.
+
+    The directory is created under `directory` (the system temporary
+    directory by default) and removed by `close`, or at exit if the space
+    was never closed.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 metrics: Optional[RunMetrics] = None):
+        self.max_bytes = max_bytes
+        self.metrics = metrics or RunMetrics()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix=DIRECTORY_PREFIX, dir=directory)
+        self._condition = threading.Condition()
+        self._used = 0
+        self._link_names = itertools.count()
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.path, ignore_errors=True)
+
+    def create(self, size: int, suffix: str = "") -> ScratchFile:
+        """Creates a scratch file of `size` zero bytes, to be filled in place (e.g. through mmap)."""
+        reserved = self._reserve(size)
+        fd, path = tempfile.mkstemp(dir=self.path, suffix=suffix)
+        scratch_file = ScratchFile(self, path, reserved)
+        try:
+            os.ftruncate(fd, size)
+        except BaseException:
+            scratch_file.close()
+            raise
+        finally:
+            os.close(fd)
+        scratch_file.size = size
+        self.metrics.increment("scratch.files")
+        self.metrics.increment("scratch.bytes", size)
+        return scratch_file
+
+    def write(self, stream: BinaryIO, size: Optional[int] = None, suffix: str = "") -> ScratchFile:
+        """
+        Copies a stream into a new scratch file and returns it.
+
+        `size` is the expected length, reserved up front; without it the
+        quota is taken as the bytes arrive, and an overflow fails at once
+        rather than waiting.
+        """
+        reserved = self._reserve(size) if size else 0
+        fd, path = tempfile.mkstemp(dir=self.path, suffix=suffix)
+        scratch_file = ScratchFile(self, path, reserved)
+        try:
+            buffer = bytearray(COPY_CHUNK_SIZE)
+            with os.fdopen(fd, "wb") as f, memoryview(buffer) as view:
+                while True:
+                    count = readinto_full(stream, view)
+                    if not count:
+                        break
+                    if scratch_file.size + count > scratch_file._reserved:
+                        scratch_file._reserved += self._reserve(
+                            scratch_file.size + count - scratch_file._reserved, wait=False
+                        )
+                    f.write(view[:count])
+                    scratch_file.size += count
+        except BaseException:
+            scratch_file.close()
+            raise
+        self.metrics.increment("scratch.files")
+        self.metrics.increment("scratch.bytes", scratch_file.size)
+        return scratch_file
+
+    def link(self, path: str, suffix: str = "") -> ScratchFile:
+        """
+        Adds an existing local file to the space as a hard link, which takes
+        no quota and leaves the original in place when closed. Files on
+        another file system are copied instead.
+        """
+        link_path = os.path.join(self.path, f"link-{next(self._link_names)}{suffix}")
+        try:
+            os.link(path, link_path)
+        except OSError:
+            with open(path, "rb") as source:
+                return self.write(source, os.fstat(source.fileno()).st_size, suffix)
+        scratch_file = ScratchFile(self, link_path, 0)
+        scratch_file.size = os.stat(link_path).st_size
+        self.metrics.increment("scratch.files")
+        return scratch_file
+
+    def _reserve(self, size: int, wait: bool = True) -> int:
+        if size > self.max_bytes:
+            raise ScratchQuotaExceeded(
+                f"{size} bytes do not fit in the scratch space quota of {self.max_bytes} bytes"
+            )
+        with self._condition:
+            if wait:
+                fits = self._condition.wait_for(lambda: self._used + size <= self.max_bytes, QUOTA_WAIT_TIMEOUT)
+            else:
+                fits = self._used + size <= self.max_bytes
+            if not fits:
+                raise ScratchQuotaExceeded(
+                    f"Scratch space quota of {self.max_bytes} bytes is in use ({self._used} bytes)"
+                )
+            self._used += size
+        return size
+
+    def _release(self, size: int):
+        with self._condition:
+            self._used -= size
+            self._condition.notify_all()
+
+    def close(self):
+        """Removes the directory and every file left in it."""
+        self._finalizer()
+
+
+_default_space: Optional[ScratchSpace] = None
+_default_lock = threading.Lock()
+
+
+def default_scratch_space() -> ScratchSpace:
+    """The scratch space parsers use for temporary files, created on first use."""
+    global _default_space
+    with _default_lock:
+        if _default_space is None:
+            _default_space = ScratchSpace()
+        return _default_space
+
+
+def set_default_scratch_space(space: Optional[ScratchSpace]):
+    """Makes `space` the scratch space parsers use, e.g. the one configured for the connector."""
+    global _default_space
+    with _default_lock:
+        _default_space = space
@@ -2,73 +2,242 @@
 Security management for S3 connector.
 """
 
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple
 import boto3
+import botocore.session
 from botocore.config import Config
+from botocore.credentials import DeferredRefreshableCredentials
 from botocore.exceptions import ClientError
 
+from .config import S3SecurityConfig, SecurityProtocol
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+# Successful bucket probes are reused for this many seconds, so a source
+# created and tested several times in one process checks the bucket once.
+BUCKET_PROBE_TTL = 300
+
+# botocore's default connection pool size per client
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+# Lifetime requested for assumed-role credentials; botocore renews them
+# 15 minutes before they expire.
+ASSUME_ROLE_DURATION_SECONDS = 3600
+
+_probe_lock = threading.Lock()
+_bucket_probes: Dict[Tuple, float] = {}
+
+# Sessions and clients are shared by every S3SecurityManager in the process,
+# so re-created sources reuse credentials and connection pools.
+_cache_lock = threading.Lock()
+_sessions: Dict[Tuple, boto3.Session] = {}
+_clients: Dict[Tuple, Any] = {}
+
+# Region of each bucket, keyed by (endpoint, bucket), resolved once per process;
+# None records a bucket whose region could not be resolved
+_bucket_regions: Dict[Tuple[Optional[str], str], Optional[str]] = {}
+
+# Header S3 (and MinIO) returns with the bucket's region, even on errors
+BUCKET_REGION_HEADER = 'x-amz-bucket-region'
+
 
 class S3SecurityManager:
     """
     Manages security configurations and credentials for S3 connections.
+    
+    One session is kept per set of credentials and one client per (region,
+    endpoint, protocol) with those credentials, for the whole process.
+    With `iam_role`, the session holds refreshable credentials: the role
+    is assumed on the first request and again shortly before the
+    credentials expire, however many clients use them.
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, security_config: S3SecurityConfig, region: str = 'us-east-1', verify_ssl: bool = True,
+                 max_workers: int = 4, connect_timeout: int = 30, read_timeout: int = 60):
         """
         Initialize security manager with configuration.
         
         Args:
-            config: Security configuration dictionary
+            security_config: Security configuration of the connection
+            region: AWS region of the S3 client
+            verify_ssl: Whether to verify TLS certificates
+            max_workers: Number of worker threads sharing each client; sizes its connection pool
+            connect_timeout: Seconds to wait for a connection to S3
+            read_timeout: Seconds to wait for data on an open connection
         """
-        self.config = config
-        self.aws_access_key_id = config.get('awsAccessKeyId')
-        self.aws_secret_access_key = config.get('awsSecretAccessKey')
-        self.aws_session_token = config.get('awsSessionToken')
-        self.aws_region = config.get('awsRegion', 'us-east-1')
-        self.endpoint_url = config.get('endPointURL')
-        self.verify_ssl = config.get('verifySSL', True)
+        self.security_config = security_config
+        self.protocol = SecurityProtocol(security_config.protocol)
+        self.aws_access_key_id = security_config.awsAccessKeyId
+        self.aws_secret_access_key = security_config.awsSecretAccessKey
+        self.aws_session_token = security_config.awsSessionToken
+        self.profile_name = security_config.profileName
+        self.aws_region = region
+        self.verify_ssl = verify_ssl
+        # Table workers, listing workers and entity lookups can all hold a
+        # connection at the same time
+        self.max_pool_connections = max(DEFAULT_MAX_POOL_CONNECTIONS, 2 * max_workers)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        
+    def _credentials_key(self) -> Tuple:
+        """Identifies the credentials, without the secret, for the caches."""
+        return (self.protocol, self.aws_access_key_id, self.profile_name, self.security_config.roleArn,
+                self.security_config.roleSessionName, self.security_config.externalId)
         
     def get_boto3_session(self) -> boto3.Session:
         """
-        Create and return a boto3 session with configured credentials.
+        Return the boto3 session holding the configured credentials.
         
         Returns:
-            boto3.Session: Configured session
+            boto3.Session: Configured session, shared by managers with the same credentials
         """
-        return boto3.Session(
+        key = self._credentials_key()
+        with _cache_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = self._create_session()
+                _sessions[key] = session
+            return session
+    
+    def _create_session(self) -> boto3.Session:
+        if self.protocol == SecurityProtocol.AWS_IAM:
+            # Default provider chain (environment, web identity, instance
+            # profile); botocore refreshes those credentials itself
+            return boto3.Session(region_name=self.aws_region, profile_name=self.profile_name)
+        
+        base_session = boto3.Session(
             aws_access_key_id=self.aws_access_key_id,
             aws_secret_access_key=self.aws_secret_access_key,
             aws_session_token=self.aws_session_token,
-            region_name=self.aws_region
+            region_name=self.aws_region,
+            profile_name=self.profile_name
         )
+        if self.protocol != SecurityProtocol.IAM_ROLE:
+            return base_session
+        
+        if not self.security_config.roleArn:
+            raise ValueError("roleArn is required when using iam_role protocol")
+        sts_client = base_session.client('sts', region_name=self.aws_region)
+        assume_role_args = {
+            'RoleArn': self.security_config.roleArn,
+            'RoleSessionName': self.security_config.roleSessionName or 'openmetadata-s3-connector',
+            'DurationSeconds': ASSUME_ROLE_DURATION_SECONDS,
+        }
+        if self.security_config.externalId:
+            assume_role_args['ExternalId'] = self.security_config.externalId
+        
+        def assume_role() -> Dict[str, str]:
+            credentials = sts_client.assume_role(**assume_role_args)['Credentials']
+            logger.info(f"Assumed role {assume_role_args['RoleArn']}, credentials expire at {credentials['Expiration']}")
+            return {
+                'access_key': credentials['AccessKeyId'],
+                'secret_key': credentials['SecretAccessKey'],
+                'token': credentials['SessionToken'],
+                'expiry_time': credentials['Expiration'].isoformat(),
+            }
+        
+        botocore_session = botocore.session.get_session()
+        botocore_session._credentials = DeferredRefreshableCredentials(
+            refresh_using=assume_role, method='sts-assume-role'
+        )
+        return boto3.Session(botocore_session=botocore_session, region_name=self.aws_region)
     
-    def get_s3_client(self) -> boto3.client:
+    def get_s3_client(self, endpoint_url: Optional[str] = None, region: Optional[str] = None) -> boto3.client:
         """
-        Create and return an S3 client with security configurations.
+        Return an S3 client with security configurations.
+        
+        Clients are created on first use and reused afterwards; boto3
+        clients are thread-safe, and building one loads the service model,
+        which is a noticeable part of startup.
         
+        Args:
+            endpoint_url: Custom endpoint URL (for MinIO compatibility)
+            region: Region of the client, if not the configured one
+            
         Returns:
             boto3.client: Configured S3 client
         """
+        region = region or self.aws_region
         session = self.get_boto3_session()
-        
+        key = (region, endpoint_url, self._credentials_key(), self.verify_ssl, self.max_pool_connections,
+               self.connect_timeout, self.read_timeout)
+        with _cache_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = self._create_s3_client(session, endpoint_url, region)
+                _clients[key] = client
+            return client
+    
+    def _create_s3_client(self, session: boto3.Session, endpoint_url: Optional[str], region: str) -> boto3.client:
         # Create client configuration
         config = Config(
             signature_version='s3v4',
-            retries={'max_attempts': 3, 'mode': 'adaptive'}
+            retries={'max_attempts': 3, 'mode': 'adaptive'},
+            max_pool_connections=self.max_pool_connections,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout
         )
         
         client_kwargs = {
             'config': config,
-            'verify': self.verify_ssl
+            'verify': self.verify_ssl,
+            'region_name': region
         }
         
         # Add custom endpoint URL if provided (for MinIO compatibility)
-        if self.endpoint_url:
-            client_kwargs['endpoint_url'] = self.endpoint_url
+        if endpoint_url:
+            client_kwargs['endpoint_url'] = endpoint_url
             
         return session.client('s3', **client_kwargs)
     
-    def validate_credentials(self) -> bool:
+    def test_connection(self, endpoint_url: Optional[str] = None, bucket_name: Optional[str] = None) -> bool:
+        """
+        Check that the credentials can reach the target bucket.
+        
+        Issues a single `head_bucket`, which needs the same permission as
+        listing the bucket, rather than `list_buckets`, which needs account
+        wide permissions and is slower on large accounts. A successful probe
+        is cached for `BUCKET_PROBE_TTL` seconds. Without a bucket name the
+        credentials are validated with `list_buckets`.
+        
+        Returns:
+            bool: True if the bucket is accessible, False otherwise
+        """
+        if not bucket_name:
+            return self.validate_credentials(endpoint_url)
+        
+        key = (endpoint_url, self.aws_region, bucket_name, self._credentials_key())
+        with _probe_lock:
+            probed_at = _bucket_probes.get(key)
+        if probed_at is not None and time.monotonic() - probed_at < BUCKET_PROBE_TTL:
+            return True
+        
+        if not self.test_bucket_access(bucket_name, endpoint_url):
+            return False
+        with _probe_lock:
+            _bucket_probes[key] = time.monotonic()
+        return True
+    
+    def get_credentials_info(self) -> Dict[str, Any]:
+        """
+        Describe the configured credentials without secrets and without
+        calling AWS.
+        
+        Returns:
+            dict: Protocol, region and, when configured, role ARN and profile
+        """
+        return {
+            'protocol': self.protocol.value,
+            'region': self.aws_region,
+            'arn': self.security_config.roleArn,
+            'profile': self.profile_name,
+        }
+    
+    def validate_credentials(self, endpoint_url: Optional[str] = None) -> bool:
         """
         Validate S3 credentials by attempting to list buckets.
         
@@ -76,7 +245,7 @@ class S3SecurityManager:
             bool: True if credentials are valid, False otherwise
         """
         try:
-            client = self.get_s3_client()
+            client = self.get_s3_client(endpoint_url)
             client.list_buckets()
             return True
         except ClientError as e:
@@ -87,21 +256,24 @@ class S3SecurityManager:
         except Exception:
             return False
     
-    def test_bucket_access(self, bucket_name: str) -> bool:
+    def test_bucket_access(self, bucket_name: str, endpoint_url: Optional[str] = None) -> bool:
         """
         Test access to a specific bucket.
         
         Args:
             bucket_name: Name of the bucket to test
+            endpoint_url: Custom endpoint URL (for MinIO compatibility)
             
         Returns:
             bool: True if bucket is accessible, False otherwise
         """
         try:
-            client = self.get_s3_client()
-            client.head_bucket(Bucket=bucket_name)
+            client = self.get_s3_client(endpoint_url)
+            response = client.head_bucket(Bucket=bucket_name)
+            self._remember_region(bucket_name, endpoint_url, response)
             return True
         except ClientError as e:
+            self._remember_region(bucket_name, endpoint_url, e.response)
             error_code = e.response.get('Error', {}).get('Code', '')
             if error_code in ['403', '404', 'NoSuchBucket']:
                 return False
@@ -109,21 +281,65 @@ class S3SecurityManager:
         except Exception:
             return False
     
-    def get_bucket_region(self, bucket_name: str) -> Optional[str]:
+    def get_bucket_region(self, bucket_name: str, endpoint_url: Optional[str] = None) -> Optional[str]:
         """
         Get the region of a specific bucket.
         
+        The region is resolved once per process: from the region header of
+        a `head_bucket` response (a connection test already records it),
+        falling back to `get_bucket_location`.
+        
         Args:
             bucket_name: Name of the bucket
+            endpoint_url: Custom endpoint URL (for MinIO compatibility)
             
         Returns:
             str: Bucket region or None if not found
         """
+        with _cache_lock:
+            if (endpoint_url, bucket_name) in _bucket_regions:
+                return _bucket_regions[(endpoint_url, bucket_name)]
+        
+        client = self.get_s3_client(endpoint_url)
+        try:
+            response = client.head_bucket(Bucket=bucket_name)
+        except ClientError as e:
+            response = e.response
+        except Exception:
+            response = {}
+        region = self._remember_region(bucket_name, endpoint_url, response)
+        if region:
+            return region
+        
         try:
-            client = self.get_s3_client()
             response = client.get_bucket_location(Bucket=bucket_name)
             location = response.get('LocationConstraint')
             # If location is None, it means us-east-1
-            return location if location else 'us-east-1'
-        except Exception:
+            region = location if location else 'us-east-1'
+        except Exception as e:
+            logger.warning(f"Could not resolve the region of bucket {bucket_name}, using {self.aws_region}: {e}")
+            region = None
+        with _cache_lock:
+            _bucket_regions[(endpoint_url, bucket_name)] = region
+        return region
+    
+    def get_client_for_bucket(self, bucket_name: str, endpoint_url: Optional[str] = None) -> boto3.client:
+        """
+        Return the client for the region a bucket lives in, so its requests
+        are not redirected from the configured region. Falls back to the
+        configured region when the bucket's region cannot be resolved.
+        """
+        region = self.get_bucket_region(bucket_name, endpoint_url) or self.aws_region
+        return self.get_s3_client(endpoint_url, region)
+    
+    def _remember_region(self, bucket_name: str, endpoint_url: Optional[str], response: Dict) -> Optional[str]:
+        """Caches the bucket region found in the headers of a head_bucket response or error."""
+        headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        region = headers.get(BUCKET_REGION_HEADER)
+        if not region:
             return None
+        with _cache_lock:
+            _bucket_regions[(endpoint_url, bucket_name)] = region
+        if region != self.aws_region:
+            logger.info(f"Bucket {bucket_name} is in region {region}; routing its requests to that region")
+        return region
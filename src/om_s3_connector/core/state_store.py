@@ -0,0 +1,130 @@
+"""
+Persistent per-table state for incremental ingestion.
+
+Each scheduled run records, for every logical table it ingested, a
+fingerprint of the table's file set, a hash of the resulting schema and
+hashes of the table request and sample data sent to OpenMetadata. On the
+next run, tables whose fingerprint is unchanged are skipped without
+fetching, parsing or calling OpenMetadata, and for changed tables only the
+payloads that differ are written. The store is a single SQLite file, so
+it can live on a persistent volume shared by successive jobs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from metadata.utils.logger import ingestion_logger
+
+logger = ingestion_logger()
+
+# Per-object digests are summed modulo this value, so the file set
+# fingerprint does not depend on the order objects were listed in.
+_FINGERPRINT_MODULUS = 1 << 128
+
+
+class TableState(NamedTuple):
+    """State recorded for a logical table after a successful ingestion."""
+    fingerprint: str
+    schema_hash: str
+    table_fqn: str
+    updated_at: str
+    request_hash: Optional[str] = None
+    sample_hash: Optional[str] = None
+
+
+def object_digest(obj: dict) -> int:
+    """Digest of one listing entry, built from its key, ETag and size."""
+    value = f"{obj.get('Key')}\0{obj.get('ETag', '')}\0{obj.get('Size', '')}"
+    return int.from_bytes(hashlib.sha256(value.encode("utf-8")).digest()[:16], "big")
+
+
+def combine_digests(total: int, digest: int) -> int:
+    """Add an object digest to a running, order-independent file set digest."""
+    return (total + digest) % _FINGERPRINT_MODULUS
+
+
+def payload_hash(model) -> str:
+    """Hash of the canonical JSON form of a pydantic request or payload."""
+    return hashlib.sha256(model.model_dump_json(exclude_none=True).encode("utf-8")).hexdigest()
+
+
+def schema_hash(columns: Iterable[Tuple[str, str]]) -> str:
+    """Hash of a table schema given as (column name, data type) pairs."""
+    value = "\n".join(f"{name}\0{data_type}" for name, data_type in columns)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class TableStateStore:
+    """
+    SQLite-backed store of `TableState` rows keyed by table.
+
+    Rows are scoped by service and bucket, so several pipelines can share one
+    database file. The connection is shared between worker threads and
+    guarded by a lock; every write is committed immediately, so a job that
+    is killed half way keeps the state of the tables it finished.
+    """
+
+    def __init__(self, path: str, service_name: str, bucket_name: str):
+        self.path = path
+        self.service_name = service_name
+        self.bucket_name = bucket_name
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS table_state ("
+                " service_name TEXT NOT NULL,"
+                " bucket_name TEXT NOT NULL,"
+                " table_name TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " schema_hash TEXT NOT NULL,"
+                " table_fqn TEXT NOT NULL,"
+                " updated_at TEXT NOT NULL,"
+                " request_hash TEXT,"
+                " sample_hash TEXT,"
+                " PRIMARY KEY (service_name, bucket_name, table_name))"
+            )
+        logger.info(f"Incremental state store opened at {path}")
+
+    def get(self, table_name: str) -> Optional[TableState]:
+        """Returns the recorded state of a table, or None if it was never ingested."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, schema_hash, table_fqn, updated_at, request_hash, sample_hash FROM table_state"
+                " WHERE service_name = ? AND bucket_name = ? AND table_name = ?",
+                (self.service_name, self.bucket_name, table_name),
+            ).fetchone()
+        return TableState(*row) if row else None
+
+    def put(self, table_name: str, fingerprint: str, schema_hash: str, table_fqn: str,
+            request_hash: Optional[str] = None, sample_hash: Optional[str] = None):
+        """Records the state of a table after it was ingested."""
+        updated_at = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO table_state"
+                " (service_name, bucket_name, table_name, fingerprint, schema_hash, table_fqn, updated_at,"
+                " request_hash, sample_hash)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.service_name, self.bucket_name, table_name, fingerprint, schema_hash, table_fqn, updated_at,
+                 request_hash, sample_hash),
+            )
+
+    def delete(self, table_name: str):
+        """Forgets the state of a table, so the next run writes it in full."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM table_state WHERE service_name = ? AND bucket_name = ? AND table_name = ?",
+                (self.service_name, self.bucket_name, table_name),
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,87 @@
+"""
+Storage backend interface of the S3 connector.
+
+S3Source lists, groups, parses and emits objects without knowing where
+they are stored; every byte goes through a StorageBackend. The boto3 and
+aiobotocore connectors are the S3 backends, and LocalStorageBackend reads
+a directory tree, for on-premises file dumps and for measuring the
+pipeline without network I/O.
+
+Backends follow one contract: listings yield the LISTED_OBJECT_FIELDS
+of each object, lazily; reads return None (or an empty listing) after
+logging a failure rather than raising.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..parsers.base_parser import BytesLike
+from .scratch import ScratchFile, ScratchSpace
+
+
+def head_entry(object_key: str, response: Dict) -> Dict:
+    """Listing entry of an object from its HeadObject response."""
+    entry = {
+        "Key": object_key,
+        "Size": response.get("ContentLength"),
+        "ETag": response.get("ETag"),
+        "LastModified": response.get("LastModified"),
+    }
+    if response.get("StorageClass"):
+        entry["StorageClass"] = response["StorageClass"]
+    return entry
+
+
+class StorageBackend(ABC):
+    """Listing and reading of the objects of a bucket."""
+
+    @abstractmethod
+    def list_objects(self, bucket_name: str, prefix: str = "") -> Iterator[Dict]:
+        """Lazily lists the objects under `prefix`, trimmed to LISTED_OBJECT_FIELDS."""
+
+    def list_objects_parallel(self, bucket_name: str, max_workers: int) -> Iterator[Dict]:
+        """Lists the whole bucket with up to `max_workers` concurrent requests, in no particular order."""
+        return self.list_objects(bucket_name)
+
+    @abstractmethod
+    def stat_object(self, bucket_name: str, object_key: str) -> Optional[Dict]:
+        """Returns the listing entry of one object, or None if it cannot be read."""
+
+    @abstractmethod
+    def get_object_body(self, bucket_name: str, object_key: str, allocate: Optional[Callable[[int], Any]] = None,
+                        size: Optional[int] = None) -> Optional[BytesLike]:
+        """
+        Returns the content of an object, in the buffer returned by
+        `allocate(size)` when given. `size` is the listed size, if known.
+        """
+
+    @abstractmethod
+    def get_object_stream(self, bucket_name: str, object_key: str) -> Optional[BinaryIO]:
+        """Opens the object for sequential reading; the caller must close the stream."""
+
+    @abstractmethod
+    def get_object_file(self, bucket_name: str, object_key: str, scratch: ScratchSpace,
+                        suffix: str = "", size: Optional[int] = None) -> Optional[ScratchFile]:
+        """Makes the object available as a file in `scratch`; the caller must close it."""
+
+    @abstractmethod
+    def get_object_range(self, bucket_name: str, object_key: str, start: int, end: int) -> Optional[bytes]:
+        """Returns the inclusive byte range [start, end] of an object."""
+
+    def get_object_ranges(self, bucket_name: str, object_key: str,
+                          ranges: List[Tuple[int, int]]) -> Optional[List[bytes]]:
+        """Returns several inclusive byte ranges of an object."""
+        results = []
+        for start, end in ranges:
+            data = self.get_object_range(bucket_name, object_key, start, end)
+            if data is None:
+                return None
+            results.append(data)
+        return results
+
+    @abstractmethod
+    def get_object_tail(self, bucket_name: str, object_key: str, length: int) -> Optional[Tuple[bytes, int]]:
+        """Returns the last `length` bytes of an object together with the object size."""
+
+    def close(self):
+        """Releases the clients, pools and caches of the backend."""
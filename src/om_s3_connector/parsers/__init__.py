@@ -2,30 +2,45 @@
 File format parsers for the S3 Connector.
 
 This module contains parsers for various file formats supported by the connector.
+Parser classes are imported on first access, so importing the package does not
+load every format's module.
 """
 
-from .factory import ParserFactory
+import importlib
+
+from .factory import ParserFactory, get_parser
 from .base_parser import FileParser
 
-# Import all parser classes
-from .csv_parser import CsvParser
-from .json_parser import JsonParser
-from .jsonl_parser import JsonlParser
-from .parquet_parser import ParquetParser
-from .avro_parser import AvroParser
-from .orc_parser import OrcParser
-from .excel_parser import ExcelParser
-from .feather_parser import FeatherParser
-from .hdf5_parser import Hdf5Parser
-from .pickle_parser import PickleParser
-from .delta_parser import DeltaParser
-from .tsv_parser import TsvParser
+# Parser classes, imported lazily by `__getattr__`
+_PARSER_MODULES = {
+    "CsvParser": ".csv_parser",
+    "JsonParser": ".json_parser",
+    "JsonlParser": ".jsonl_parser",
+    "ParquetParser": ".parquet_parser",
+    "AvroParser": ".avro_parser",
+    "OrcParser": ".orc_parser",
+    "ExcelParser": ".excel_parser",
+    "FeatherParser": ".feather_parser",
+    "Hdf5Parser": ".hdf5_parser",
+    "PickleParser": ".pickle_parser",
+    "DeltaParser": ".delta_parser",
+    "TsvParser": ".tsv_parser",
+}
+
+
+def __getattr__(name):
+    module_name = _PARSER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
+
 
 __all__ = [
     "ParserFactory",
     "FileParser",
+    "get_parser",
     "CsvParser",
-    "JsonParser", 
+    "JsonParser",
     "JsonlParser",
     "ParquetParser",
     "AvroParser",
@@ -37,7 +52,3 @@ __all__ = [
     "DeltaParser",
     "TsvParser"
 ]
-# This file makes the 'parsers' directory a Python package
-# and simplifies imports.
-
-from .factory import get_parser
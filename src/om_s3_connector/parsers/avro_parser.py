@@ -1,8 +1,10 @@
 # File: connectors/s3/parsers/avro_parser.py
 
 import pandas as pd
-from typing import Optional
-from .base_parser import FileParser
+import io
+import json
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+from .base_parser import BytesLike, FileParser, LimitedReader, DEFAULT_BATCH_ROWS, arrow_sample_batch, concat_batches, open_buffer
 import logging
 
 # Use standard Python logging if OpenMetadata logger is not available
@@ -13,13 +15,77 @@ except ImportError:
     logger = logging.getLogger(__name__)
 
 
+def avro_schema_to_arrow(schema) -> "pyarrow.Schema":
+    """
+    Convert an Avro record schema to an Arrow schema.
+    
+    Logical types map to their Arrow counterparts (decimal, date, time,
+    timestamp); a union of null and one type becomes that type, and other
+    unions become strings.
+    """
+    import pyarrow as pa
+    
+    named_types: Dict[str, "pyarrow.DataType"] = {}
+    primitives = {
+        "null": pa.null(), "boolean": pa.bool_(), "int": pa.int32(), "long": pa.int64(),
+        "float": pa.float32(), "double": pa.float64(), "bytes": pa.binary(), "string": pa.string(),
+    }
+    logical_types = {
+        "date": pa.date32(), "time-millis": pa.time32("ms"), "time-micros": pa.time64("us"),
+        "timestamp-millis": pa.timestamp("ms", tz="UTC"), "timestamp-micros": pa.timestamp("us", tz="UTC"),
+        "local-timestamp-millis": pa.timestamp("ms"), "local-timestamp-micros": pa.timestamp("us"),
+        "uuid": pa.string(),
+    }
+    
+    def convert(avro_type):
+        if isinstance(avro_type, str):
+            return primitives.get(avro_type) or named_types.get(avro_type, pa.string())
+        if isinstance(avro_type, list):
+            branches = [branch for branch in avro_type if branch != "null"]
+            return convert(branches[0]) if len(branches) == 1 else pa.string()
+        
+        kind = avro_type.get("type")
+        logical_type = avro_type.get("logicalType")
+        if logical_type == "decimal":
+            arrow_type = pa.decimal128(avro_type["precision"], avro_type.get("scale", 0))
+        elif logical_type in logical_types:
+            arrow_type = logical_types[logical_type]
+        elif kind == "record":
+            named_types[avro_type["name"]] = pa.string()  # recursive references
+            arrow_type = pa.struct([pa.field(field["name"], convert(field["type"])) for field in avro_type["fields"]])
+        elif kind == "array":
+            arrow_type = pa.list_(convert(avro_type["items"]))
+        elif kind == "map":
+            arrow_type = pa.map_(pa.string(), convert(avro_type["values"]))
+        elif kind == "enum":
+            arrow_type = pa.string()
+        elif kind == "fixed":
+            arrow_type = pa.binary(avro_type["size"])
+        else:
+            arrow_type = convert(kind)
+        
+        if kind in ("record", "enum", "fixed") and "name" in avro_type:
+            named_types[avro_type["name"]] = arrow_type
+            if "namespace" in avro_type:
+                named_types[f"{avro_type['namespace']}.{avro_type['name']}"] = arrow_type
+        return arrow_type
+    
+    root = convert(schema)
+    if not pa.types.is_struct(root):
+        return pa.schema([pa.field("value", root)])
+    return pa.schema(list(root))
+
+
 class AvroParser(FileParser):
     """
     Parser for Apache Avro files.
     Avro is a data serialization framework with rich data structures and schema evolution.
     """
 
-    def parse(self, file_content: bytes) -> Optional[pd.DataFrame]:
+    supports_streaming = True
+    supports_arrow = True
+
+    def parse(self, file_content: BytesLike) -> Optional[pd.DataFrame]:
         """
         Parse Avro file content and return a pandas DataFrame.
         
@@ -30,87 +96,111 @@ class AvroParser(FileParser):
             Optional[pd.DataFrame]: Parsed DataFrame or None if parsing fails
         """
         try:
-            import avro.schema
-            import avro.io
-            import io
-            import json
-            
             logger.debug("Parsing Avro file content")
-            
-            # Create a file-like object from bytes
-            file_buffer = io.BytesIO(file_content)
-            
-            # Read Avro file
-            records = []
-            
-            # Use avro library to read the file
-            decoder = avro.io.BinaryDecoder(file_buffer)
-            reader = avro.io.DatumReader()
-            
-            # Try to read records
-            try:
-                while True:
-                    record = reader.read(decoder)
-                    records.append(record)
-            except:
-                # End of file or error reading more records
-                pass
-            
-            if not records:
-                logger.warning("No records found in Avro file")
-                return None
-            
-            # Convert records to DataFrame
-            df = pd.DataFrame(records)
+            df = concat_batches(self.iter_batches(open_buffer(file_content)))
             
             if df.empty:
-                logger.warning("Avro file resulted in empty DataFrame")
+                logger.warning("No records found in Avro file")
                 return None
                 
             logger.info(f"Successfully parsed Avro file: {len(df)} rows, {len(df.columns)} columns")
             return df
             
-        except ImportError:
-            # Try alternative approach with fastavro
-            try:
-                import fastavro
-                import io
-                
-                logger.debug("Using fastavro for Avro parsing")
-                
-                file_buffer = io.BytesIO(file_content)
-                records = []
-                
-                # Read with fastavro
-                avro_reader = fastavro.reader(file_buffer)
-                for record in avro_reader:
-                    records.append(record)
-                
-                if not records:
-                    logger.warning("No records found in Avro file")
-                    return None
-                
-                df = pd.DataFrame(records)
-                
-                if df.empty:
-                    logger.warning("Avro file resulted in empty DataFrame")
-                    return None
-                    
-                logger.info(f"Successfully parsed Avro file with fastavro: {len(df)} rows, {len(df.columns)} columns")
-                return df
-                
-            except ImportError as e:
-                logger.error(f"Neither avro-python3 nor fastavro is available: {e}")
-                logger.error("Please install Avro support: pip install avro-python3 or pip install fastavro")
-                return None
-            except Exception as e:
-                logger.error(f"Failed to parse Avro file with fastavro: {str(e)}")
-                return None
-                
+        except ImportError as e:
+            logger.error(f"Neither fastavro nor avro is available: {e}")
+            logger.error("Please install Avro support: pip install fastavro or pip install avro")
+            return None
         except Exception as e:
             logger.error(f"Failed to parse Avro file: {str(e)}")
             return None
 
+    def iter_batches(
+        self,
+        stream: BinaryIO,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream Avro records in batches of DataFrames.
+        
+        Avro object container files are read block by block, so reading stops
+        after the block that satisfies `max_rows` or crosses `max_bytes`.
+        fastavro is used when installed, otherwise the avro library.
+        
+        Args:
+            stream (BinaryIO): Readable stream holding the Avro file
+            max_rows (Optional[int]): Maximum number of records to read
+            max_bytes (Optional[int]): Stop after about this many bytes
+            batch_rows (int): Number of records per batch
+            
+        Yields:
+            pd.DataFrame: Batches of parsed records
+        """
+        counter = LimitedReader(stream)
+        records = []
+        row_count = 0
+        
+        for record in self._iter_records(io.BufferedReader(counter)):
+            records.append(record)
+            row_count += 1
+            
+            if len(records) >= batch_rows:
+                yield pd.DataFrame(records)
+                records = []
+            
+            if max_rows is not None and row_count >= max_rows:
+                break
+            if max_bytes is not None and counter.bytes_read >= max_bytes:
+                break
+        
+        if records:
+            yield pd.DataFrame(records)
+
+    def read_arrow(self, stream: BinaryIO, max_rows: int):
+        """
+        Read the Arrow schema from the Avro writer schema, and the first
+        `max_rows` records as a record batch, without going through pandas.
+        """
+        import pyarrow as pa
+        
+        records, writer_schema = self._open_records(io.BufferedReader(LimitedReader(stream)))
+        sample = []
+        for record in records:
+            if len(sample) >= max_rows:
+                break
+            sample.append(record)
+        
+        schema = avro_schema_to_arrow(writer_schema)
+        try:
+            batches = pa.Table.from_pylist(sample, schema=schema).to_batches()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # Sample values only need to be displayable; let Arrow infer them
+            table = pa.Table.from_pylist(sample)
+            return schema, arrow_sample_batch(table.schema, table.to_batches(), max_rows)
+        return schema, arrow_sample_batch(schema, batches, max_rows)
+
+    def _iter_records(self, reader: BinaryIO) -> Iterator[dict]:
+        """Iterate over the records of an Avro object container file."""
+        records, _ = self._open_records(reader)
+        yield from records
+
+    def _open_records(self, reader: BinaryIO) -> Tuple[Iterator[dict], dict]:
+        """Open an Avro object container file; returns its records and writer schema."""
+        try:
+            import fastavro
+            
+            logger.debug("Using fastavro for Avro parsing")
+            avro_reader = fastavro.reader(reader)
+            return avro_reader, avro_reader.writer_schema
+            
+        except ImportError:
+            import avro.datafile
+            import avro.io
+            
+            avro_reader = avro.datafile.DataFileReader(reader, avro.io.DatumReader())
+            return iter(avro_reader), json.loads(avro_reader.meta["avro.schema"])
+
     def get_file_extension(self) -> str:
         """Return the file extension for Avro files."""
         return "avro"
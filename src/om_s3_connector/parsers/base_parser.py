@@ -1,17 +1,375 @@
 # File: connectors/s3/parsers/base_parser.py
 
+import io
+import mmap
+import os
 from abc import ABC, abstractmethod
-import pandas as pd
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+# pandas is imported where it is used, so the connector can load the parser
+# base classes without paying for it at startup
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Number of rows per batch yielded by `FileParser.iter_batches`.
+DEFAULT_BATCH_ROWS = 10000
+
+# Size of each read issued against the underlying stream.
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# File contents handed to `FileParser.parse`: bytes, or a buffer an object
+# was read into (bytearray, memoryview over shared memory)
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def readinto_full(stream, buffer) -> int:
+    """
+    Fills `buffer` from `stream` until it is full or the stream ends, and
+    returns the number of bytes written. Streams without `readinto` are
+    read in chunks.
+    """
+    with memoryview(buffer) as view, view.cast('B') as target:
+        filled = 0
+        while filled < len(target):
+            if hasattr(stream, "readinto"):
+                count = stream.readinto(target[filled:])
+            else:
+                chunk = stream.read(min(STREAM_CHUNK_SIZE, len(target) - filled))
+                count = len(chunk)
+                target[filled:filled + count] = chunk
+            if not count:
+                break
+            filled += count
+        return filled
+
+
+def read_body(stream, size: Optional[int], allocate: Optional[Callable[[int], Any]] = None) -> BytesLike:
+    """
+    Reads a whole stream of `size` bytes, into a buffer from `allocate`.
+
+    `allocate(size)` provides the buffer (a shared memory block, say), and
+    the bytes are written into it once, straight from the socket. Without
+    `allocate` the stream is read as bytes, which botocore already does in
+    one piece when the length is known. Without a known size the stream is
+    read as bytes and then copied into the allocated buffer.
+    """
+    if allocate is None or size is None:
+        data = stream.read()
+        if allocate is None:
+            return data
+        size, stream = len(data), io.BytesIO(data)
+    buffer = allocate(size)
+    with memoryview(buffer) as view:
+        filled = readinto_full(stream, view[:size])
+    if filled < size:
+        raise IOError(f"Stream ended after {filled} of {size} bytes")
+    return buffer
+
+
+class MemoryReader(io.RawIOBase):
+    """
+    Seekable, read-only file object over a buffer, without copying it.
+
+    `io.BytesIO` shares a bytes object but copies any other buffer;
+    MemoryReader works on a memoryview, so a bytearray or shared memory
+    block is read in place. `getbuffer` exposes the whole view.
+    """
+
+    def __init__(self, buffer: BytesLike):
+        super().__init__()
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._pos = position
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b""
+        self._pos = max(self._pos, end)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer) -> int:
+        with memoryview(buffer) as view, view.cast('B') as target:
+            length = max(0, min(len(target), len(self._view) - self._pos))
+            target[:length] = self._view[self._pos:self._pos + length]
+        self._pos += length
+        return length
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._view.release()
+            except BufferError:
+                # A caller still holds a slice from getbuffer; the view is
+                # released when that slice is
+                pass
+        super().close()
+
+
+def open_buffer(content: BytesLike) -> BinaryIO:
+    """Returns a seekable file object over `content` without copying it."""
+    if isinstance(content, bytes):
+        # BytesIO shares an immutable bytes object until it is written to
+        return io.BytesIO(content)
+    return MemoryReader(content)
+
+
+def arrow_buffer(content: BytesLike) -> "pyarrow.BufferReader":
+    """Returns a pyarrow reader over `content`, whose reads are zero-copy slices."""
+    import pyarrow as pa
+
+    return pa.BufferReader(pa.py_buffer(content))
+
+
+class LimitedReader(io.RawIOBase):
+    """
+    Readable wrapper that stops pulling from `raw` after `max_bytes` bytes.
+
+    With `line_aligned`, bytes after the last newline are held back until the
+    next newline arrives, so a byte limit never cuts a record in half; the
+    partial line is only released at the real end of the stream.
+    `bytes_read` reports how much was consumed from `raw`.
+    """
+
+    def __init__(self, raw, max_bytes: Optional[int] = None, line_aligned: bool = False):
+        super().__init__()
+        self._raw = raw
+        self._remaining = max_bytes
+        self._line_aligned = line_aligned
+        self._ready = b""
+        self._offset = 0
+        self._pending = b""
+        self._eof = False
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while self._offset >= len(self._ready) and not self._eof:
+            self._fill()
+        length = min(len(buffer), len(self._ready) - self._offset)
+        buffer[:length] = self._ready[self._offset:self._offset + length]
+        self._offset += length
+        return length
+
+    def _fill(self):
+        if self._remaining == 0:
+            # Limit reached: keep a trailing partial line only at real EOF
+            if self._pending and not self._raw.read(1):
+                self._ready, self._offset = self._pending, 0
+            self._pending = b""
+            self._eof = True
+            return
+
+        size = STREAM_CHUNK_SIZE if self._remaining is None else min(STREAM_CHUNK_SIZE, self._remaining)
+        chunk = self._raw.read(size)
+        if not chunk:
+            self._ready, self._offset = self._pending, 0
+            self._pending = b""
+            self._eof = True
+            return
+
+        self.bytes_read += len(chunk)
+        if self._remaining is not None:
+            self._remaining = max(0, self._remaining - len(chunk))
+
+        if not self._line_aligned:
+            self._ready, self._offset = chunk, 0
+            return
+
+        data = self._pending + chunk
+        cut = data.rfind(b"\n") + 1
+        self._ready, self._offset = data[:cut], 0
+        self._pending = data[cut:]
+
+
+def read_lines(stream, max_lines: Optional[int] = None, max_bytes: Optional[int] = None) -> bytes:
+    """
+    Reads the first `max_lines` whole lines of a stream, pulling no more
+    than about `max_bytes` bytes. The stream is read in chunks and stops
+    at the chunk that completes the last line wanted; a partial last line
+    is kept only at the real end of the stream.
+    """
+    reader = LimitedReader(stream, max_bytes, line_aligned=True)
+    chunks = []
+    line_count = 0
+    while max_lines is None or line_count < max_lines:
+        chunk = reader.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        line_count += chunk.count(b"\n")
+    data = b"".join(chunks)
+    if max_lines is not None and line_count > max_lines:
+        end = -1
+        for _ in range(max_lines):
+            end = data.index(b"\n", end + 1)
+        data = data[:end + 1]
+    return data
+
+
+def concat_batches(batches: Iterable["pd.DataFrame"]) -> "pd.DataFrame":
+    """Concatenates batches from `FileParser.iter_batches` into a single DataFrame."""
+    import pandas as pd
+
+    frames = list(batches)
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def arrow_sample_batch(schema, batches: List, max_rows: int):
+    """Combines Arrow record batches into one batch of at most `max_rows` rows."""
+    import pyarrow as pa
+
+    table = pa.Table.from_batches(batches, schema=schema).slice(0, max_rows).combine_chunks()
+    combined = table.to_batches()
+    if combined:
+        return combined[0]
+    return pa.RecordBatch.from_arrays([pa.array([], type=field.type) for field in schema], schema=schema)
+
 
 class FileParser(ABC):
     """
     Abstract base class for all file parsers.
     It defines a single contract: a `parse` method that takes file content
     as bytes and returns a pandas DataFrame.
+
+    Parsers for formats with random access also set `supports_random_access`
+    and override `parse_file`, which reads from a seekable file object so
+    only the bytes the parser touches are transferred.
+
+    `parse_path` parses a local file; objects too large to hold in memory
+    are spilled to disk and parsed that way.
+
+    Parsers that can read incrementally set `supports_streaming` and override
+    `iter_batches`, which consumes a readable stream and yields DataFrame
+    batches, stopping as soon as the row or byte limit is satisfied. `parse`
+    stays available as the whole-file entry point.
+
+    `holds_gil` marks parsers whose work runs as Python code; the connector
+    can move those to a process pool. Arrow-based parsers release the GIL
+    and set it to False.
+
+    Parsers that produce Arrow data set `supports_arrow` and override
+    `read_arrow`, which returns the Arrow schema and a sample record batch
+    without converting to pandas.
     """
+    supports_random_access: bool = False
+    supports_streaming: bool = False
+    holds_gil: bool = True
+    supports_arrow: bool = False
+
     @abstractmethod
-    def parse(self, content: bytes) -> pd.DataFrame:
+    def parse(self, content: bytes) -> "pd.DataFrame":
         """
         Parses the binary content of a file and returns a DataFrame.
         """
         pass
+
+    def parse_file(self, source: BinaryIO, max_rows: Optional[int] = None) -> "pd.DataFrame":
+        """
+        Parses a seekable binary file object and returns a DataFrame.
+
+        `max_rows` is a hint that only the first rows will be used; parsers
+        that can stop early read no more than needed. The default
+        implementation reads the whole file and delegates to `parse`.
+        """
+        return self.parse(source.read())
+
+    def parse_path(self, path: str) -> "pd.DataFrame":
+        """
+        Parses a local file, such as a large object spilled to scratch space.
+
+        The default implementation maps the file and passes the mapping to
+        `parse`, so the file is paged in on demand rather than read into
+        memory. Parsers that need a file name override it.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return self.parse(b"")
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return self.parse(mapping)
+        finally:
+            try:
+                mapping.close()
+            except BufferError:
+                # The frame still references the mapping; it is unmapped
+                # when the frame is collected
+                pass
+
+    def read_arrow(self, source: BinaryIO, max_rows: int) -> Tuple["pyarrow.Schema", "pyarrow.RecordBatch"]:
+        """
+        Returns the Arrow schema of a file and a record batch of up to
+        `max_rows` rows. `source` is seekable for parsers that also set
+        `supports_random_access`, and a sequential stream otherwise.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not read Arrow data")
+
+    def iter_batches(
+        self,
+        stream: BinaryIO,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> Iterator["pd.DataFrame"]:
+        """
+        Yields the records of a readable stream as DataFrame batches.
+
+        Args:
+            stream: Readable binary stream, read sequentially with `read(n)`
+            max_rows: Stop after this many rows in total
+            max_bytes: Stop pulling from the stream after about this many bytes
+            batch_rows: Number of rows per yielded batch
+
+        The default implementation reads the whole stream, delegates to
+        `parse` and ignores `max_bytes`.
+        """
+        df = self.parse(stream.read())
+        if df is None:
+            return
+        if max_rows is not None:
+            df = df.head(max_rows)
+        for start in range(0, len(df), batch_rows):
+            yield df.iloc[start:start + batch_rows]
+
+    def read_sample(self, stream: BinaryIO, max_rows: Optional[int] = None,
+                    max_bytes: Optional[int] = None) -> bytes:
+        """
+        Reads the bytes `iter_batches` would consume from the start of a
+        stream for `max_rows` rows, e.g. to parse them in another process.
+        The default implementation reads up to `max_bytes` bytes; parsers
+        that know their record boundaries stop after `max_rows` records.
+        """
+        return LimitedReader(stream, max_bytes).read()
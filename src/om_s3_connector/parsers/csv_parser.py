@@ -2,11 +2,36 @@
 
 import pandas as pd
 import io
-from .base_parser import FileParser
+from typing import BinaryIO, Iterator, Optional
+from .base_parser import BytesLike, FileParser, LimitedReader, DEFAULT_BATCH_ROWS, open_buffer, read_lines
 
 class CsvParser(FileParser):
     """
     Concrete parser for CSV files.
     """
-    def parse(self, content: bytes) -> pd.DataFrame:
-        return pd.read_csv(io.BytesIO(content))
+    separator = ','
+    supports_streaming = True
+
+    def __init__(self, **read_options):
+        """`read_options` are passed through to pandas.read_csv (e.g. header, names, dtype)."""
+        self.read_options = read_options
+
+    def parse(self, content: BytesLike) -> pd.DataFrame:
+        return pd.read_csv(open_buffer(content), sep=self.separator, **self.read_options)
+
+    def iter_batches(
+        self,
+        stream: BinaryIO,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        reader = io.BufferedReader(LimitedReader(stream, max_bytes, line_aligned=True))
+        with pd.read_csv(reader, sep=self.separator, chunksize=batch_rows, nrows=max_rows,
+                         **self.read_options) as chunks:
+            yield from chunks
+
+    def read_sample(self, stream: BinaryIO, max_rows: Optional[int] = None,
+                    max_bytes: Optional[int] = None) -> bytes:
+        """The header line and up to `max_rows` record lines; quoted line breaks can make it fewer records."""
+        return read_lines(stream, max_rows + 1 if max_rows is not None else None, max_bytes)
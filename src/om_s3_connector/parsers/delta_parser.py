@@ -1,9 +1,9 @@
 # File: connectors/s3/parsers/delta_parser.py
 
 import pandas as pd
-import tempfile
-import os
-from .base_parser import FileParser
+from typing import BinaryIO, Optional
+from .base_parser import BytesLike, FileParser, arrow_buffer
+from .parquet_parser import ParquetParser
 
 class DeltaParser(FileParser):
     """
@@ -11,8 +11,10 @@ class DeltaParser(FileParser):
     Delta tables are stored as a collection of Parquet files with transaction logs.
     This parser attempts to read the underlying Parquet files.
     """
+    supports_random_access = True
+    holds_gil = False
     
-    def parse(self, content: bytes) -> pd.DataFrame:
+    def parse(self, content: BytesLike) -> pd.DataFrame:
         """
         Parse Delta Lake content and return a DataFrame.
         
@@ -28,45 +30,29 @@ class DeltaParser(FileParser):
             pd.DataFrame: Parsed data from the Delta file
         """
         try:
-            # Delta tables typically contain Parquet files
-            # Try to parse as Parquet first
+            # Delta data files are Parquet, read from an Arrow buffer over
+            # the content rather than a copy of it
             import pyarrow.parquet as pq
-            import io
             
-            # Read as Parquet file
-            parquet_file = pq.ParquetFile(io.BytesIO(content))
-            table = parquet_file.read()
-            df = table.to_pandas()
-            
-            return df
-            
-        except ImportError:
-            # Fallback if pyarrow is not available
-            try:
-                # Try using pandas parquet reader
-                df = pd.read_parquet(io.BytesIO(content))
-                return df
-            except Exception as fallback_e:
-                raise ValueError(f"Failed to parse Delta file as Parquet (pyarrow not available): {str(fallback_e)}")
-                
+            return pq.ParquetFile(arrow_buffer(content)).read().to_pandas()
         except Exception as e:
-            # If direct Parquet parsing fails, try alternative approaches
-            try:
-                # Alternative: save to temp file and try different methods
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.parquet') as temp_file:
-                    temp_file.write(content)
-                    temp_file.flush()
-                    
-                    try:
-                        # Try reading with pandas
-                        df = pd.read_parquet(temp_file.name)
-                        return df
-                    finally:
-                        # Clean up temp file
-                        os.unlink(temp_file.name)
-                        
-            except Exception as temp_e:
-                raise ValueError(f"Failed to parse Delta file: Original error: {str(e)}, Temp file error: {str(temp_e)}")
+            raise ValueError(f"Failed to parse Delta file as Parquet: {str(e)}")
+    
+    def parse_file(self, source: BinaryIO, max_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Parse a seekable Delta data file object.
+        
+        Delta data files are Parquet, so only the footer and the leading
+        row groups are read when `max_rows` is given.
+        
+        Args:
+            source (BinaryIO): Seekable file object holding a Delta data file
+            max_rows (Optional[int]): Number of rows that will be used
+            
+        Returns:
+            pd.DataFrame: Parsed data from the Delta file
+        """
+        return ParquetParser().parse_file(source, max_rows)
     
     def _is_delta_log_file(self, filename: str) -> bool:
         """
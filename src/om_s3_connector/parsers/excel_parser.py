@@ -1,16 +1,17 @@
 # File: connectors/s3/parsers/excel_parser.py
 
 import pandas as pd
-import io
-from .base_parser import FileParser
+from typing import BinaryIO, Optional
+from .base_parser import BytesLike, FileParser, open_buffer
 
 class ExcelParser(FileParser):
     """
     Concrete parser for Excel files (.xlsx, .xls).
     Handles multiple sheets by concatenating them into a single DataFrame.
     """
+    supports_random_access = True
     
-    def parse(self, content: bytes) -> pd.DataFrame:
+    def parse(self, content: BytesLike) -> pd.DataFrame:
         """
         Parse Excel file content and return a DataFrame.
         
@@ -23,28 +24,38 @@ class ExcelParser(FileParser):
         Returns:
             pd.DataFrame: Parsed data from all sheets
         """
-        try:
-            # Read Excel file from bytes
-            excel_file = pd.ExcelFile(io.BytesIO(content))
+        # The workbook is opened once, in place, and shared by all sheets
+        return self.parse_file(open_buffer(content))
+    
+    def parse_file(self, source: BinaryIO, max_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Parse a seekable Excel file object and return a DataFrame.
+        
+        xlsx files are zip archives, so only the central directory at the end
+        of the file and the entries for each sheet are read. The workbook is
+        opened once and shared by all sheets.
+        
+        Args:
+            source (BinaryIO): Seekable file object holding the Excel file
+            max_rows (Optional[int]): Maximum number of rows to read per sheet
             
-            # Get all sheet names
+        Returns:
+            pd.DataFrame: Parsed data from all sheets
+        """
+        try:
+            excel_file = pd.ExcelFile(source)
             sheet_names = excel_file.sheet_names
             
             if len(sheet_names) == 1:
-                # Single sheet - return as is
-                return pd.read_excel(io.BytesIO(content), sheet_name=0)
-            else:
-                # Multiple sheets - concatenate with sheet name identifier
-                all_sheets = []
-                for sheet_name in sheet_names:
-                    df = pd.read_excel(io.BytesIO(content), sheet_name=sheet_name)
-                    # Add sheet name as a column for identification
-                    df['sheet_name'] = sheet_name
-                    all_sheets.append(df)
-                
-                # Concatenate all sheets
-                return pd.concat(all_sheets, ignore_index=True, sort=False)
-                
+                return excel_file.parse(sheet_name=0, nrows=max_rows)
+            
+            all_sheets = []
+            for sheet_name in sheet_names:
+                df = excel_file.parse(sheet_name=sheet_name, nrows=max_rows)
+                df['sheet_name'] = sheet_name
+                all_sheets.append(df)
+            
+            return pd.concat(all_sheets, ignore_index=True, sort=False)
+            
         except Exception as e:
-            # If Excel parsing fails, try to provide a helpful error message
             raise ValueError(f"Failed to parse Excel file: {str(e)}")
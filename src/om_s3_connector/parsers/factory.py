@@ -1,34 +1,147 @@
 # File: connectors/s3/parsers/factory.py
 
-from typing import Optional, Dict, Type
+import importlib
+import logging
+import threading
+from typing import Dict, List, Optional, Type, Union
+
 from .base_parser import FileParser
-from .csv_parser import CsvParser
-from .json_parser import JsonParser
-from .parquet_parser import ParquetParser
-from .tsv_parser import TsvParser
-
-# A mapping from file extensions to their corresponding parser class
-PARSER_MAPPING: Dict[str, Type[FileParser]] = {
-    "csv": CsvParser,
-    "json": JsonParser,
-    "parquet": ParquetParser,
-    "tsv": TsvParser,
+
+# Use standard Python logging if OpenMetadata logger is not available
+try:
+    from metadata.utils.logger import ingestion_logger
+    logger = ingestion_logger()
+except ImportError:
+    logger = logging.getLogger(__name__)
+
+# Entry point group third-party packages use to register parsers. The entry
+# point name is the file extension, its value the parser class, e.g.
+#   [project.entry-points."om_s3_connector.parsers"]
+#   sav = "my_package.spss:SavParser"
+ENTRY_POINT_GROUP = "om_s3_connector.parsers"
+
+# A mapping from file extensions to their parser class, as "module:Class"
+# (relative to this package for built-in parsers). Modules are imported the
+# first time one of their extensions is requested.
+PARSER_MAPPING: Dict[str, Union[str, Type[FileParser]]] = {
+    "csv": ".csv_parser:CsvParser",
+    "tsv": ".tsv_parser:TsvParser",
+    "json": ".json_parser:JsonParser",
+    "jsonl": ".jsonl_parser:JsonlParser",
+    "ndjson": ".jsonl_parser:JsonlParser",
+    "parquet": ".parquet_parser:ParquetParser",
+    "avro": ".avro_parser:AvroParser",
+    "orc": ".orc_parser:OrcParser",
+    "feather": ".feather_parser:FeatherParser",
+    "arrow": ".feather_parser:FeatherParser",
+    "xlsx": ".excel_parser:ExcelParser",
+    "xls": ".excel_parser:ExcelParser",
+    "h5": ".hdf5_parser:Hdf5Parser",
+    "hdf5": ".hdf5_parser:Hdf5Parser",
+    "pkl": ".pickle_parser:PickleParser",
+    "pickle": ".pickle_parser:PickleParser",
+    "delta": ".delta_parser:DeltaParser",
 }
 
+
+def _load_class(target: Union[str, Type[FileParser]]) -> Type[FileParser]:
+    """Resolves a parser class, importing it from a "module:Class" path if needed."""
+    if not isinstance(target, str):
+        return target
+    module_name, _, class_name = target.partition(":")
+    return getattr(importlib.import_module(module_name, package=__package__), class_name)
+
+
 class ParserFactory:
-    """Factory class for creating file parsers"""
-    
-    @staticmethod
-    def get_parser(file_format: str) -> Optional[FileParser]:
+    """
+    Factory class for creating file parsers.
+
+    Parsers are stateless, so one instance per parser class is created on
+    first use and shared by every table and worker thread. Parsers
+    registered through the `om_s3_connector.parsers` entry point group are
+    added to the mapping on the first lookup; they may also replace a
+    built-in parser for an extension.
+    """
+
+    _lock = threading.Lock()
+    _instances: Dict[str, FileParser] = {}
+    _unsupported: set = set()
+    _entry_points_loaded = False
+
+    @classmethod
+    def get_parser(cls, file_format: str) -> Optional[FileParser]:
         """
-        Factory function that returns an instance of the appropriate parser
-        for a given file format. Returns None if the format is not supported.
+        Returns the shared parser instance for a given file format, or None
+        if the format is not supported or its parser cannot be imported.
         """
-        parser_class = PARSER_MAPPING.get(file_format.lower())
-        if parser_class:
-            # Create and return an instance of the parser class
-            return parser_class()
-        return None
+        file_format = file_format.lower()
+        parser = cls._instances.get(file_format)
+        if parser is not None or file_format in cls._unsupported:
+            return parser
+
+        with cls._lock:
+            cls._load_entry_points()
+            parser = cls._instances.get(file_format)
+            if parser is not None or file_format in cls._unsupported:
+                return parser
+
+            target = PARSER_MAPPING.get(file_format)
+            if target is None:
+                cls._unsupported.add(file_format)
+                return None
+            try:
+                parser_class = _load_class(target)
+            except ImportError as e:
+                logger.warning(f"Parser for '{file_format}' files is not available: {e}")
+                cls._unsupported.add(file_format)
+                return None
+
+            # Extensions sharing a parser class share its instance
+            parser = next(
+                (instance for instance in cls._instances.values() if type(instance) is parser_class),
+                None,
+            ) or parser_class()
+            cls._instances[file_format] = parser
+            return parser
+
+    @classmethod
+    def register_parser(cls, file_format: str, parser: Union[str, Type[FileParser]]):
+        """Registers a parser class, or its "module:Class" path, for a file extension."""
+        file_format = file_format.lower()
+        with cls._lock:
+            PARSER_MAPPING[file_format] = parser
+            cls._instances.pop(file_format, None)
+            cls._unsupported.discard(file_format)
+
+    @classmethod
+    def supported_formats(cls) -> List[str]:
+        """Returns the registered file extensions, including entry point parsers."""
+        with cls._lock:
+            cls._load_entry_points()
+            return sorted(PARSER_MAPPING)
+
+    @classmethod
+    def _load_entry_points(cls):
+        """Adds the parsers of installed packages; called once, with the lock held."""
+        if cls._entry_points_loaded:
+            return
+        cls._entry_points_loaded = True
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+
+        discovered = entry_points()
+        if hasattr(discovered, "select"):
+            group = discovered.select(group=ENTRY_POINT_GROUP)
+        else:
+            group = discovered.get(ENTRY_POINT_GROUP, [])
+        for entry_point in group:
+            file_format = entry_point.name.lower()
+            if file_format in PARSER_MAPPING:
+                logger.info(f"Parser for '{file_format}' files replaced by entry point {entry_point.value}")
+            PARSER_MAPPING[file_format] = entry_point.value
+
 
 def get_parser(file_format: str) -> Optional[FileParser]:
     """
@@ -1,19 +1,25 @@
 # File: connectors/s3/parsers/feather_parser.py
 
 import pandas as pd
-import io
-from .base_parser import FileParser
+from typing import BinaryIO, Optional
+from .base_parser import BytesLike, FileParser, arrow_buffer, arrow_sample_batch
 
 class FeatherParser(FileParser):
     """
     Concrete parser for Feather files (.feather).
     Feather is a fast, interoperable data frame storage format.
     """
+    supports_random_access = True
+    holds_gil = False
+    supports_arrow = True
     
-    def parse(self, content: bytes) -> pd.DataFrame:
+    def parse(self, content: BytesLike) -> pd.DataFrame:
         """
         Parse Feather file content and return a DataFrame.
         
+        Both Feather versions are read from an Arrow buffer over `content`,
+        so the record batches reference the content instead of copies.
+        
         Args:
             content (bytes): The binary content of the Feather file
             
@@ -21,36 +27,71 @@ class FeatherParser(FileParser):
             pd.DataFrame: Parsed data from the Feather file
         """
         try:
-            # Try using pyarrow for better performance
-            try:
-                import pyarrow.feather as feather
-                
-                # Read feather file from bytes
-                df = feather.read_feather(io.BytesIO(content))
-                return df
-                
-            except ImportError:
-                # Fallback to pandas if pyarrow is not available
-                # Note: pandas.read_feather also uses pyarrow under the hood
-                # but this provides a clearer error message
-                df = pd.read_feather(io.BytesIO(content))
-                return df
-                
+            import pyarrow.feather as feather
+            
+            return feather.read_feather(arrow_buffer(content))
         except Exception as e:
-            # If direct reading fails, try with a temporary file
-            try:
-                import tempfile
-                import os
-                
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.feather') as temp_file:
-                    temp_file.write(content)
-                    temp_file.flush()
-                    
-                    try:
-                        df = pd.read_feather(temp_file.name)
-                        return df
-                    finally:
-                        os.unlink(temp_file.name)
-                        
-            except Exception as temp_e:
-                raise ValueError(f"Failed to parse Feather file: Original error: {str(e)}, Temp file error: {str(temp_e)}")
+            raise ValueError(f"Failed to parse Feather file: {str(e)}")
+
+    def parse_file(self, source: BinaryIO, max_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Parse a seekable Feather file object, reading only the record batches needed.
+        
+        Feather V2 is the Arrow IPC file format, whose footer indexes every
+        record batch. Feather V1 files are read in full through `parse`.
+        
+        Args:
+            source (BinaryIO): Seekable file object holding the Feather file
+            max_rows (Optional[int]): Stop after the batches covering this many rows
+            
+        Returns:
+            pd.DataFrame: Parsed data from the Feather file
+        """
+        import pyarrow as pa
+        
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return self.parse(source.read())
+        
+        if max_rows is None:
+            return reader.read_pandas()
+        
+        batches = []
+        row_count = 0
+        for index in range(reader.num_record_batches):
+            if row_count >= max_rows:
+                break
+            batch = reader.get_batch(index)
+            batches.append(batch)
+            row_count += batch.num_rows
+        
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        return table.slice(0, max_rows).to_pandas()
+
+    def read_arrow(self, source: BinaryIO, max_rows: int):
+        """
+        Read the Arrow schema and the record batches covering `max_rows` rows.
+        
+        Feather V1 files have no batch index and are read in full.
+        """
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            source.seek(0)
+            table = feather.read_table(source)
+            return table.schema, arrow_sample_batch(table.schema, table.to_batches(), max_rows)
+        
+        batches = []
+        row_count = 0
+        for index in range(reader.num_record_batches):
+            if row_count >= max_rows:
+                break
+            batch = reader.get_batch(index)
+            batches.append(batch)
+            row_count += batch.num_rows
+        return reader.schema, arrow_sample_batch(reader.schema, batches, max_rows)
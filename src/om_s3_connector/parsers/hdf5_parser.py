@@ -1,106 +1,182 @@
 # File: connectors/s3/parsers/hdf5_parser.py
 
 import pandas as pd
-import tempfile
 import os
-from .base_parser import FileParser
+from typing import BinaryIO, Optional
+from .base_parser import BytesLike, FileParser, open_buffer
 
 class Hdf5Parser(FileParser):
     """
     Concrete parser for HDF5 files (.h5, .hdf5).
     HDF5 is a hierarchical data format that can contain multiple datasets.
     """
+    supports_random_access = True
     
-    def parse(self, content: bytes) -> pd.DataFrame:
+    def parse(self, content: BytesLike) -> pd.DataFrame:
         """
         Parse HDF5 file content and return a DataFrame.
         
+        HDF5 libraries need a real file, so the content is written to the
+        connector's scratch space and parsed with `parse_path`.
+        
+        Args:
+            content (bytes): The binary content of the HDF5 file
+            
+        Returns:
+            pd.DataFrame: Parsed data from the HDF5 file
+        """
+        return self._parse_spilled(open_buffer(content), len(content))
+    
+    def parse_path(self, path: str) -> pd.DataFrame:
+        """
+        Parse a local HDF5 file and return a DataFrame.
+        
         For HDF5 files with multiple datasets, this parser will attempt to:
         1. Find pandas-compatible datasets
         2. Concatenate multiple datasets with a 'dataset_name' column
         3. Return the first readable dataset if concatenation fails
         
         Args:
-            content (bytes): The binary content of the HDF5 file
+            path (str): Path of the HDF5 file
             
         Returns:
             pd.DataFrame: Parsed data from the HDF5 file
         """
         try:
-            # HDF5 requires file-based access, so we need to use a temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.h5') as temp_file:
-                temp_file.write(content)
-                temp_file.flush()
-                
+            # Try to read with pandas HDFStore first
+            try:
+                with pd.HDFStore(path, mode='r') as store:
+                    keys = store.keys()
+                    
+                    if not keys:
+                        raise ValueError("HDF5 file contains no readable datasets")
+                    
+                    if len(keys) == 1:
+                        # Single dataset
+                        return store[keys[0]]
+                    else:
+                        # Multiple datasets - concatenate them
+                        all_datasets = []
+                        for key in keys:
+                            try:
+                                df = store[key]
+                                df['dataset_name'] = key.lstrip('/')  # Remove leading slash
+                                all_datasets.append(df)
+                            except Exception:
+                                # Skip datasets that can't be read as DataFrames
+                                continue
+                        
+                        if all_datasets:
+                            return pd.concat(all_datasets, ignore_index=True, sort=False)
+                        else:
+                            raise ValueError("No datasets could be read as DataFrames")
+            
+            except Exception:
+                # Fallback: try using h5py for more flexibility
                 try:
-                    # Try to read with pandas HDFStore first
-                    try:
-                        with pd.HDFStore(temp_file.name, mode='r') as store:
-                            keys = store.keys()
-                            
-                            if not keys:
-                                raise ValueError("HDF5 file contains no readable datasets")
-                            
-                            if len(keys) == 1:
-                                # Single dataset
-                                return store[keys[0]]
-                            else:
-                                # Multiple datasets - concatenate them
-                                all_datasets = []
-                                for key in keys:
-                                    try:
-                                        df = store[key]
-                                        df['dataset_name'] = key.lstrip('/')  # Remove leading slash
-                                        all_datasets.append(df)
-                                    except Exception:
-                                        # Skip datasets that can't be read as DataFrames
-                                        continue
-                                
-                                if all_datasets:
-                                    return pd.concat(all_datasets, ignore_index=True, sort=False)
-                                else:
-                                    raise ValueError("No datasets could be read as DataFrames")
+                    import h5py
                     
-                    except Exception:
-                        # Fallback: try using h5py for more flexibility
-                        try:
-                            import h5py
-                            
-                            with h5py.File(temp_file.name, 'r') as h5_file:
-                                # Find datasets that look like tabular data
-                                datasets = []
-                                
-                                def find_datasets(name, obj):
-                                    if isinstance(obj, h5py.Dataset) and len(obj.shape) <= 2:
-                                        datasets.append((name, obj))
-                                
-                                h5_file.visititems(find_datasets)
-                                
-                                if not datasets:
-                                    raise ValueError("No suitable datasets found in HDF5 file")
-                                
-                                # Try to convert the first suitable dataset
-                                for name, dataset in datasets:
-                                    try:
-                                        data = dataset[:]
-                                        if len(data.shape) == 1:
-                                            return pd.DataFrame({'data': data})
-                                        elif len(data.shape) == 2:
-                                            return pd.DataFrame(data)
-                                    except Exception:
-                                        continue
-                                
-                                raise ValueError("Could not convert any dataset to DataFrame")
+                    with h5py.File(path, 'r') as h5_file:
+                        # Find datasets that look like tabular data
+                        datasets = []
+                        
+                        def find_datasets(name, obj):
+                            if isinstance(obj, h5py.Dataset) and len(obj.shape) <= 2:
+                                datasets.append((name, obj))
                         
-                        except ImportError:
-                            raise ValueError("Failed to read HDF5 file. Install h5py for better HDF5 support.")
+                        h5_file.visititems(find_datasets)
+                        
+                        if not datasets:
+                            raise ValueError("No suitable datasets found in HDF5 file")
+                        
+                        # Try to convert the first suitable dataset
+                        for name, dataset in datasets:
+                            try:
+                                data = dataset[:]
+                                if len(data.shape) == 1:
+                                    return pd.DataFrame({'data': data})
+                                elif len(data.shape) == 2:
+                                    return pd.DataFrame(data)
+                            except Exception:
+                                continue
+                        
+                        raise ValueError("Could not convert any dataset to DataFrame")
                 
-                finally:
-                    # Clean up temp file
-                    os.unlink(temp_file.name)
+                except ImportError:
+                    raise ValueError("Failed to read HDF5 file. Install h5py for better HDF5 support.")
+                    
+        except Exception as e:
+            raise ValueError(f"Failed to parse HDF5 file: {str(e)}")
+    
+    def _parse_spilled(self, source: BinaryIO, size: Optional[int] = None) -> pd.DataFrame:
+        """Copies a file object to a scratch file and parses that file."""
+        from ..core.scratch import default_scratch_space
+        
+        with default_scratch_space().write(source, size, suffix='.h5') as scratch_file:
+            return self.parse_path(scratch_file.path)
+    
+    def parse_file(self, source: BinaryIO, max_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Parse a seekable HDF5 file object without copying it to a temporary file.
+        
+        h5py reads directly from the file object, and datasets are sliced so
+        only the chunks holding the first `max_rows` rows are transferred.
+        Files written by pandas/PyTables (HDFStore) need a real file; unless
+        `source` is one, it is copied to the scratch space first.
+        
+        Args:
+            source (BinaryIO): Seekable file object holding the HDF5 file
+            max_rows (Optional[int]): Maximum number of rows to read
+            
+        Returns:
+            pd.DataFrame: Parsed data from the HDF5 file
+        """
+        try:
+            import h5py
+        except ImportError:
+            return self._parse_local(source)
+        
+        try:
+            with h5py.File(source, 'r') as h5_file:
+                if 'PYTABLES_FORMAT_VERSION' not in h5_file.attrs:
+                    datasets = []
+                    
+                    def find_datasets(name, obj):
+                        if isinstance(obj, h5py.Dataset) and len(obj.shape) <= 2:
+                            datasets.append(obj)
+                    
+                    h5_file.visititems(find_datasets)
                     
+                    if not datasets:
+                        raise ValueError("No suitable datasets found in HDF5 file")
+                    
+                    for dataset in datasets:
+                        try:
+                            data = dataset[:max_rows] if max_rows is not None else dataset[:]
+                            if len(data.shape) == 1:
+                                return pd.DataFrame({'data': data})
+                            elif len(data.shape) == 2:
+                                return pd.DataFrame(data)
+                        except Exception:
+                            continue
+                    
+                    raise ValueError("Could not convert any dataset to DataFrame")
+        except ValueError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to parse HDF5 file: {str(e)}")
+        
+        # HDFStore layout: fall back to the file based reader
+        return self._parse_local(source)
+    
+    def _parse_local(self, source: BinaryIO) -> pd.DataFrame:
+        """Parses a seekable file object by path, spilling it to scratch space if it is not a local file."""
+        path = getattr(source, 'name', None)
+        if isinstance(path, str) and os.path.isfile(path):
+            return self.parse_path(path)
+        size = source.seek(0, os.SEEK_END)
+        source.seek(0)
+        return self._parse_spilled(source, size)
     
     def _get_hdf5_info(self, file_path: str) -> dict:
         """
@@ -2,16 +2,129 @@
 
 import pandas as pd
 import io
-from .base_parser import FileParser
+import json
+from typing import BinaryIO, Iterator, Optional, Tuple
+from .base_parser import BytesLike, FileParser, LimitedReader, DEFAULT_BATCH_ROWS, open_buffer, read_lines
+
+# Bytes first read to find the end of the first JSON value; doubled until it is found.
+DETECTION_PEEK_SIZE = 64 * 1024
+
+
+class _PrefixedReader(io.RawIOBase):
+    """Reads `prefix`, then the rest of `raw`."""
+
+    def __init__(self, prefix: bytes, raw):
+        super().__init__()
+        self._prefix = memoryview(prefix)
+        self._raw = raw
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            length = min(len(buffer), len(self._prefix))
+            buffer[:length] = self._prefix[:length]
+            self._prefix = self._prefix[length:]
+            return length
+        data = self._raw.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
 
 class JsonParser(FileParser):
     """
     Concrete parser for JSON files. It handles both standard and line-delimited JSON.
     """
-    def parse(self, content: bytes) -> pd.DataFrame:
+    supports_streaming = True
+
+    def parse(self, content: BytesLike) -> pd.DataFrame:
         try:
             # First, try to read as a multi-line JSON (common in data lakes)
-            return pd.read_json(io.BytesIO(content), lines=True)
+            return pd.read_json(open_buffer(content), lines=True)
         except ValueError:
             # If that fails, try to read as a standard JSON object
-            return pd.read_json(io.BytesIO(content))
+            return pd.read_json(open_buffer(content))
+
+    def iter_batches(
+        self,
+        stream: BinaryIO,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Line-delimited JSON is streamed in batches. A standard JSON document
+        cannot be split, so it is read in full and only `max_rows` applies.
+        """
+        line_delimited, buffered = self._detect(stream)
+        if not line_delimited:
+            df = self._read_document(buffered.read())
+            if max_rows is not None:
+                df = df.head(max_rows)
+            for start in range(0, len(df), batch_rows):
+                yield df.iloc[start:start + batch_rows]
+            return
+
+        reader = io.BufferedReader(LimitedReader(buffered, max_bytes, line_aligned=True))
+        row_count = 0
+        with pd.read_json(reader, lines=True, chunksize=batch_rows, nrows=max_rows) as chunks:
+            for chunk in chunks:
+                if max_rows is not None:
+                    if row_count >= max_rows:
+                        break
+                    chunk = chunk.iloc[:max_rows - row_count]
+                row_count += len(chunk)
+                yield chunk
+
+    def read_sample(self, stream: BinaryIO, max_rows: Optional[int] = None,
+                    max_bytes: Optional[int] = None) -> bytes:
+        """
+        Line-delimited JSON is read up to `max_rows` lines; a standard JSON
+        document is read in full, as `iter_batches` does.
+        """
+        line_delimited, buffered = self._detect(stream)
+        if not line_delimited:
+            return buffered.read()
+        return read_lines(buffered, max_rows, max_bytes)
+
+    @staticmethod
+    def _detect(stream: BinaryIO) -> Tuple[bool, BinaryIO]:
+        """
+        Tells line-delimited JSON from a single JSON document, and returns
+        a reader of the whole stream. The data is line-delimited if it starts
+        with an object and another value follows it on a later line, however long
+        the first record is; only the bytes up to that value are buffered.
+        """
+        head = bytearray()
+        while True:
+            chunk = stream.read(max(DETECTION_PEEK_SIZE, len(head)))
+            head += chunk
+            text = head.decode("utf-8", errors="ignore").lstrip()
+            if text[:1] != "{":
+                if text or not chunk:
+                    return False, io.BufferedReader(_PrefixedReader(bytes(head), stream))
+                continue
+            try:
+                _, end = json.JSONDecoder().raw_decode(text)
+            except ValueError:
+                # The first value is cut short, or malformed if this is the end
+                if not chunk:
+                    return False, io.BufferedReader(_PrefixedReader(bytes(head), stream))
+                continue
+            rest = text[end:]
+            if rest.strip() or not chunk:
+                following = len(rest) - len(rest.lstrip())
+                line_delimited = bool(rest.strip()) and "\n" in rest[:following]
+                return line_delimited, io.BufferedReader(_PrefixedReader(bytes(head), stream))
+
+    @staticmethod
+    def _read_document(data: bytes) -> pd.DataFrame:
+        """Reads a standard JSON document; a single object of scalars is one record."""
+        try:
+            return pd.read_json(io.BytesIO(data))
+        except ValueError:
+            value = json.loads(data)
+            if not isinstance(value, dict):
+                raise
+            return pd.DataFrame([value])
@@ -3,15 +3,17 @@
 import pandas as pd
 import json
 import io
-from .base_parser import FileParser
+from typing import BinaryIO, Iterator, Optional
+from .base_parser import BytesLike, FileParser, LimitedReader, DEFAULT_BATCH_ROWS, concat_batches, open_buffer, read_lines
 
 class JsonlParser(FileParser):
     """
     Concrete parser for JSON Lines files (.jsonl, .ndjson).
     JSON Lines format contains one JSON object per line.
     """
+    supports_streaming = True
     
-    def parse(self, content: bytes) -> pd.DataFrame:
+    def parse(self, content: BytesLike) -> pd.DataFrame:
         """
         Parse JSON Lines file content and return a DataFrame.
         
@@ -24,61 +26,67 @@ class JsonlParser(FileParser):
         Returns:
             pd.DataFrame: Parsed data from the JSONL file
         """
-        try:
-            # Decode bytes to string
-            text_content = content.decode('utf-8')
-            
-            # Split into lines and parse each JSON object
-            json_objects = []
-            lines = text_content.strip().split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                if not line:  # Skip empty lines
-                    continue
-                
-                try:
-                    json_obj = json.loads(line)
-                    json_objects.append(json_obj)
-                except json.JSONDecodeError as e:
-                    # Add line number to error for debugging
-                    raise ValueError(f"Invalid JSON on line {line_num}: {str(e)}")
+        df = concat_batches(self.iter_batches(open_buffer(content)))
+        if df.empty:
+            raise ValueError("Failed to parse JSONL file: No valid JSON objects found in JSONL file")
+        return df
+    
+    def iter_batches(
+        self,
+        stream: BinaryIO,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream JSON Lines records in batches of DataFrames.
+        
+        Lines are decoded as UTF-8, falling back to latin-1 for lines that
+        are not valid UTF-8. Reading stops once `max_rows` records have been
+        produced or `max_bytes` bytes have been consumed.
+        
+        Args:
+            stream (BinaryIO): Readable stream holding the JSONL file
+            max_rows (Optional[int]): Maximum number of records to read
+            max_bytes (Optional[int]): Maximum number of bytes to consume
+            batch_rows (int): Number of records per batch
             
-            if not json_objects:
-                raise ValueError("No valid JSON objects found in JSONL file")
+        Yields:
+            pd.DataFrame: Batches of parsed records
+        """
+        reader = io.BufferedReader(LimitedReader(stream, max_bytes, line_aligned=True))
+        json_objects = []
+        row_count = 0
+        
+        for line_num, raw_line in enumerate(reader, 1):
+            if max_rows is not None and row_count >= max_rows:
+                break
             
-            # Convert list of JSON objects to DataFrame
-            df = pd.DataFrame(json_objects)
-            return df
+            try:
+                line = raw_line.decode('utf-8').strip()
+            except UnicodeDecodeError:
+                line = raw_line.decode('latin-1').strip()
+            if not line:  # Skip empty lines
+                continue
             
-        except UnicodeDecodeError as e:
-            # Try alternative encodings
             try:
-                text_content = content.decode('latin-1')
+                json_objects.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                # Add line number to error for debugging
+                raise ValueError(f"Failed to parse JSONL file: Invalid JSON on line {line_num}: {str(e)}")
+            row_count += 1
+            
+            if len(json_objects) >= batch_rows:
+                yield pd.DataFrame(json_objects)
                 json_objects = []
-                lines = text_content.strip().split('\n')
-                
-                for line_num, line in enumerate(lines, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    try:
-                        json_obj = json.loads(line)
-                        json_objects.append(json_obj)
-                    except json.JSONDecodeError as e:
-                        raise ValueError(f"Invalid JSON on line {line_num}: {str(e)}")
-                
-                if json_objects:
-                    return pd.DataFrame(json_objects)
-                else:
-                    raise ValueError("No valid JSON objects found")
-                    
-            except Exception:
-                raise ValueError(f"Failed to decode JSONL file: {str(e)}")
-                
-        except Exception as e:
-            raise ValueError(f"Failed to parse JSONL file: {str(e)}")
+        
+        if json_objects:
+            yield pd.DataFrame(json_objects)
+    
+    def read_sample(self, stream: BinaryIO, max_rows: Optional[int] = None,
+                    max_bytes: Optional[int] = None) -> bytes:
+        """Reads up to `max_rows` lines, one record each (blank lines included)."""
+        return read_lines(stream, max_rows, max_bytes)
     
     def _validate_jsonl_line(self, line: str) -> bool:
         """
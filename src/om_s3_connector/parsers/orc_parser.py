@@ -1,16 +1,75 @@
 # File: src/om_s3_connector/parsers/orc_parser.py
 
 import pandas as pd
-from typing import Optional, Dict, Any
-from .base_parser import FileParser
+from typing import BinaryIO, Iterator, Optional, Dict, Any
+from .base_parser import BytesLike, FileParser, DEFAULT_BATCH_ROWS, arrow_buffer, arrow_sample_batch, concat_batches
 
 class OrcParser(FileParser):
     """Parser for Apache ORC files"""
+    supports_random_access = True
+    supports_streaming = True
+    holds_gil = False
+    supports_arrow = True
     
     def __init__(self):
         super().__init__()
         self.file_format = "orc"
     
+    def parse(self, content: BytesLike) -> pd.DataFrame:
+        """Parse ORC file content and return a DataFrame"""
+        return concat_batches(self.iter_batches(arrow_buffer(content)))
+    
+    def parse_file(self, source: BinaryIO, max_rows: Optional[int] = None) -> pd.DataFrame:
+        """Parse a seekable ORC file object, reading only the stripes needed"""
+        return concat_batches(self.iter_batches(source, max_rows=max_rows))
+    
+    def read_arrow(self, source: BinaryIO, max_rows: int):
+        """Read the Arrow schema from the footer and a sample from the leading stripes"""
+        import pyarrow.orc as orc
+        
+        orc_file = orc.ORCFile(source)
+        batches = []
+        row_count = 0
+        for index in range(orc_file.nstripes):
+            if row_count >= max_rows:
+                break
+            batch = orc_file.read_stripe(index)
+            batches.append(batch)
+            row_count += batch.num_rows
+        return orc_file.schema, arrow_sample_batch(orc_file.schema, batches, max_rows)
+    
+    def iter_batches(
+        self,
+        stream: BinaryIO,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream row batches stripe by stripe.
+        
+        ORC needs random access to its footer, so non-seekable streams are
+        read into memory first. Stripes are the unit of reading, and
+        `max_bytes` is not applied.
+        """
+        import pyarrow as pa
+        import pyarrow.orc as orc
+        
+        if not (hasattr(stream, "seekable") and stream.seekable()):
+            stream = arrow_buffer(stream.read())
+        
+        orc_file = orc.ORCFile(stream)
+        row_count = 0
+        for index in range(orc_file.nstripes):
+            stripe = pa.Table.from_batches([orc_file.read_stripe(index)])
+            for batch in stripe.to_batches(max_chunksize=batch_rows):
+                if max_rows is not None:
+                    if row_count >= max_rows:
+                        return
+                    batch = batch.slice(0, max_rows - row_count)
+                row_count += batch.num_rows
+                yield batch.to_pandas()
+    
     def can_parse(self, file_path: str) -> bool:
         """Check if this parser can handle the given file"""
         return file_path.lower().endswith('.orc')
@@ -1,12 +1,134 @@
 # File: connectors/s3/parsers/parquet_parser.py
 
 import pandas as pd
-import io
-from .base_parser import FileParser
+from typing import BinaryIO, Iterator, Optional, Tuple
+from .base_parser import BytesLike, FileParser, DEFAULT_BATCH_ROWS, arrow_buffer, arrow_sample_batch
 
 class ParquetParser(FileParser):
     """
     Concrete parser for Parquet files.
     """
-    def parse(self, content: bytes) -> pd.DataFrame:
-        return pd.read_parquet(io.BytesIO(content))
+    supports_random_access = True
+    supports_streaming = True
+    holds_gil = False
+    supports_arrow = True
+
+    def parse(self, content: BytesLike) -> pd.DataFrame:
+        return pd.read_parquet(arrow_buffer(content))
+
+    def parse_file(self, source: BinaryIO, max_rows: Optional[int] = None) -> pd.DataFrame:
+        if max_rows is None:
+            return pd.read_parquet(source)
+        return self.parse_footer(source, max_rows)[1]
+
+    def iter_batches(
+        self,
+        stream: BinaryIO,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream row batches from the leading row groups.
+
+        Parquet needs random access to its footer, so non-seekable streams are
+        read into memory first. `max_bytes` is applied to the compressed size
+        of whole row groups; the first row group is always read.
+        """
+        import pyarrow.parquet as pq
+
+        if not (hasattr(stream, "seekable") and stream.seekable()):
+            stream = arrow_buffer(stream.read())
+
+        parquet_file = pq.ParquetFile(stream)
+        metadata = parquet_file.metadata
+        row_groups = []
+        covered_bytes = 0
+        for index in range(metadata.num_row_groups):
+            row_group = metadata.row_group(index)
+            row_group_bytes = sum(
+                row_group.column(column_index).total_compressed_size
+                for column_index in range(row_group.num_columns)
+            )
+            if row_groups and max_bytes is not None and covered_bytes + row_group_bytes > max_bytes:
+                break
+            row_groups.append(index)
+            covered_bytes += row_group_bytes
+
+        row_count = 0
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, row_groups=row_groups):
+            if max_rows is not None:
+                if row_count >= max_rows:
+                    break
+                batch = batch.slice(0, max_rows - row_count)
+            row_count += batch.num_rows
+            yield batch.to_pandas()
+
+    def parse_footer(self, source: BinaryIO, sample_size: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Infer the schema and a row sample from the footer and leading row groups.
+
+        Only the footer is read to obtain the schema. The row groups covering
+        `sample_size` rows are then requested as one contiguous range when the
+        source supports `prefetch` (see core.range_file.S3RangeFile).
+
+        Args:
+            source: Seekable binary file object
+            sample_size: Number of rows to sample
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: An empty frame carrying the schema
+            dtypes, and a frame holding up to `sample_size` rows
+        """
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        schema_df = parquet_file.schema_arrow.empty_table().to_pandas()
+        sample_table = self._read_leading_rows(parquet_file, source, sample_size)
+        if sample_table is None:
+            return schema_df, schema_df
+        return schema_df, sample_table.to_pandas()
+
+    def read_arrow(self, source: BinaryIO, max_rows: int):
+        """Read the Arrow schema from the footer and a sample from the leading row groups."""
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        schema = parquet_file.schema_arrow
+        sample_table = self._read_leading_rows(parquet_file, source, max_rows)
+        batches = sample_table.to_batches() if sample_table is not None else []
+        return schema, arrow_sample_batch(schema, batches, max_rows)
+
+    def _read_leading_rows(self, parquet_file, source: BinaryIO, max_rows: int):
+        """
+        Read the row groups covering the first `max_rows` rows, or None if the
+        file has no rows. Their byte span is prefetched as one range.
+        """
+        metadata = parquet_file.metadata
+        row_groups = []
+        covered_rows = 0
+        span_start, span_end = None, None
+        for index in range(metadata.num_row_groups):
+            if covered_rows >= max_rows:
+                break
+            row_group = metadata.row_group(index)
+            if row_group.num_rows == 0:
+                continue
+            for column_index in range(row_group.num_columns):
+                chunk = row_group.column(column_index)
+                chunk_start = chunk.data_page_offset
+                if chunk.has_dictionary_page and chunk.dictionary_page_offset:
+                    chunk_start = min(chunk_start, chunk.dictionary_page_offset)
+                chunk_end = chunk_start + chunk.total_compressed_size
+                span_start = chunk_start if span_start is None else min(span_start, chunk_start)
+                span_end = chunk_end if span_end is None else max(span_end, chunk_end)
+            row_groups.append(index)
+            covered_rows += row_group.num_rows
+
+        if not row_groups:
+            return None
+
+        if hasattr(source, "prefetch"):
+            source.prefetch(span_start, span_end)
+
+        return parquet_file.read_row_groups(row_groups).slice(0, max_rows)
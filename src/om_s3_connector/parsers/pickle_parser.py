@@ -3,7 +3,7 @@
 import pandas as pd
 import pickle
 import io
-from .base_parser import FileParser
+from .base_parser import BytesLike, FileParser
 
 class PickleParser(FileParser):
     """
@@ -11,7 +11,7 @@ class PickleParser(FileParser):
     Handles pickled pandas DataFrames and other Python objects that can be converted to DataFrames.
     """
     
-    def parse(self, content: bytes) -> pd.DataFrame:
+    def parse(self, content: BytesLike) -> pd.DataFrame:
         """
         Parse pickle file content and return a DataFrame.
         
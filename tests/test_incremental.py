@@ -0,0 +1,143 @@
+"""
+Incremental ingestion with `writeMode: sink`: a table the sink failed to
+write must not be recorded as ingested, so the next run writes it again.
+"""
+
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metadata.generated.schema.api.data.createTable import CreateTableRequest
+from metadata.generated.schema.entity.data.database import Database
+from metadata.generated.schema.entity.data.databaseSchema import DatabaseSchema
+from metadata.generated.schema.entity.data.table import Table
+from metadata.generated.schema.entity.services.databaseService import DatabaseService
+from metadata.sampler.models import SamplerResponse
+
+from om_s3_connector.core.s3_connector import S3Source
+from om_s3_connector.core.state_store import TableStateStore
+
+ENTITY_TYPES = {
+    "CreateDatabaseServiceRequest": DatabaseService,
+    "CreateDatabaseRequest": Database,
+    "CreateDatabaseSchemaRequest": DatabaseSchema,
+    "CreateTableRequest": Table,
+}
+
+
+class FakeMetadata:
+    """In-memory stand-in for the OpenMetadata client, keyed by entity type and FQN."""
+
+    def __init__(self):
+        self.entities = {}
+        self.table_requests = []
+
+    def get_by_name(self, entity, fqn, **kwargs):
+        return self.entities.get((entity, fqn))
+
+    def create_or_update(self, request):
+        entity_type = ENTITY_TYPES[type(request).__name__]
+        parent = (getattr(request, "databaseSchema", None) or getattr(request, "database", None)
+                  or getattr(request, "service", None))
+        name = request.name.root
+        entity_fqn = f"{parent.root}.{name}" if parent is not None else name
+        reference = {"id": str(uuid.uuid4()), "type": "databaseService"}
+        fields = {"id": str(uuid.uuid4()), "name": name, "fullyQualifiedName": entity_fqn}
+        if entity_type is DatabaseService:
+            entity = DatabaseService(serviceType="CustomDatabase", **fields)
+        elif entity_type is Database:
+            entity = Database(service=reference, **fields)
+        elif entity_type is DatabaseSchema:
+            entity = DatabaseSchema(database={**reference, "type": "database"}, service=reference, **fields)
+        else:
+            entity = Table(columns=request.columns, **fields)
+            self.table_requests.append(name)
+        self.entities[(entity_type, entity_fqn)] = entity
+        return entity
+
+    def ingest_table_sample_data(self, table, sample_data):
+        return sample_data
+
+
+def run_with_sink(config, metadata, failing_tables=()):
+    """Runs the source and writes its records like the metadata-rest sink, dropping `failing_tables`."""
+    source = S3Source.create(config, metadata)
+    try:
+        for either in source._iter():
+            record = either.right
+            if isinstance(record, CreateTableRequest):
+                if record.name.root not in failing_tables:
+                    metadata.create_or_update(record)
+            elif isinstance(record, SamplerResponse):
+                metadata.ingest_table_sample_data(record.table, record.sample_data.data)
+    finally:
+        source.close()
+
+
+def table_columns(metadata, table_name):
+    for (entity_type, entity_fqn), entity in metadata.entities.items():
+        if entity_type is Table and entity.name.root == table_name:
+            return [column.name.root for column in entity.columns]
+    return None
+
+
+def write_csv(root, key, text):
+    path = os.path.join(root, "bucket", *key.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.mark.parametrize("sink_batch_size", ["1", "3"])
+def test_table_failed_by_the_sink_is_written_again(tmp_path, sink_batch_size):
+    root = str(tmp_path / "data")
+    for table_name in ("orders", "users", "events"):
+        write_csv(root, f"{table_name}/a.csv", "id,name\n1,a\n2,b\n")
+    config = {
+        "type": "custom-s3",
+        "serviceName": "svc",
+        "serviceConnection": {"config": {
+            "type": "CustomDatabase",
+            "sourcePythonClass": "om_s3_connector.core.s3_connector.S3Source",
+            "connectionOptions": {
+                "storageBackend": "local",
+                "localRootPath": root,
+                "bucketName": "bucket",
+                "file_formats": "csv",
+                "enableIncremental": "true",
+                "stateStorePath": str(tmp_path / "state.db"),
+                "sinkBatchSize": sink_batch_size,
+            },
+        }},
+        "sourceConfig": {"config": {"type": "StorageMetadata"}},
+    }
+    metadata = FakeMetadata()
+    run_with_sink(config, metadata)
+    assert table_columns(metadata, "users") == ["id", "name"]
+
+    # New columns, but the sink drops the table's request
+    write_csv(root, "users/a.csv", "id,name,amount\n1,a,3\n2,b,4\n")
+    metadata.table_requests.clear()
+    run_with_sink(config, metadata, failing_tables={"users"})
+    assert metadata.table_requests == []
+    assert table_columns(metadata, "users") == ["id", "name"]
+    state_store = TableStateStore(str(tmp_path / "state.db"), "svc", "bucket")
+    try:
+        assert state_store.get("users") is None
+        assert state_store.get("orders") is not None
+    finally:
+        state_store.close()
+
+    # Nothing was recorded for it, so the next run sends it again
+    run_with_sink(config, metadata)
+    assert metadata.table_requests == ["users"]
+    assert table_columns(metadata, "users") == ["id", "name", "amount"]
+
+    # Once written, it is skipped like the other tables
+    metadata.table_requests.clear()
+    run_with_sink(config, metadata)
+    assert metadata.table_requests == []